@@ -1,78 +1,252 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from PyQt5.QtWidgets import QFileDialog, QMessageBox
-from PyQt5.QtCore import QThread, pyqtSignal
+import os
+import threading
+import time
+from PyQt5.QtWidgets import QApplication, QFileDialog, QMessageBox, QProgressDialog
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from core.csr import np
+from core.force_layout import layout_forcas, salvar_layout, carregar_layout
 from core.graph_model import Graph
-from core.search_algorithms import SearchAlgorithms
-from core.search_algorithms_p import SearchAlgorithmsP
-from core.node_p import NodeP
-from core.utils import validar_entrada, calcular_custo_caminho, formatar_resultado
+from core.grid_graph import GridGraph
+from core.hooks import ProgressHook, SearchCancelled
+from core.runner import executar_algoritmo
+from core.utils import validar_entrada, formatar_resumo, paginar_visitacao
 
-class SearchWorker(QThread):
-    """Worker thread para executar algoritmos de busca sem travar a interface"""
-    finished = pyqtSignal(list, object, str)  # caminho, arvore, resultado_texto
-    error = pyqtSignal(str)
-    
-    def __init__(self, grafo, origem, destino, algoritmo, limite_profundidade=None):
-        super().__init__()
+FREQUENCIA_PROGRESSO = 30  # Lotes de nós expandidos por segundo durante a busca
+TAMANHO_POOL_BUSCA = 2  # Workers de busca persistentes
+
+
+class SearchJob:
+    """Pedido de busca enviado ao SearchScheduler"""
+
+    def __init__(self, numero, grafo, origem, destino, algoritmo, limite_profundidade=None):
+        self.numero = numero
         self.grafo = grafo
         self.origem = origem
         self.destino = destino
         self.algoritmo = algoritmo
         self.limite_profundidade = limite_profundidade
-        
+        # Permite interromper a busca de outra thread e acompanhar as expansões
+        self.hook = ProgressHook(frequencia=FREQUENCIA_PROGRESSO)
+
+    def chave(self):
+        """Pedidos com a mesma chave produzem o mesmo resultado"""
+        return (id(self.grafo), self.algoritmo, self.origem, self.destino, self.limite_profundidade)
+
+    def descricao(self):
+        return f"#{self.numero} {self.algoritmo} {self.origem} → {self.destino}"
+
+
+class SearchScheduler:
+    """
+    Fila de buscas com no máximo um pedido pendente, atendida por um pool
+    de workers persistentes.
+
+    Um novo pedido idêntico ao que está rodando (ou ao pendente) é
+    descartado; um pedido diferente substitui o pendente e cancela os que
+    estão rodando, pois o resultado deles não seria mais exibido. Assim
+    cliques repetidos nunca acumulam buscas obsoletas. Com mais de um
+    worker, o novo pedido começa num worker livre enquanto a busca
+    cancelada ainda termina o passo em que estava (ex: a conversão do grafo
+    para CSR, que não passa pelo hook); o trabalho em andamento fica
+    limitado ao tamanho do pool.
+    """
+
+    def __init__(self):
+        self.condicao = threading.Condition()
+        self.em_execucao = []  # Jobs sendo executados pelos workers (inclusive os cancelados)
+        self.pendente = None
+        self.encerrado = False
+        self.canceladas = 0
+        self.agrupadas = 0
+
+    def submeter(self, job):
+        """Enfileira o pedido; retorna o job que vai produzir o resultado"""
+        with self.condicao:
+            for atual in [self.pendente] + self.em_execucao:
+                if atual is not None and not atual.hook.cancelado and atual.chave() == job.chave():
+                    self.agrupadas += 1
+                    return atual
+            self._cancelar_em_execucao()
+            if self.pendente is not None:
+                self.canceladas += 1
+            self.pendente = job
+            self.condicao.notify()
+            return job
+
+    def proximo_job(self):
+        """Bloqueia até haver um pedido; retorna None quando o escalonador é encerrado"""
+        with self.condicao:
+            while self.pendente is None and not self.encerrado:
+                self.condicao.wait()
+            if self.encerrado:
+                return None
+            job, self.pendente = self.pendente, None
+            self.em_execucao.append(job)
+            return job
+
+    def job_concluido(self, job):
+        with self.condicao:
+            if job in self.em_execucao:
+                self.em_execucao.remove(job)
+
+    def _cancelar_em_execucao(self):
+        for job in self.em_execucao:
+            if not job.hook.cancelado:
+                job.hook.cancelar()
+                self.canceladas += 1
+
+    def cancelar(self):
+        """Descarta o pedido pendente e interrompe os que estão rodando"""
+        with self.condicao:
+            self._cancelar_em_execucao()
+            if self.pendente is not None:
+                self.pendente = None
+                self.canceladas += 1
+
+    def encerrar(self):
+        """Cancela tudo e libera os workers bloqueados em proximo_job"""
+        self.cancelar()
+        with self.condicao:
+            self.encerrado = True
+            self.condicao.notify_all()
+
+    def usa_grafo(self, grafo):
+        """Indica se algum pedido pendente ou em execução lê o grafo"""
+        with self.condicao:
+            return any(job is not None and job.grafo is grafo
+                       for job in [self.pendente] + self.em_execucao)
+
+    def estado(self):
+        """Tupla (em_execucao, cancelando, pendente) para exibição"""
+        with self.condicao:
+            ativos = [job for job in self.em_execucao if not job.hook.cancelado]
+            em_execucao = ativos[-1] if ativos else None
+            return em_execucao, len(self.em_execucao) - len(ativos), self.pendente
+
+
+class SearchWorker(QThread):
+    """Worker thread persistente do pool que executa os pedidos do SearchScheduler"""
+    started_job = pyqtSignal(object)
+    progress = pyqtSignal(object, list, object, int, int)  # job, estados expandidos, ramo (CompactTree), profundidade, raiz
+    finished = pyqtSignal(object, list, object, str, object)  # job, caminho, arvore (CompactTree), resumo, nos_visitados
+    cancelled = pyqtSignal(object)
+    error = pyqtSignal(object, str)
+
+    def __init__(self, scheduler):
+        super().__init__()
+        self.scheduler = scheduler
+
     def run(self):
+        while True:
+            job = self.scheduler.proximo_job()
+            if job is None:
+                return
+            self.started_job.emit(job)
+            job.hook.publicar = lambda *lote, job=job: self.progress.emit(job, *lote)
+            estatisticas = {}
+            try:
+                caminho, arvore, custo, nos_visitados = executar_algoritmo(
+                    job.grafo, job.algoritmo, job.origem, job.destino,
+                    job.limite_profundidade, hook=job.hook, arvore_compacta=True,
+                    estatisticas=estatisticas
+                )
+
+                job.hook.descarregar()
+
+                # Apenas o resumo; a ordem de visitação é formatada sob demanda pela interface
+                resumo = formatar_resumo(
+                    caminho, custo, job.algoritmo, nos_visitados, estatisticas
+                )
+            except SearchCancelled:
+                self.scheduler.job_concluido(job)
+                self.cancelled.emit(job)
+                continue
+            except Exception as e:
+                self.scheduler.job_concluido(job)
+                self.error.emit(job, f"Erro durante a busca: {str(e)}")
+                continue
+
+            self.scheduler.job_concluido(job)
+            self.finished.emit(job, caminho or [], arvore, resumo, nos_visitados)
+
+
+class LoadWorker(QThread):
+    """Worker thread para carregar o arquivo do grafo sem travar a interface"""
+    progresso = pyqtSignal(int)  # Percentual lido
+    finished = pyqtSignal(object, object, str)  # grafo carregado, dados de visualização, arquivo
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, arquivo):
+        super().__init__()
+        self.arquivo = arquivo
+        self.cancelado = False
+
+    def cancelar(self):
+        self.cancelado = True
+
+    def run(self):
+        # Arquivos .map são grades de ocupação, lidas como grafo implícito
+        grafo = GridGraph() if GridGraph.e_arquivo_grade(self.arquivo) else Graph()
+
+        def progresso(fracao):
+            if self.cancelado:
+                return False
+            self.progresso.emit(int(fracao * 100))
+            return True
+
+        carregou = grafo.carregar_de_arquivo(self.arquivo, progresso=progresso)
+        if self.cancelado:
+            self.cancelled.emit()
+        elif carregou:
+            self.finished.emit(grafo, grafo.obter_dados_visualizacao(), self.arquivo)
+        else:
+            self.error.emit("Erro ao carregar o arquivo. Verifique o formato.")
+
+
+ESCALA_EXIBICAO_LAYOUT = 40  # Unidades da cena por unidade do layout por forças
+
+
+class LayoutWorker(QThread):
+    """Worker thread para calcular o layout por forças sem travar a interface"""
+    progresso = pyqtSignal(int, int, object)  # iteracao, total, posicoes parciais
+    finished = pyqtSignal(object, float)  # posicoes, escala admissível
+    error = pyqtSignal(str)
+
+    def __init__(self, grafo):
+        super().__init__()
+        self.grafo = grafo
+        self.cancelado = False
+
+    def cancelar(self):
+        self.cancelado = True
+
+    def run(self):
+        nos = list(self.grafo.nos)
+        # Grafos grandes são redesenhados com menos frequência
+        intervalo = max(0.5, len(nos) / 50000)
+        ultimo_envio = time.monotonic()
+
+        def progresso(iteracao, total, coordenadas):
+            nonlocal ultimo_envio
+            if self.cancelado:
+                return False
+            agora = time.monotonic()
+            if agora - ultimo_envio >= intervalo:
+                ultimo_envio = agora
+                self.progresso.emit(iteracao, total, dict(zip(nos, map(tuple, coordenadas.tolist()))))
+            return True
+
         try:
-            search = SearchAlgorithms()
-            search_p = SearchAlgorithmsP()
-            caminho = None
-            arvore = None
-            
-            if self.algoritmo == "Busca em Amplitude":
-                caminho, arvore = search.busca_amplitude(self.grafo, self.origem, self.destino)
-                custo = calcular_custo_caminho(self.grafo, caminho) if caminho else 0
-            elif self.algoritmo == "Busca em Profundidade":
-                caminho, arvore = search.busca_profundidade(self.grafo, self.origem, self.destino)
-                custo = calcular_custo_caminho(self.grafo, caminho) if caminho else 0
-            elif self.algoritmo == "Busca em Profundidade Limitada":
-                limite = self.limite_profundidade if self.limite_profundidade is not None else 5
-                caminho, arvore = search.busca_profundidade_limitada(self.grafo, self.origem, self.destino, limite)
-                custo = calcular_custo_caminho(self.grafo, caminho) if caminho else 0
-            elif self.algoritmo == "Busca por Aprofundamento Iterativo":
-                limite_inicial = self.limite_profundidade if self.limite_profundidade is not None else 1
-                caminho, arvore = search.busca_aprofundamento_iterativo(self.grafo, self.origem, self.destino, limite_inicial)
-                custo = calcular_custo_caminho(self.grafo, caminho) if caminho else 0
-            elif self.algoritmo == "Busca Bidirecional":
-                caminho, arvore = search.busca_bidirecional(self.grafo, self.origem, self.destino)
-                custo = calcular_custo_caminho(self.grafo, caminho) if caminho else 0
-            elif self.algoritmo == "Custo Uniforme":
-                caminho, arvore, custo = search_p.custo_uniforme(self.grafo, self.origem, self.destino)
-            elif self.algoritmo == "Greedy":
-                caminho, arvore, custo = search_p.greedy(self.grafo, self.origem, self.destino)
-            elif self.algoritmo == "A-estrela":
-                caminho, arvore, custo = search_p.a_estrela(self.grafo, self.origem, self.destino)
-            elif self.algoritmo == "AIA-estrela":
-                caminho, arvore, custo = search_p.aia_estrela(self.grafo, self.origem, self.destino)
-            else:
-                caminho, arvore = None, None
-                custo = 0
-
-            # Determinar qual lista de nós visitados usar
-            if self.algoritmo in ["Custo Uniforme", "Greedy", "A-estrela", "AIA-estrela"]:
-                nos_visitados = search_p.nos_visitados
-            else:
-                nos_visitados = search.nos_visitados
-
-            # Formatar resultado
-            resultado_texto = formatar_resultado(
-                caminho, custo, self.algoritmo, nos_visitados
-            )
-
-            self.finished.emit(caminho or [], arvore, resultado_texto)
-            
+            posicoes, escala = layout_forcas(self.grafo, progresso=progresso, intervalo_progresso=1)
         except Exception as e:
-            self.error.emit(f"Erro durante a busca: {str(e)}")
+            self.error.emit(f"Erro ao calcular o layout: {str(e)}")
+            return
+        if not self.cancelado:
+            self.finished.emit(posicoes, escala)
 
 
 class AppController:
@@ -81,7 +255,26 @@ class AppController:
     def __init__(self, main_window):
         self.main_window = main_window
         self.grafo = Graph()
-        self.search_worker = None
+        self.numero_busca = 0
+        self.job_atual = None  # Único pedido cujo resultado ainda interessa
+        self.scheduler = SearchScheduler()
+        self.search_workers = []
+        for _ in range(TAMANHO_POOL_BUSCA):
+            worker = SearchWorker(self.scheduler)
+            worker.started_job.connect(self.atualizar_fila)
+            worker.progress.connect(self.on_busca_progresso)
+            worker.finished.connect(self.on_busca_concluida)
+            worker.cancelled.connect(self.atualizar_fila)
+            worker.error.connect(self.on_busca_falhou)
+            for sinal in (worker.finished, worker.cancelled, worker.error):
+                sinal.connect(self.aplicar_layout_adiado)
+            worker.start()
+            self.search_workers.append(worker)
+        self.load_worker = None
+        self.dialogo_carregamento = None
+        self.layout_worker = None
+        self.arquivo_layout = None
+        self.layout_adiado = None  # (posições, escala) à espera do fim das buscas no grafo
         
         # Conectar sinais
         self.conectar_sinais()
@@ -90,6 +283,19 @@ class AppController:
         """Conecta os sinais da interface com os métodos do controlador"""
         self.main_window.btn_carregar.clicked.connect(self.carregar_arquivo)
         self.main_window.btn_executar.clicked.connect(self.executar_busca)
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.encerrar)
+
+    def encerrar(self):
+        """Interrompe as threads de trabalho antes de a aplicação sair"""
+        self.scheduler.encerrar()
+        for worker in self.search_workers:
+            worker.wait()
+        self.cancelar_layout()
+        if self.load_worker is not None and self.load_worker.isRunning():
+            self.load_worker.cancelar()
+            self.load_worker.wait()
         
     def carregar_arquivo(self):
         """Carrega um arquivo de grafo"""
@@ -97,24 +303,59 @@ class AppController:
             self.main_window,
             "Carregar Arquivo de Grafo",
             "",
-            "Arquivos de Texto (*.txt);;Todos os Arquivos (*)"
+            "Arquivos de Texto (*.txt);;Grades de Ocupação (*.map);;Todos os Arquivos (*)"
         )
         
-        if arquivo:
-            if self.grafo.carregar_de_arquivo(arquivo):
-                self.main_window.input_arquivo.setText(arquivo)
-                self.atualizar_visualizacao_grafo()
-                QMessageBox.information(
-                    self.main_window,
-                    "Sucesso",
-                    f"Grafo carregado com sucesso!\nNós: {len(self.grafo.nos)}"
-                )
-            else:
-                QMessageBox.warning(
-                    self.main_window,
-                    "Erro",
-                    "Erro ao carregar o arquivo. Verifique o formato."
-                )
+        if not arquivo:
+            return
+        if self.load_worker is not None and self.load_worker.isRunning():
+            self.load_worker.cancelar()
+            self.load_worker.wait()
+
+        # Leitura em segundo plano; a interface só recebe o grafo pronto
+        self.dialogo_carregamento = QProgressDialog(
+            "Carregando grafo...", "Cancelar", 0, 100, self.main_window
+        )
+        self.dialogo_carregamento.setWindowTitle("Carregar Arquivo de Grafo")
+        self.dialogo_carregamento.setWindowModality(Qt.WindowModal)
+        self.dialogo_carregamento.setMinimumDuration(300)
+        self.dialogo_carregamento.setAutoClose(False)
+        self.dialogo_carregamento.setAutoReset(False)
+
+        self.load_worker = LoadWorker(arquivo)
+        self.load_worker.progresso.connect(self.dialogo_carregamento.setValue)
+        self.load_worker.finished.connect(self.on_carregamento_concluido)
+        self.load_worker.error.connect(self.on_carregamento_erro)
+        self.load_worker.cancelled.connect(self.fechar_dialogo_carregamento)
+        self.dialogo_carregamento.canceled.connect(self.load_worker.cancelar)
+        self.load_worker.start()
+
+    def fechar_dialogo_carregamento(self):
+        if self.dialogo_carregamento is not None:
+            self.dialogo_carregamento.close()
+            self.dialogo_carregamento = None
+
+    def on_carregamento_concluido(self, grafo, dados, arquivo):
+        """Callback quando o arquivo termina de ser lido"""
+        self.fechar_dialogo_carregamento()
+        self.cancelar_layout()
+        self.scheduler.cancelar()  # Resultados sobre o grafo anterior não interessam mais
+        self.job_atual = None
+        self.grafo = grafo
+        self.main_window.input_arquivo.setText(arquivo)
+        self.atualizar_visualizacao_grafo(dados)
+        if not self.grafo.posicoes:
+            self.iniciar_layout(arquivo)
+        QMessageBox.information(
+            self.main_window,
+            "Sucesso",
+            f"Grafo carregado com sucesso!\nNós: {len(self.grafo.nos)}"
+        )
+
+    def on_carregamento_erro(self, erro):
+        """Callback quando ocorre erro na leitura do arquivo"""
+        self.fechar_dialogo_carregamento()
+        QMessageBox.warning(self.main_window, "Erro", erro)
         
     def executar_busca(self):
         """Executa o algoritmo de busca selecionado"""
@@ -136,37 +377,146 @@ class AppController:
         limite_profundidade_str = valores['limite_profundidade']
         limite_profundidade = int(limite_profundidade_str) if limite_profundidade_str else None
         
-        # Limpar resultados anteriores
-        self.main_window.set_resultado("Executando busca...")
-        self.main_window.get_graph_viewer().highlight_path([])
-        self.main_window.get_tree_viewer().clear_tree()
-        
-        # Executar busca em thread separada
-        self.search_worker = SearchWorker(self.grafo, origem, destino, algoritmo, limite_profundidade)
-        self.search_worker.finished.connect(self.on_busca_concluida)
-        self.search_worker.error.connect(self.on_busca_erro)
-        self.search_worker.start()
-        
-    def on_busca_concluida(self, caminho, arvore, resultado_texto):
+        self.aplicar_layout_adiado()
+        self.numero_busca += 1
+        novo = SearchJob(self.numero_busca, self.grafo, origem, destino, algoritmo, limite_profundidade)
+        job = self.scheduler.submeter(novo)
+        if job is novo:
+            # Limpar resultados anteriores
+            self.main_window.set_resultado("Executando busca...")
+            self.main_window.get_graph_viewer().highlight_path([])
+            self.main_window.get_graph_viewer().clear_explored()
+            self.main_window.get_tree_viewer().clear_tree()
+        self.job_atual = job
+        self.atualizar_fila()
+
+    def atualizar_fila(self, *args):
+        """Mostra a busca em execução, a pendente e os contadores do escalonador"""
+        em_execucao, cancelando, pendente = self.scheduler.estado()
+        linhas = []
+        if em_execucao is not None:
+            linhas.append(f"Executando: {em_execucao.descricao()}")
+        if cancelando:
+            linhas.append(f"Encerrando {cancelando} busca(s) cancelada(s)")
+        if pendente is not None:
+            linhas.append(f"Na fila: {pendente.descricao()}")
+        if not linhas:
+            linhas.append("Nenhuma busca em andamento")
+        if self.scheduler.canceladas or self.scheduler.agrupadas:
+            linhas.append(f"Canceladas: {self.scheduler.canceladas} | "
+                          f"Repetidas ignoradas: {self.scheduler.agrupadas}")
+        self.main_window.set_fila("\n".join(linhas))
+
+    def on_busca_progresso(self, job, estados, ramo, profundidade, raiz):
+        """Colore os nós expandidos desde o último lote (no máximo FREQUENCIA_PROGRESSO vezes/s)"""
+        if job is not self.job_atual or not estados:
+            return
+        self.main_window.get_graph_viewer().mark_explored(estados)
+        if ramo is not None:
+            self.main_window.get_tree_viewer().show_progress(ramo, profundidade, raiz)
+        self.main_window.set_resultado(f"Executando busca... {job.hook.expansoes} nós expandidos")
+
+    def on_busca_concluida(self, job, caminho, arvore, resumo, nos_visitados):
         """Callback quando a busca é concluída"""
-        self.main_window.set_resultado(resultado_texto)
+        self.atualizar_fila()
+        if job is not self.job_atual:
+            return  # Substituída por um pedido mais recente
+
+        if caminho:
+            self.main_window.set_resultado(resumo, paginar_visitacao(nos_visitados), len(nos_visitados))
+        else:
+            self.main_window.set_resultado(resumo)
+        self.main_window.get_graph_viewer().flush_explored()
         
         if caminho:
             self.main_window.get_graph_viewer().highlight_path(caminho)
             
         if arvore:
-            self.main_window.get_tree_viewer().set_tree(arvore)
+            self.main_window.get_tree_viewer().set_tree(arvore, path=caminho)
+
+    def on_busca_falhou(self, job, erro):
+        self.atualizar_fila()
+        if job is self.job_atual:
+            self.on_busca_erro(erro)
             
     def on_busca_erro(self, erro):
         """Callback quando ocorre erro na busca"""
         QMessageBox.critical(self.main_window, "Erro na Busca", erro)
         self.main_window.set_resultado(f"Erro: {erro}")
         
-    def atualizar_visualizacao_grafo(self):
-        """Atualiza a visualização do grafo"""
-        dados = self.grafo.obter_dados_visualizacao()
+    def iniciar_layout(self, arquivo):
+        """Calcula em segundo plano (ou lê do cache) posições para um grafo sem coordenadas"""
+        self.cancelar_layout()
+        cache = arquivo + '.layout'
+        try:
+            if os.path.getmtime(cache) >= os.path.getmtime(arquivo):
+                posicoes, escala = carregar_layout(cache)
+                if set(posicoes) == set(self.grafo.nos):
+                    self.on_layout_concluido(posicoes, escala, salvar=False)
+                    return
+        except (OSError, ValueError, EOFError):
+            pass
+
+        if np is None:
+            return  # Sem NumPy, mantém o layout circular
+        self.arquivo_layout = cache
+        self.layout_worker = LayoutWorker(self.grafo)
+        self.layout_worker.progresso.connect(self.on_layout_progresso)
+        self.layout_worker.finished.connect(self.on_layout_concluido)
+        self.layout_worker.error.connect(self.on_layout_erro)
+        self.layout_worker.start()
+
+    def on_layout_erro(self, erro):
+        """Callback quando o layout falha; o grafo segue com o layout circular"""
+        QMessageBox.warning(self.main_window, "Erro no Layout", erro)
+
+    def cancelar_layout(self):
+        if self.layout_worker is not None and self.layout_worker.isRunning():
+            self.layout_worker.cancelar()
+            self.layout_worker.wait()
+        self.layout_worker = None
+        self.layout_adiado = None
+
+    def on_layout_progresso(self, iteracao, total, posicoes):
+        """Exibe as posições parciais do layout em andamento"""
+        self.main_window.get_graph_viewer().update_positions(self.posicoes_exibicao(posicoes))
+        self.main_window.set_resultado(f"Calculando layout... {iteracao}/{total}")
+
+    def on_layout_concluido(self, posicoes, escala, salvar=True):
+        """Guarda o layout no grafo (também usado pela heurística do A*) e no cache"""
+        # A heurística lê posições e escala durante a busca; trocá-las com um
+        # worker rodando misturaria os dois layouts, então a troca espera as
+        # buscas no grafo terminarem
+        self.layout_adiado = (posicoes, escala)
+        self.aplicar_layout_adiado()
+        if salvar:
+            try:
+                salvar_layout(self.arquivo_layout, posicoes, escala)
+            except (OSError, TypeError, OverflowError):
+                pass  # Cache é opcional (ex: diretório sem permissão de escrita)
+        self.main_window.get_graph_viewer().update_positions(self.posicoes_exibicao(posicoes))
+        self.main_window.set_resultado("Layout calculado.")
+
+    def aplicar_layout_adiado(self, *args):
+        """Passa ao grafo o layout adiado, se nenhuma busca estiver usando o grafo"""
+        if self.layout_adiado is None or self.scheduler.usa_grafo(self.grafo):
+            return
+        posicoes, escala = self.layout_adiado
+        self.layout_adiado = None
+        self.grafo.definir_layout(posicoes, escala)
+
+    @staticmethod
+    def posicoes_exibicao(posicoes):
+        return {no: (x * ESCALA_EXIBICAO_LAYOUT, y * ESCALA_EXIBICAO_LAYOUT)
+                for no, (x, y) in posicoes.items()}
+
+    def atualizar_visualizacao_grafo(self, dados=None):
+        """Atualiza a visualização do grafo (dados já calculados podem ser reaproveitados)"""
+        if dados is None:
+            dados = self.grafo.obter_dados_visualizacao()
+        posicoes = dados['posicoes'] or self.posicoes_exibicao(self.grafo.posicoes_layout)
         self.main_window.get_graph_viewer().set_graph(
             dados['nos'],
             dados['arestas'],
-            dados['posicoes']
+            posicoes
         )
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Executor de buscas em lote pela linha de comando (sem interface gráfica)
+
+Exemplos:
+    python cli.py data/exemplo_grafo.txt -a a-estrela -c consultas.txt
+    echo "1 10" | python cli.py data/exemplo_grafo.txt -a bfs -f csv
+    python cli.py mapa.txt -a ucs -c consultas.txt -j 4 -o rotas.jsonl
+    python cli.py mapa.txt -a a-estrela -c consultas.txt --arvores arvores/
+    python cli.py mapa.txt -a bfs -c consultas.txt --visitacao resultados/
+
+Cada linha de consulta tem o formato "<origem> <destino> [limite]".
+Linhas vazias e iniciadas por '#' são ignoradas.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.graph_model import Graph
+from core.grid_graph import GridGraph
+from core.runner import APELIDOS, resolver_algoritmo, executar_consulta
+from core.shared_graph import SharedGraph, SharedGraphView
+from core.utils import ROTULOS_ESTATISTICAS, escrever_resultado
+
+# Colunas fixas seguidas das estatísticas específicas de alguns algoritmos (SMA*, feixe)
+CAMPOS_CSV = ['linha', 'origem', 'destino', 'algoritmo', 'encontrado',
+              'custo', 'tamanho_caminho', 'nos_visitados', 'tempo_ms', 'caminho', 'erro'] + \
+             list(ROTULOS_ESTATISTICAS)
+
+# Estado de cada processo de trabalho: visão do grafo em memória compartilhada
+_grafo_worker = None
+
+
+def _carregar_grafo(caminho_arquivo):
+    grafo = GridGraph() if GridGraph.e_arquivo_grade(caminho_arquivo) else Graph()
+    if not grafo.carregar_de_arquivo(caminho_arquivo):
+        return None
+    return grafo
+
+
+def _inicializar_worker(nome_memoria):
+    """Anexa o grafo exportado pelo processo principal"""
+    global _grafo_worker
+    _grafo_worker = SharedGraphView.anexar(nome_memoria)
+
+
+def _inicializar_worker_grade(grade):
+    """Recebe a grade de ocupação (o bitmap é pequeno e é copiado para cada processo)"""
+    global _grafo_worker
+    _grafo_worker = grade
+
+
+def ler_consultas(arquivo):
+    """Gera tuplas (numero_linha, origem, destino, limite) a partir de um arquivo aberto"""
+    for numero, linha in enumerate(arquivo, start=1):
+        linha = linha.split('#', 1)[0].strip()
+        if not linha:
+            continue
+        partes = linha.split()
+        limite = partes[2] if len(partes) > 2 else None
+        if len(partes) < 2:
+            yield numero, partes[0], None, limite
+        else:
+            yield numero, partes[0], partes[1], limite
+
+
+def _executar_consulta_worker(algoritmo, consulta, limite_padrao, com_arvore, com_visitacao):
+    return executar_consulta(_grafo_worker, _grafo_worker.nos, algoritmo, consulta,
+                             limite_padrao, com_arvore, com_visitacao)
+
+
+def executar_lote(grafo, algoritmo, consultas, jobs=1, limite_padrao=None, com_arvore=False,
+                  com_visitacao=False):
+    """
+    Executa as consultas e gera os registros na ordem de entrada.
+
+    Com jobs > 1 o grafo é exportado uma vez para memória compartilhada e as
+    consultas são distribuídas entre processos que apenas anexam essa cópia.
+    No máximo 4 * jobs consultas ficam pendentes, de modo que entradas muito
+    grandes (ou stdin) são processadas em fluxo. Com com_arvore=True cada
+    registro traz a árvore de busca compacta, que volta dos processos no
+    formato binário da CompactTree; com com_visitacao=True traz também a
+    ordem de visitação ('visitacao'). Grades de ocupação (GridGraph) são
+    enviadas inteiras a cada processo, pois o bitmap é menor que o CSR.
+    """
+    if jobs <= 1:
+        nos = grafo.nos if isinstance(grafo, GridGraph) else set(grafo.nos)
+        for consulta in consultas:
+            yield executar_consulta(grafo, nos, algoritmo, consulta, limite_padrao,
+                                    com_arvore, com_visitacao)
+        return
+
+    if isinstance(grafo, GridGraph):
+        compartilhado = nullcontext()
+        inicializar, argumentos = _inicializar_worker_grade, (grafo,)
+    else:
+        compartilhado = SharedGraph.exportar(grafo)
+        inicializar, argumentos = _inicializar_worker, (compartilhado.nome,)
+
+    with compartilhado, \
+            ProcessPoolExecutor(max_workers=jobs, initializer=inicializar,
+                                initargs=argumentos) as executor:
+        pendentes = deque()
+        for consulta in consultas:
+            pendentes.append(executor.submit(_executar_consulta_worker, algoritmo, consulta,
+                                             limite_padrao, com_arvore, com_visitacao))
+            if len(pendentes) >= 4 * jobs:
+                yield pendentes.popleft().result()
+        while pendentes:
+            yield pendentes.popleft().result()
+
+
+def salvar_arvores(registros, diretorio):
+    """Grava a árvore de cada registro em <diretorio>/consulta_<linha>.arvore e a remove do registro"""
+    os.makedirs(diretorio, exist_ok=True)
+    for registro in registros:
+        arvore = registro.pop('arvore', None)
+        if arvore is not None:
+            arvore.salvar(os.path.join(diretorio, f"consulta_{registro['linha']}.arvore"))
+        yield registro
+
+
+def salvar_visitacao(registros, diretorio):
+    """
+    Grava o resultado completo de cada registro (resumo e ordem de visitação)
+    em <diretorio>/consulta_<linha>.txt, em blocos, e remove a lista do registro
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    for registro in registros:
+        visitacao = registro.pop('visitacao', None)
+        if visitacao is not None and registro['erro'] is None:
+            caminho_arquivo = os.path.join(diretorio, f"consulta_{registro['linha']}.txt")
+            with open(caminho_arquivo, 'w', encoding='utf-8') as arquivo:
+                estatisticas = {chave: registro[chave] for chave in ROTULOS_ESTATISTICAS
+                                if chave in registro}
+                escrever_resultado(arquivo, registro['caminho'], registro['custo'],
+                                   registro['algoritmo'], visitacao, estatisticas=estatisticas)
+                arquivo.write('\n')
+        yield registro
+
+
+def escrever_jsonl(registros, saida):
+    for registro in registros:
+        saida.write(json.dumps(registro, ensure_ascii=False) + '\n')
+        saida.flush()
+
+
+def escrever_csv(registros, saida):
+    escritor = csv.DictWriter(saida, fieldnames=CAMPOS_CSV)
+    escritor.writeheader()
+    for registro in registros:
+        linha = dict(registro)
+        linha['caminho'] = ' '.join(map(str, registro['caminho']))
+        escritor.writerow(linha)
+        saida.flush()
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        description="Executa buscas em lote sobre um grafo de túneis de mineração"
+    )
+    parser.add_argument('grafo', help="Arquivo do grafo")
+    parser.add_argument('-a', '--algoritmo', default='bfs',
+                        help="Algoritmo (apelidos: " + ', '.join(APELIDOS) + ")")
+    parser.add_argument('-c', '--consultas', default='-',
+                        help="Arquivo de consultas; '-' lê da entrada padrão (padrão)")
+    parser.add_argument('-f', '--formato', choices=['jsonl', 'csv'], default='jsonl',
+                        help="Formato de saída (padrão: jsonl)")
+    parser.add_argument('-o', '--saida', default='-',
+                        help="Arquivo de saída; '-' escreve na saída padrão (padrão)")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="Número de processos de trabalho (padrão: 1)")
+    parser.add_argument('-l', '--limite', type=int, default=None,
+                        help="Limite de profundidade padrão para DLS/IDDFS "
+                             "(limite de memória em nós para o SMA*, largura nas buscas em feixe)")
+    parser.add_argument('--arvores', default=None, metavar='DIRETORIO',
+                        help="Grava a árvore de busca compacta de cada consulta neste diretório")
+    parser.add_argument('--visitacao', default=None, metavar='DIRETORIO',
+                        help="Grava o resultado com a ordem de visitação completa de cada consulta "
+                             "neste diretório")
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+
+    try:
+        algoritmo = resolver_algoritmo(args.algoritmo)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    grafo = _carregar_grafo(args.grafo)
+    if grafo is None:
+        print(f"Erro ao carregar o grafo: {args.grafo}", file=sys.stderr)
+        return 1
+
+    entrada = sys.stdin if args.consultas == '-' else open(args.consultas, 'r', encoding='utf-8')
+    saida = sys.stdout if args.saida == '-' else open(args.saida, 'w', encoding='utf-8', newline='')
+
+    try:
+        registros = executar_lote(grafo, algoritmo, ler_consultas(entrada),
+                                  args.jobs, args.limite, com_arvore=args.arvores is not None,
+                                  com_visitacao=args.visitacao is not None)
+        if args.arvores is not None:
+            registros = salvar_arvores(registros, args.arvores)
+        if args.visitacao is not None:
+            registros = salvar_visitacao(registros, args.visitacao)
+        if args.formato == 'csv':
+            escrever_csv(registros, saida)
+        else:
+            escrever_jsonl(registros, saida)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if saida is not sys.stdout:
+            saida.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
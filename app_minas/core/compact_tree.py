@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Árvore de busca compacta em arrays paralelos.
+
+Cada nó da árvore é um índice i: pais[i] é o índice do pai (-1 na raiz) e
+estados, custos, profundidades e flags guardam os demais campos de Node.
+Um pai sempre tem índice menor que os seus filhos, o que permite percorrer
+a árvore de baixo para cima apenas invertendo a ordem dos índices.
+
+Em vez de milhões de objetos ligados, a árvore ocupa poucos arrays; o
+formato binário (para_bytes) é um cabeçalho seguido desses arrays, barato
+para enviar entre threads e processos (o pickle usa o mesmo formato) e
+para gravar em disco.
+"""
+
+import struct
+from array import array
+from collections import deque
+
+from .utils import array_de_bytes, array_para_bytes
+
+EXPANDIDO = 1
+OBJETIVO = 2
+
+_ASSINATURA = b'ARVC'
+# assinatura, versão, número de nós, estados inteiros (1) ou texto (0)
+_CABECALHO = struct.Struct('<4sIqI4x')
+
+
+class CompactTree:
+    """Árvore de busca em arrays (pais, estados, custos, profundidades, flags)"""
+
+    def __init__(self):
+        self.pais = array('q')
+        self.estados = []  # Convertido para array('q') por finalizar() quando todos são inteiros
+        self.custos = array('d')
+        self.profundidades = array('i')
+        self.flags = array('B')
+        self._inicio_filhos = None  # Índice dos filhos, criado sob demanda
+        self._filhos = None
+
+    def adicionar(self, pai, estado, custo=0, profundidade=0, flags=0):
+        """Acrescenta um nó (pai = índice do pai ou -1) e retorna seu índice"""
+        self.pais.append(pai)
+        self.estados.append(estado)
+        self.custos.append(custo)
+        self.profundidades.append(profundidade)
+        self.flags.append(flags)
+        self._inicio_filhos = None
+        return len(self.pais) - 1
+
+    def finalizar(self):
+        """Guarda os estados em array('q') quando todos são inteiros"""
+        if isinstance(self.estados, list):
+            try:
+                self.estados = array('q', self.estados)
+            except (TypeError, OverflowError):
+                pass
+        return self
+
+    @classmethod
+    def de_arvore(cls, raiz):
+        """Converte uma árvore de Node (ou NodeP) em ordem por níveis, sem recursão"""
+        arvore = cls()
+        if raiz is None:
+            return arvore
+        pais, estados, custos = arvore.pais, arvore.estados, arvore.custos
+        profundidades, flags = arvore.profundidades, arvore.flags
+
+        fila = deque([(raiz, -1)])
+        while fila:
+            no, pai = fila.popleft()
+            indice = len(pais)
+            pais.append(pai)
+            estados.append(no.estado)
+            custos.append(no.custo)
+            profundidades.append(no.profundidade)
+            flags.append((EXPANDIDO if no.expandido else 0) | (OBJETIVO if no.objetivo else 0))
+            for filho in no.filhos:
+                fila.append((filho, indice))
+        return arvore.finalizar()
+
+    @classmethod
+    def de_ramo(cls, no):
+        """
+        Árvore apenas com o ramo da raiz até o nó e os filhos de cada nó do
+        ramo (ex: para exibir uma busca ainda em andamento). Os nós do ramo
+        ocupam os índices 0 a no.profundidade, na ordem da raiz até o nó.
+        """
+        ramo = []
+        while no is not None:
+            ramo.append(no)
+            no = no.pai
+        ramo.reverse()
+
+        arvore = cls()
+        for k, atual in enumerate(ramo):
+            arvore._adicionar_no(k - 1, atual)
+        for k, atual in enumerate(ramo):
+            seguinte = ramo[k + 1] if k + 1 < len(ramo) else None
+            for filho in list(atual.filhos):  # A busca pode estar criando filhos
+                if filho is not seguinte:
+                    arvore._adicionar_no(k, filho)
+        return arvore.finalizar()
+
+    def _adicionar_no(self, pai, no):
+        return self.adicionar(pai, no.estado, no.custo, no.profundidade,
+                              (EXPANDIDO if no.expandido else 0) | (OBJETIVO if no.objetivo else 0))
+
+    def __len__(self):
+        return len(self.pais)
+
+    @property
+    def raiz(self):
+        """Índice da raiz (0) ou None para árvore vazia"""
+        return 0 if len(self.pais) else None
+
+    def _indexar_filhos(self):
+        """Filhos de cada nó agrupados por pai (ordenação por contagem, O(n))"""
+        n = len(self.pais)
+        contagem = array('q', bytes(8 * (n + 1)))
+        for pai in self.pais:
+            if pai >= 0:
+                contagem[pai + 1] += 1
+        for i in range(n):
+            contagem[i + 1] += contagem[i]
+        posicao = array('q', contagem)
+        filhos = array('q', bytes(8 * max(n - 1, 0)))
+        for i, pai in enumerate(self.pais):
+            if pai >= 0:
+                filhos[posicao[pai]] = i
+                posicao[pai] += 1
+        self._inicio_filhos = contagem
+        self._filhos = filhos
+
+    def filhos(self, i):
+        """Índices dos filhos do nó i, na ordem em que foram gerados"""
+        if self._inicio_filhos is None:
+            self._indexar_filhos()
+        return self._filhos[self._inicio_filhos[i]:self._inicio_filhos[i + 1]]
+
+    def num_filhos(self, i):
+        if self._inicio_filhos is None:
+            self._indexar_filhos()
+        return self._inicio_filhos[i + 1] - self._inicio_filhos[i]
+
+    def expandido(self, i):
+        return bool(self.flags[i] & EXPANDIDO)
+
+    def objetivo(self, i):
+        return bool(self.flags[i] & OBJETIVO)
+
+    def encontrar_objetivo(self, caminho=None):
+        """
+        Índice do nó marcado como objetivo ou, na falta dele, do nó cujo
+        ramo desde a raiz corresponde ao caminho; None se não houver
+        """
+        marcados = []
+        for valor in (OBJETIVO, OBJETIVO | EXPANDIDO):
+            try:
+                marcados.append(self.flags.index(valor))
+            except ValueError:
+                pass
+        if marcados:
+            return min(marcados)
+        if not caminho:
+            return None
+        final, profundidade = caminho[-1], len(caminho) - 1
+        for i, estado in enumerate(self.estados):
+            if estado == final and self.profundidades[i] == profundidade and \
+                    self.caminho(i) == list(caminho):
+                return i
+        return None
+
+    def caminho(self, i):
+        """Estados da raiz até o nó i"""
+        estados = []
+        while i >= 0:
+            estados.append(self.estados[i])
+            i = self.pais[i]
+        estados.reverse()
+        return estados
+
+    def tamanhos_subarvores(self):
+        """Número de nós de cada subárvore (pais têm índice menor que os filhos)"""
+        n = len(self.pais)
+        tamanhos = array('q', [1]) * n
+        pais = self.pais
+        for i in range(n - 1, 0, -1):
+            pai = pais[i]
+            if pai >= 0:
+                tamanhos[pai] += tamanhos[i]
+        return tamanhos
+
+    def para_bytes(self):
+        """Serializa a árvore (cabeçalho seguido dos arrays)"""
+        self.finalizar()
+        inteiros = isinstance(self.estados, array)
+        n = len(self.pais)
+        # Os arrays são gravados em little-endian, como o cabeçalho
+        partes = [_CABECALHO.pack(_ASSINATURA, 1, n, int(inteiros)),
+                  array_para_bytes(self.pais), array_para_bytes(self.custos),
+                  array_para_bytes(self.profundidades)]
+        if inteiros:
+            partes.append(array_para_bytes(self.estados))
+        else:
+            # Estados não inteiros são gravados como texto
+            textos = [str(estado).encode('utf-8') for estado in self.estados]
+            partes.append(array_para_bytes(array('q', map(len, textos))))
+            partes.append(b''.join(textos))
+        partes.append(self.flags.tobytes())
+        return b''.join(partes)
+
+    @classmethod
+    def de_bytes(cls, dados):
+        """Reconstrói uma árvore serializada com para_bytes"""
+        visao = memoryview(dados)
+        assinatura, _, n, inteiros = _CABECALHO.unpack_from(visao, 0)
+        if assinatura != _ASSINATURA:
+            raise ValueError("Dados não contêm uma árvore de busca compacta")
+        arvore = cls()
+        posicao = _CABECALHO.size
+
+        def ler(tipo, tamanho_item):
+            nonlocal posicao
+            valores = array_de_bytes(tipo, visao[posicao:posicao + tamanho_item * n])
+            posicao += tamanho_item * n
+            return valores
+
+        arvore.pais = ler('q', 8)
+        arvore.custos = ler('d', 8)
+        arvore.profundidades = ler('i', 4)
+        if inteiros:
+            arvore.estados = ler('q', 8)
+        else:
+            tamanhos = ler('q', 8)
+            estados = []
+            for tamanho in tamanhos:
+                estados.append(bytes(visao[posicao:posicao + tamanho]).decode('utf-8'))
+                posicao += tamanho
+            arvore.estados = estados
+        arvore.flags = ler('B', 1)
+        return arvore
+
+    def __reduce__(self):
+        # Pickle (ex: entre processos) usa o formato binário compacto
+        return (CompactTree.de_bytes, (self.para_bytes(),))
+
+    def salvar(self, caminho_arquivo):
+        """Grava a árvore em disco"""
+        with open(caminho_arquivo, 'wb') as arquivo:
+            arquivo.write(self.para_bytes())
+        return caminho_arquivo
+
+    @classmethod
+    def carregar(cls, caminho_arquivo):
+        """Lê uma árvore gravada com salvar"""
+        with open(caminho_arquivo, 'rb') as arquivo:
+            return cls.de_bytes(arquivo.read())
+
+    def __repr__(self):
+        return f"CompactTree(nos={len(self.pais)})"
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import heapq
+from array import array
+from .csr import GraphCSR
+from .dijkstra import dijkstra_multiplas_fontes
+
+# Como cada recurso se acumula ao longo do caminho
+SOMA = 'soma'  # Ex: exposição acumulada à ventilação
+MAXIMO = 'max'  # Ex: maior inclinação percorrida
+
+
+class ResourceConstrainedSearch:
+    """
+    Caminho de menor custo respeitando limites de recursos por aresta.
+
+    Busca por rótulos (label-setting): cada rótulo guarda o custo e o vetor
+    de recursos consumidos até um nó. Rótulos dominados no sentido de Pareto
+    (custo e todos os recursos maiores ou iguais aos de outro rótulo do
+    mesmo nó) são descartados. Para cada destino, um Dijkstra por recurso
+    aditivo (e um pelo custo) a partir do destino dá limites inferiores do
+    que falta consumir: rótulos que não podem mais respeitar algum limite
+    são podados, e a fila é ordenada por custo + limite inferior do custo,
+    de modo que o primeiro rótulo que chega ao destino é o ótimo.
+
+    Os recursos vêm de grafo.obter_recursos_aresta; arestas sem recursos
+    definidos contam como zero.
+    """
+
+    def __init__(self, grafo, tipos=None, csr=None):
+        self.csr = csr if csr is not None else GraphCSR.de_grafo(grafo)
+        csr = self.csr
+
+        num_recursos = max((len(r) for r in grafo.recursos.values()), default=0)
+        if tipos is not None:
+            num_recursos = max(num_recursos, len(tipos))
+        self.tipos = list(tipos) if tipos is not None else [SOMA] * num_recursos
+        self.tipos += [SOMA] * (num_recursos - len(self.tipos))
+
+        # Vetor de recursos de cada posição de aresta do CSR
+        zeros = (0.0,) * num_recursos
+        self.recursos_arestas = []
+        for i, no in enumerate(csr.nos):
+            for p in range(csr.indptr[i], csr.indptr[i + 1]):
+                recursos = tuple(grafo.obter_recursos_aresta(no, csr.nos[csr.indices[p]]))
+                self.recursos_arestas.append(recursos + zeros[len(recursos):])
+
+        self._limites_inferiores = {}
+        self.rotulos_gerados = 0
+        self.rotulos_dominados = 0
+        self.rotulos_podados = 0
+
+    def _limites_para(self, alvo):
+        """Limites inferiores (custo e recursos aditivos) de cada nó até o alvo"""
+        if alvo not in self._limites_inferiores:
+            csr = self.csr
+            custo, _, _ = dijkstra_multiplas_fontes(csr, [alvo])
+            por_recurso = []
+            for r, tipo in enumerate(self.tipos):
+                if tipo != SOMA:
+                    por_recurso.append(None)
+                    continue
+                pesos = array('d', (recursos[r] for recursos in self.recursos_arestas))
+                csr_recurso = GraphCSR(csr.nos, csr.indptr, csr.indices, pesos, csr.indice_de)
+                por_recurso.append(dijkstra_multiplas_fontes(csr_recurso, [alvo])[0])
+            self._limites_inferiores[alvo] = (custo, por_recurso)
+        return self._limites_inferiores[alvo]
+
+    def _viavel(self, recursos, no, limites, limites_recursos):
+        for r, limite in enumerate(limites):
+            if limite is None:
+                continue
+            restante = limites_recursos[r][no] if limites_recursos[r] is not None else 0.0
+            if recursos[r] + restante > limite:
+                return False
+        return True
+
+    def buscar(self, inicio, fim, limites):
+        """
+        Busca o caminho de menor custo com recursos dentro dos limites.
+
+        Args:
+            limites: Limite de cada recurso (None = sem limite)
+
+        Returns:
+            Tupla (caminho, custo, recursos); (None, inf, None) se não houver
+            caminho viável.
+        """
+        csr = self.csr
+        limites = list(limites) + [None] * (len(self.tipos) - len(limites))
+        origem, alvo = csr.indice_de(inicio), csr.indice_de(fim)
+        limite_custo, limites_recursos = self._limites_para(alvo)
+        self.rotulos_gerados = self.rotulos_dominados = self.rotulos_podados = 0
+
+        recursos_iniciais = (0.0,) * len(self.tipos)
+        if limite_custo[origem] == float('inf') or \
+                not self._viavel(recursos_iniciais, origem, limites, limites_recursos):
+            return None, float('inf'), None
+
+        # Rótulo: [custo, recursos, nó, rótulo pai, ativo]
+        raiz = [0.0, recursos_iniciais, origem, None, True]
+        rotulos_por_no = {origem: [raiz]}
+        contador = 0
+        fila = [(limite_custo[origem], contador, raiz)]
+        self.rotulos_gerados = 1
+        indptr, indices, custos = csr.indptr, csr.indices, csr.custos
+
+        while fila:
+            _, _, rotulo = heapq.heappop(fila)
+            if not rotulo[4]:
+                continue  # Dominado depois de entrar na fila
+            custo, recursos, u = rotulo[0], rotulo[1], rotulo[2]
+
+            if u == alvo:
+                caminho = []
+                while rotulo is not None:
+                    caminho.append(csr.nos[rotulo[2]])
+                    rotulo = rotulo[3]
+                caminho.reverse()
+                return caminho, custo, recursos
+
+            for p in range(indptr[u], indptr[u + 1]):
+                v = indices[p]
+                if limite_custo[v] == float('inf'):
+                    continue
+
+                consumo = self.recursos_arestas[p]
+                novos_recursos = tuple(
+                    max(atual, extra) if tipo == MAXIMO else atual + extra
+                    for atual, extra, tipo in zip(recursos, consumo, self.tipos)
+                )
+                if not self._viavel(novos_recursos, v, limites, limites_recursos):
+                    self.rotulos_podados += 1
+                    continue
+
+                novo_custo = custo + custos[p]
+                existentes = rotulos_por_no.setdefault(v, [])
+
+                # Descarta o novo rótulo se algum existente o domina
+                if any(e[0] <= novo_custo and all(a <= b for a, b in zip(e[1], novos_recursos))
+                       for e in existentes):
+                    self.rotulos_dominados += 1
+                    continue
+
+                # Desativa os existentes dominados pelo novo
+                restantes = []
+                for e in existentes:
+                    if novo_custo <= e[0] and all(a <= b for a, b in zip(novos_recursos, e[1])):
+                        e[4] = False
+                        self.rotulos_dominados += 1
+                    else:
+                        restantes.append(e)
+
+                novo = [novo_custo, novos_recursos, v, rotulo, True]
+                restantes.append(novo)
+                rotulos_por_no[v] = restantes
+                contador += 1
+                self.rotulos_gerados += 1
+                heapq.heappush(fila, (novo_custo + limite_custo[v], contador, novo))
+
+        return None, float('inf'), None
+
+
+def caminho_restrito(grafo, inicio, fim, limites, tipos=None):
+    """Atalho para ResourceConstrainedSearch(grafo, tipos).buscar(inicio, fim, limites)"""
+    return ResourceConstrainedSearch(grafo, tipos).buscar(inicio, fim, limites)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional; só as rotinas vetorizadas precisam dele
+    np = None
+
+
+def exigir_numpy():
+    """Levanta ImportError com mensagem clara se o NumPy não estiver instalado"""
+    if np is None:
+        raise ImportError("Este recurso requer NumPy (pip install numpy)")
+    return np
+
+
+class GraphCSR:
+    """
+    Representação compacta (CSR) da lista de adjacência de um Graph.
+
+    Os nós são numerados de 0 a n-1 na ordem de grafo.nos. Os vizinhos do
+    nó de índice i são indices[indptr[i]:indptr[i + 1]], na mesma ordem de
+    grafo.obter_vizinhos, com os custos correspondentes em custos.
+    Os arrays são array.array da biblioteca padrão; para_numpy() retorna
+    visões NumPy sobre os mesmos buffers, sem cópia.
+
+    nos pode ser qualquer sequência (ex: o buffer de ids de uma
+    SharedGraphView) e não é copiada. indice_de é a função que dá o índice
+    de um id (None se não existir); sem ela, um dicionário é montado na
+    primeira consulta.
+    """
+
+    def __init__(self, nos, indptr, indices, custos, indice_de=None):
+        self.nos = nos
+        self.indptr = indptr
+        self.indices = indices
+        self.custos = custos
+        self._indice_de = indice_de
+        self._numpy = None
+
+    @classmethod
+    def de_grafo(cls, grafo):
+        """Constrói o CSR a partir de um Graph"""
+        nos = grafo.nos
+        indice = {no: i for i, no in enumerate(nos)}
+        indptr = array('q', [0])
+        indices = array('q')
+        custos = array('d')
+
+        for no in nos:
+            for vizinho, custo in grafo.obter_vizinhos(no):
+                indices.append(indice[vizinho])
+                custos.append(custo)
+            indptr.append(len(indices))
+
+        return cls(list(nos), indptr, indices, custos, indice.get)
+
+    def indice_de(self, no):
+        """Índice (0..n-1) do nó, ou None se não existir"""
+        if self._indice_de is None:
+            self._indice_de = {no: i for i, no in enumerate(self.nos)}.get
+        return self._indice_de(no)
+
+    @property
+    def num_nos(self):
+        return len(self.nos)
+
+    @property
+    def num_arestas(self):
+        """Número de arestas direcionadas (cada aresta do grafo conta duas vezes)"""
+        return len(self.indices)
+
+    def para_numpy(self):
+        """Retorna (indptr, indices, custos) como arrays NumPy compartilhando memória"""
+        exigir_numpy()
+        if self._numpy is None:
+            self._numpy = (
+                np.frombuffer(self.indptr, dtype=np.int64),
+                np.frombuffer(self.indices, dtype=np.int64),
+                np.frombuffer(self.custos, dtype=np.float64)
+            )
+        return self._numpy
+
+    def __repr__(self):
+        return f"GraphCSR(nos={self.num_nos}, arestas={self.num_arestas // 2})"
+
+
+def bfs_por_niveis(csr, origem, destino=None, ao_expandir=None):
+    """
+    BFS síncrona por níveis: expande a fronteira inteira de uma vez.
+
+    A fronteira de cada nível é mantida na ordem de descoberta e o pai de
+    cada nó novo é o primeiro nó da fronteira que o alcança, de modo que a
+    árvore resultante é idêntica à de uma BFS com fila FIFO.
+
+    Args:
+        csr: GraphCSR do grafo
+        origem: Índice (0..n-1) do nó inicial
+        destino: Índice do nó objetivo, ou None para percorrer todo o grafo
+        ao_expandir: Função opcional chamada com o array de índices de cada
+                     fronteira antes de expandi-la; pode levantar uma exceção
+                     para interromper a busca (ex: SearchCancelled)
+
+    Returns:
+        Tupla (pais, niveis): pais[i] é o índice do pai de i (-1 se não
+        alcançado ou raiz) e niveis é a lista de arrays de índices
+        descobertos em cada nível, na ordem de descoberta. Se o destino for
+        encontrado, o último nível termina nele.
+    """
+    exigir_numpy()
+    indptr, indices, _ = csr.para_numpy()
+    n = csr.num_nos
+
+    visitados = np.zeros(n, dtype=bool)
+    pais = np.full(n, -1, dtype=np.int64)
+    visitados[origem] = True
+
+    fronteira = np.array([origem], dtype=np.int64)
+    niveis = [fronteira]
+
+    while fronteira.size:
+        if ao_expandir is not None:
+            ao_expandir(fronteira)
+        inicios = indptr[fronteira]
+        quantidades = indptr[fronteira + 1] - inicios
+        total = int(quantidades.sum())
+        if total == 0:
+            break
+
+        # Gather: posições de todas as arestas da fronteira em um único array
+        deslocamentos = np.repeat(inicios - np.cumsum(quantidades) + quantidades, quantidades)
+        posicoes = deslocamentos + np.arange(total, dtype=np.int64)
+        vizinhos = indices[posicoes]
+        origens = np.repeat(fronteira, quantidades)
+
+        novos_mask = ~visitados[vizinhos]
+        vizinhos = vizinhos[novos_mask]
+        if vizinhos.size == 0:
+            break
+        origens = origens[novos_mask]
+
+        # Primeira ocorrência de cada vizinho, preservando a ordem de descoberta
+        _, primeiros = np.unique(vizinhos, return_index=True)
+        primeiros.sort()
+        novos = vizinhos[primeiros]
+        pais[novos] = origens[primeiros]
+        visitados[novos] = True
+
+        if destino is not None and visitados[destino]:
+            posicao = int(np.flatnonzero(novos == destino)[0])
+            niveis.append(novos[:posicao + 1])
+            break
+
+        niveis.append(novos)
+        fronteira = novos
+
+    return pais, niveis
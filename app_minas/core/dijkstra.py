@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import heapq
+from array import array
+
+
+def dijkstra_multiplas_fontes(csr, fontes, alvo=None):
+    """
+    Dijkstra com heap binário sobre um GraphCSR, a partir de várias fontes.
+
+    Todas as fontes começam com distância 0; cada nó recebe a fonte mais
+    barata que o alcança (rótulo), a distância e o predecessor no caminho
+    vindo dessa fonte.
+
+    Args:
+        csr: GraphCSR do grafo
+        fontes: Índices CSR das fontes
+        alvo: Índice CSR opcional; a busca para quando ele é fixado
+
+    Returns:
+        Tupla (distancias, predecessores, rotulos) de array.array indexados
+        pelo índice CSR. Nós não alcançados têm distância inf, predecessor -1
+        e rótulo -1. O rótulo é a posição da fonte na lista `fontes`.
+    """
+    n = csr.num_nos
+    indptr, indices, custos = csr.indptr, csr.indices, csr.custos
+
+    distancias = array('d', [float('inf')]) * n
+    predecessores = array('q', [-1]) * n
+    rotulos = array('q', [-1]) * n
+    fixados = bytearray(n)
+
+    heap = []
+    for posicao, fonte in enumerate(fontes):
+        if distancias[fonte] > 0:
+            distancias[fonte] = 0.0
+            rotulos[fonte] = posicao
+            heap.append((0.0, fonte))
+    heapq.heapify(heap)
+
+    while heap:
+        distancia, u = heapq.heappop(heap)
+        if fixados[u]:
+            continue
+        fixados[u] = 1
+        if u == alvo:
+            break
+
+        rotulo = rotulos[u]
+        for posicao in range(indptr[u], indptr[u + 1]):
+            v = indices[posicao]
+            nova = distancia + custos[posicao]
+            if nova < distancias[v]:
+                distancias[v] = nova
+                predecessores[v] = u
+                rotulos[v] = rotulo
+                heapq.heappush(heap, (nova, v))
+
+    return distancias, predecessores, rotulos
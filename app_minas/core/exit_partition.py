@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import struct
+from array import array
+from .csr import GraphCSR
+from .dijkstra import dijkstra_multiplas_fontes
+from .utils import gravar_array, ler_array
+
+_ASSINATURA = b'EXPT'
+_CABECALHO = struct.Struct('<4sII')
+
+
+class ExitPartition:
+    """
+    Partição do grafo pelas saídas mais baratas (células de Voronoi das saídas).
+
+    Um único Dijkstra de múltiplas fontes rotula cada nó com a saída mais
+    próxima, a distância até ela e o próximo nó na rota até a saída. Os
+    rótulos ficam em arrays indexados pela posição do nó, de modo que a
+    consulta de qualquer nó é O(1) e a rota completa custa O(tamanho da rota).
+    """
+
+    def __init__(self, nos, saidas, rotulos, distancias, proximos):
+        self.nos = array('q', nos)
+        self.saidas = list(saidas)
+        self.rotulos = rotulos  # Posição da saída em self.saidas (-1 se inalcançável)
+        self.distancias = distancias  # Custo até a saída (inf se inalcançável)
+        self.proximos = proximos  # Índice do próximo nó em direção à saída (-1 na saída)
+        self.indice = {no: i for i, no in enumerate(self.nos)}
+
+    @classmethod
+    def calcular(cls, grafo, saidas, csr=None):
+        """Calcula a partição de um Graph para a lista de saídas"""
+        if csr is None:
+            csr = GraphCSR.de_grafo(grafo)
+        saidas = list(saidas)
+        distancias, predecessores, rotulos = dijkstra_multiplas_fontes(
+            csr, [csr.indice_de(saida) for saida in saidas]
+        )
+        # Grafo não-direcionado: o predecessor vindo da saída é o próximo passo até ela
+        return cls(csr.nos, saidas, rotulos, distancias, predecessores)
+
+    def consultar(self, no):
+        """Retorna (saida, custo) da saída mais barata do nó, ou (None, inf)"""
+        i = self.indice[no]
+        rotulo = self.rotulos[i]
+        if rotulo < 0:
+            return None, float('inf')
+        return self.saidas[rotulo], self.distancias[i]
+
+    def rota(self, no):
+        """Retorna a rota do nó até sua saída mais barata (None se não houver)"""
+        i = self.indice[no]
+        if self.rotulos[i] < 0:
+            return None
+        caminho = [no]
+        i = self.proximos[i]
+        while i >= 0:
+            caminho.append(self.nos[i])
+            i = self.proximos[i]
+        return caminho
+
+    def nos_da_saida(self, saida):
+        """Lista os nós atendidos por uma saída"""
+        rotulo = self.saidas.index(saida)
+        return [self.nos[i] for i, r in enumerate(self.rotulos) if r == rotulo]
+
+    def salvar(self, caminho_arquivo):
+        """Grava os arrays de rótulos em formato binário (little-endian)"""
+        with open(caminho_arquivo, 'wb') as arquivo:
+            arquivo.write(_CABECALHO.pack(_ASSINATURA, len(self.nos), len(self.saidas)))
+            gravar_array(self.nos, arquivo)
+            gravar_array(array('q', self.saidas), arquivo)
+            gravar_array(self.rotulos, arquivo)
+            gravar_array(self.distancias, arquivo)
+            gravar_array(self.proximos, arquivo)
+        return caminho_arquivo
+
+    @classmethod
+    def carregar(cls, caminho_arquivo):
+        """Carrega uma partição gravada com salvar()"""
+        with open(caminho_arquivo, 'rb') as arquivo:
+            assinatura, num_nos, num_saidas = _CABECALHO.unpack(arquivo.read(_CABECALHO.size))
+            if assinatura != _ASSINATURA:
+                raise ValueError("Arquivo não é uma partição de saídas")
+
+            nos = ler_array('q', arquivo, num_nos)
+            saidas = ler_array('q', arquivo, num_saidas).tolist()
+            rotulos = ler_array('q', arquivo, num_nos)
+            distancias = ler_array('d', arquivo, num_nos)
+            proximos = ler_array('q', arquivo, num_nos)
+        return cls(nos, saidas, rotulos, distancias, proximos)
+
+    def __repr__(self):
+        return f"ExitPartition(nos={len(self.nos)}, saidas={len(self.saidas)})"
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Layout por forças (Fruchterman-Reingold) vetorizado com NumPy, para grafos
+sem coordenadas.
+
+A repulsão entre todos os pares é aproximada no estilo Barnes-Hut com uma
+hierarquia de grades: em cada nível, cada nó é repelido pelo centro de
+massa das células da sua lista de interação (filhas das vizinhas da célula
+pai que não são vizinhas da sua própria célula), e no nível mais fino as
+células vizinhas são tratadas par a par. Cada iteração custa O(n log n)
+operações vetorizadas.
+
+As coordenadas resultantes também servem de heurística para o A*: com a
+escala admissível (menor razão custo/comprimento entre as arestas), a
+distância euclidiana entre dois nós nunca supera o custo do menor caminho.
+"""
+
+import math
+import struct
+from array import array
+from .csr import GraphCSR, exigir_numpy
+from .utils import gravar_array, ler_array
+
+_MAX_POR_CELULA = 16  # Nós por célula tratados par a par no nível mais fino
+_ASSINATURA = b'LAYT'
+_CABECALHO = struct.Struct('<4sIq')
+
+
+def _grade(np, relativas, pos, lado):
+    """Célula de cada nó e massa/centro de massa de cada célula de uma grade lado x lado"""
+    cx = np.minimum((relativas[:, 0] * lado).astype(np.int64), lado - 1)
+    cy = np.minimum((relativas[:, 1] * lado).astype(np.int64), lado - 1)
+    ids = cx * lado + cy
+    massa = np.bincount(ids, minlength=lado * lado).astype(np.float64)
+    ocupadas = massa > 0
+    centro_x = np.bincount(ids, weights=pos[:, 0], minlength=lado * lado)
+    centro_y = np.bincount(ids, weights=pos[:, 1], minlength=lado * lado)
+    centro_x[ocupadas] /= massa[ocupadas]
+    centro_y[ocupadas] /= massa[ocupadas]
+    return cx, cy, ids, massa, centro_x, centro_y
+
+
+def _lista_interacao(np, cx, cy, lado):
+    """
+    Gera (validas, alvo) para as 6x6 células filhas das vizinhas da célula
+    pai que não são vizinhas da própria célula
+    """
+    base_x = 2 * (cx // 2) - 2
+    base_y = 2 * (cy // 2) - 2
+    for ax in range(6):
+        tx = base_x + ax
+        for ay in range(6):
+            ty = base_y + ay
+            validas = (tx >= 0) & (tx < lado) & (ty >= 0) & (ty < lado) & \
+                      ((np.abs(tx - cx) > 1) | (np.abs(ty - cy) > 1))
+            yield validas, np.where(validas, tx * lado + ty, 0)
+
+
+def _repulsao(np, pos, k2):
+    """Força de repulsão aproximada sobre cada nó"""
+    n = len(pos)
+    fx = np.zeros(n)
+    fy = np.zeros(n)
+    minimo = pos.min(axis=0)
+    extensao = max(float((pos.max(axis=0) - minimo).max()), 1e-9) * (1 + 1e-9)
+    niveis = max(2, min(10, math.ceil(math.log(max(n, 2) / 2, 4))))
+    relativas = (pos - minimo) / extensao  # Em [0, 1)
+
+    # Níveis grossos: força e jacobiano no centro de massa de cada célula,
+    # aplicados aos nós pela expansão de primeira ordem
+    for nivel in range(2, niveis):
+        lado = 1 << nivel
+        cx, cy, ids, massa, centro_x, centro_y = _grade(np, relativas, pos, lado)
+        celulas = np.arange(lado * lado)
+        ux, uy = centro_x, centro_y
+        gx, gy, jxx, jxy, jyy = (np.zeros(lado * lado) for _ in range(5))
+        for validas, alvo in _lista_interacao(np, celulas // lado, celulas % lado, lado):
+            m = np.where(validas, massa[alvo], 0.0) * k2
+            dx = ux - centro_x[alvo]
+            dy = uy - centro_y[alvo]
+            r2 = dx * dx + dy * dy + 1e-9
+            f = m / r2
+            gx += dx * f
+            gy += dy * f
+            g = 2 * f / r2
+            jxx += f - g * dx * dx
+            jxy -= g * dx * dy
+            jyy += f - g * dy * dy
+        ox = pos[:, 0] - ux[ids]
+        oy = pos[:, 1] - uy[ids]
+        fx += gx[ids] + jxx[ids] * ox + jxy[ids] * oy
+        fy += gy[ids] + jxy[ids] * ox + jyy[ids] * oy
+
+    # Nível mais fino: lista de interação avaliada em cada nó
+    lado = 1 << niveis
+    cx, cy, ids, massa, centro_x, centro_y = _grade(np, relativas, pos, lado)
+    x, y = pos[:, 0], pos[:, 1]
+    for validas, alvo in _lista_interacao(np, cx, cy, lado):
+        m = np.where(validas, massa[alvo], 0.0) * k2
+        dx = x - centro_x[alvo]
+        dy = y - centro_y[alvo]
+        f = m / (dx * dx + dy * dy + 1e-9)
+        fx += dx * f
+        fy += dy * f
+
+    # Células vizinhas: pares exatos (até _MAX_POR_CELULA nós por célula)
+    ordem = np.argsort(ids, kind='stable')
+    inicio_celula = np.concatenate(([0], np.cumsum(massa.astype(np.int64))[:-1]))
+    posto = np.empty(n, dtype=np.int64)
+    posto[ordem] = np.arange(n) - inicio_celula[ids[ordem]]
+    largura = int(min(_MAX_POR_CELULA, massa.max()))
+    tabela = np.full((lado * lado, largura), -1, dtype=np.int64)
+    cabem = posto < largura
+    tabela[ids[cabem], posto[cabem]] = np.nonzero(cabem)[0]
+
+    indices = np.arange(n)[:, None]
+    for vx in (-1, 0, 1):
+        tx = cx + vx
+        for vy in (-1, 0, 1):
+            ty = cy + vy
+            validas = (tx >= 0) & (tx < lado) & (ty >= 0) & (ty < lado)
+            candidatos = tabela[np.where(validas, tx * lado + ty, 0)]
+            usar = validas[:, None] & (candidatos >= 0) & (candidatos != indices)
+            candidatos = np.maximum(candidatos, 0)
+            dx = x[:, None] - x[candidatos]
+            dy = y[:, None] - y[candidatos]
+            f = np.where(usar, k2 / (dx * dx + dy * dy + 1e-9), 0.0)
+            fx += (dx * f).sum(axis=1)
+            fy += (dy * f).sum(axis=1)
+
+    return np.column_stack((fx, fy))
+
+
+def layout_forcas(grafo, iteracoes=None, csr=None, progresso=None, intervalo_progresso=10, semente=0):
+    """
+    Calcula posições para os nós do grafo.
+
+    Args:
+        iteracoes: Número de iterações (padrão: proporcional ao tamanho do grafo)
+        progresso: Função (iteracao, total, coordenadas) chamada a cada
+                   intervalo_progresso iterações, com coordenadas como array
+                   NumPy (n, 2) na ordem de grafo.nos; retornar False interrompe
+                   o layout, que devolve as coordenadas atuais
+
+    Returns:
+        Tupla (posicoes, escala): posicoes é {no: (x, y)}, com distância ideal
+        1 entre vizinhos, e escala é o fator que torna a distância euclidiana
+        uma heurística admissível (veja escala_admissivel)
+    """
+    np = exigir_numpy()
+    if csr is None:
+        csr = GraphCSR.de_grafo(grafo)
+    n = csr.num_nos
+    if n == 0:
+        return {}, 0.0
+    if iteracoes is None:
+        iteracoes = max(30, min(300, 3000000 // max(n, 1)))
+
+    indptr, indices, custos = csr.para_numpy()
+    linhas = np.repeat(np.arange(n), np.diff(indptr))
+    unicas = linhas < indices  # Cada aresta não-direcionada uma vez
+    origens, destinos = linhas[unicas], indices[unicas]
+
+    gerador = np.random.default_rng(semente)
+    pos = gerador.uniform(0, math.sqrt(n), size=(n, 2))
+    k2 = 1.0
+    temperatura = math.sqrt(n)  # Da ordem do tamanho da área inicial
+
+    for iteracao in range(1, iteracoes + 1):
+        forca = _repulsao(np, pos, k2) if n > 1 else np.zeros_like(pos)
+
+        # Atração ao longo das arestas: d^2 / k
+        delta = pos[origens] - pos[destinos]
+        d = np.sqrt(np.einsum('ij,ij->i', delta, delta)) + 1e-9
+        puxao = delta * d[:, None]
+        np.subtract.at(forca, origens, puxao)
+        np.add.at(forca, destinos, puxao)
+
+        # Deslocamento limitado pela temperatura, que resfria linearmente
+        norma = np.sqrt(np.einsum('ij,ij->i', forca, forca)) + 1e-9
+        limite = temperatura * (1 - (iteracao - 1) / iteracoes) + 0.01
+        pos += forca * (np.minimum(norma, limite) / norma)[:, None]
+
+        if progresso is not None and (iteracao % intervalo_progresso == 0 or iteracao == iteracoes):
+            if progresso(iteracao, iteracoes, pos) is False:
+                break
+
+    posicoes = {no: (float(pos[i, 0]), float(pos[i, 1])) for i, no in enumerate(csr.nos)}
+    return posicoes, escala_admissivel(grafo, posicoes)
+
+
+def escala_admissivel(grafo, posicoes):
+    """
+    Maior fator s tal que s * comprimento <= custo em todas as arestas.
+
+    Pela desigualdade triangular, s vezes a distância euclidiana entre dois
+    nós é então um limite inferior do custo do menor caminho entre eles.
+    """
+    escala = float('inf')
+    for origem in grafo.nos:
+        x1, y1 = posicoes[origem]
+        for destino, custo in grafo.obter_vizinhos(origem):
+            x2, y2 = posicoes[destino]
+            comprimento = math.hypot(x2 - x1, y2 - y1)
+            if comprimento > 0:
+                escala = min(escala, custo / comprimento)
+    return 0.0 if escala == float('inf') else max(escala, 0.0)
+
+
+def salvar_layout(caminho_arquivo, posicoes, escala):
+    """Grava as posições calculadas (cache ao lado do arquivo do grafo, little-endian)"""
+    nos = list(posicoes)
+    coordenadas = array('d')
+    for no in nos:
+        coordenadas.extend(posicoes[no])
+    with open(caminho_arquivo, 'wb') as arquivo:
+        arquivo.write(_CABECALHO.pack(_ASSINATURA, 1, len(nos)))
+        arquivo.write(struct.pack('<d', escala))
+        gravar_array(array('q', nos), arquivo)
+        gravar_array(coordenadas, arquivo)
+    return caminho_arquivo
+
+
+def carregar_layout(caminho_arquivo):
+    """Lê um layout gravado com salvar_layout; retorna (posicoes, escala)"""
+    with open(caminho_arquivo, 'rb') as arquivo:
+        assinatura, _, n = _CABECALHO.unpack(arquivo.read(_CABECALHO.size))
+        if assinatura != _ASSINATURA:
+            raise ValueError("Arquivo não é um layout de grafo")
+        escala, = struct.unpack('<d', arquivo.read(8))
+        nos = ler_array('q', arquivo, n)
+        coordenadas = ler_array('d', arquivo, 2 * n)
+    posicoes = {no: (coordenadas[2 * i], coordenadas[2 * i + 1]) for i, no in enumerate(nos)}
+    return posicoes, escala
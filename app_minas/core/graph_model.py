@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+from .csr import GraphCSR
+
 class Node:
     """Classe para representar um nó na árvore de busca"""
     def __init__(self, pai=None, estado=None, custo=0, profundidade=0):
@@ -27,10 +29,15 @@ class Graph:
         self.num_nos = 0
         self.arestas = {}  # Dicionário de adjacências: {no: [(vizinho, custo), ...]}
         self.posicoes = {}  # Posições dos nós para visualização
+        self.recursos = {}  # Recursos extras por aresta: {(origem, destino): (r1, r2, ...)}
+        self.posicoes_layout = {}  # Posições calculadas (force_layout) para grafos sem posições
+        self.escala_layout = 0.0  # Fator que torna as distâncias do layout uma heurística admissível
+        self._csr = None  # GraphCSR em cache (descartado a cada alteração do grafo)
 
     def adicionar_no(self, no, posicao=None):
         """Adiciona um nó ao grafo"""
-        if no not in self.nos:
+        if no not in self.arestas:  # O(1): todo nó tem entrada em arestas
+            self._csr = None
             self.nos.append(no)
             self.arestas[no] = []
             self.num_nos = len(self.nos)
@@ -39,17 +46,43 @@ class Graph:
 
     def adicionar_aresta(self, origem, destino, custo):
         """Adiciona uma aresta bidirecional"""
-        if origem not in self.nos:
+        if origem not in self.arestas:
             self.adicionar_no(origem)
-        if destino not in self.nos:
+        if destino not in self.arestas:
             self.adicionar_no(destino)
+        self._csr = None
         self.arestas[origem].append((destino, custo))
         self.arestas[destino].append((origem, custo))
 
+    def definir_recursos_aresta(self, origem, destino, recursos):
+        """
+        Define o vetor de recursos extras (ex: inclinação, exposição à ventilação)
+        da aresta entre dois nós, nos dois sentidos
+        """
+        recursos = tuple(recursos)
+        self.recursos[(origem, destino)] = recursos
+        self.recursos[(destino, origem)] = recursos
+
+    def obter_recursos_aresta(self, origem, destino):
+        """Retorna o vetor de recursos da aresta (tupla vazia se não definido)"""
+        return self.recursos.get((origem, destino), ())
+
+    def definir_layout(self, posicoes, escala):
+        """Guarda as posições calculadas por layout_forcas e sua escala admissível"""
+        self.posicoes_layout = posicoes
+        self.escala_layout = escala
+
     def obter_vizinhos(self, no):
         """Retorna os vizinhos de um nó com seus respectivos custos"""
         return self.arestas.get(no, [])
 
+    def para_csr(self):
+        """GraphCSR do grafo, construído uma vez e reaproveitado até a próxima alteração"""
+        csr = self._csr
+        if csr is None:
+            csr = self._csr = GraphCSR.de_grafo(self)
+        return csr
+
     def obter_custo_aresta(self, origem, destino):
         """Retorna o custo da aresta entre dois nós"""
         for vizinho, custo in self.arestas.get(origem, []):
@@ -57,11 +90,21 @@ class Graph:
                 return custo
         return float('inf')
 
-    def carregar_de_arquivo(self, caminho_arquivo):
-        """Carrega o grafo de um arquivo de texto"""
+    def carregar_de_arquivo(self, caminho_arquivo, progresso=None):
+        """
+        Carrega o grafo de um arquivo de texto
+
+        Args:
+            progresso: Função opcional chamada com a fração (0 a 1) já lida;
+                       se retornar False o carregamento é cancelado
+
+        Returns:
+            True se carregou; False em caso de erro ou cancelamento
+        """
         try:
             with open(caminho_arquivo, 'r', encoding='utf-8') as arquivo:
                 linhas = arquivo.readlines()
+            passo_progresso = max(1, len(linhas) // 100)
 
             # Ignora comentários e linhas vazias até encontrar o número de nós
             num_nos = None
@@ -79,7 +122,10 @@ class Graph:
                 self.adicionar_no(i)
 
             # Adicionar arestas
-            for linha in linhas:
+            for numero, linha in enumerate(linhas):
+                if progresso is not None and numero % passo_progresso == 0:
+                    if progresso(numero / len(linhas)) is False:
+                        return False
                 linha = linha.strip()
                 if linha and not linha.startswith('#'):
                     partes = linha.split()
@@ -89,10 +135,21 @@ class Graph:
                             destino = int(partes[1])
                             custo = float(partes[2])
                             self.adicionar_aresta(origem, destino, custo)
+                            # Colunas numéricas após o custo são recursos da aresta
+                            recursos = []
+                            for parte in partes[3:]:
+                                try:
+                                    recursos.append(float(parte))
+                                except ValueError:
+                                    break
+                            if recursos:
+                                self.definir_recursos_aresta(origem, destino, recursos)
                         except ValueError:
                             # Ignora linhas não numéricas (comentários, etc.)
                             continue
 
+            if progresso is not None:
+                progresso(1.0)
             return True
 
         except Exception as e:
@@ -103,7 +160,11 @@ class Graph:
         """Carrega um grafo de exemplo (A–J)"""
         self.nos = []
         self.arestas = {}
+        self._csr = None
         self.posicoes = {}
+        self.recursos = {}
+        self.posicoes_layout = {}
+        self.escala_layout = 0.0
 
         nos_exemplo = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
         for no in nos_exemplo:
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Grafo implícito de uma grade de ocupação.
+
+Mapas de túneis exportados célula a célula viram uma grade largura x altura
+guardada como um bitmap (1 bit por célula, 1 = livre), sem listas de
+adjacência: os vizinhos de uma célula são calculados a partir do bitmap
+quando pedidos. Cada célula livre (x, y) é o nó de id y * largura + x + 1.
+Os movimentos ortogonais custam 1 e, com diagonais=True, os diagonais custam
+raiz de 2 e só são permitidos quando as duas células ortogonais adjacentes
+estão livres (sem cortar quinas).
+
+GridGraph tem a mesma interface de consulta de Graph (nos, num_nos,
+posicoes, obter_vizinhos, obter_custo_aresta), portanto serve a todos os
+algoritmos de busca; a Jump Point Search (SearchAlgorithmsP) usa o bitmap
+diretamente. As posições estão em unidades de célula, o que mantém a
+distância euclidiana uma heurística admissível.
+
+Formato de arquivo (.map): opcionalmente o cabeçalho "type octile|four",
+"height H", "width W" e "map", seguido de uma linha por linha da grade em
+que '.', 'G' e 'S' são células livres e qualquer outro caractere é obstáculo.
+"""
+
+import math
+import os
+from .csr import GraphCSR
+
+DIAGONAL = math.sqrt(2)
+EXTENSOES_GRADE = ('.map',)
+CELULAS_LIVRES = frozenset('.GS')
+ESCALA_EXIBICAO_GRADE = 40  # Unidades da cena por célula na visualização
+
+
+class _NosGrade:
+    """Sequência somente leitura dos ids das células livres com teste de pertinência O(1)"""
+
+    def __init__(self, grade):
+        self._grade = grade
+
+    def __len__(self):
+        return self._grade.num_nos
+
+    def __iter__(self):
+        grade = self._grade
+        for y in range(grade.altura):
+            for x in range(grade.largura):
+                if grade.livre(x, y):
+                    yield y * grade.largura + x + 1
+
+    def __contains__(self, no):
+        return self._grade.coordenadas(no) is not None
+
+
+class _PosicoesGrade:
+    """Mapeamento somente leitura no -> (x, y) calculado a partir do id"""
+
+    def __init__(self, grade):
+        self._grade = grade
+
+    def __bool__(self):
+        return self._grade.num_nos > 0
+
+    def __len__(self):
+        return self._grade.num_nos
+
+    def __getitem__(self, no):
+        posicao = self._grade.coordenadas(no)
+        if posicao is None:
+            raise KeyError(no)
+        return posicao
+
+    def get(self, no, padrao=None):
+        posicao = self._grade.coordenadas(no)
+        return padrao if posicao is None else posicao
+
+    def __contains__(self, no):
+        return self._grade.coordenadas(no) is not None
+
+    def __iter__(self):
+        return iter(self._grade.nos)
+
+    def items(self):
+        return ((no, self[no]) for no in self)
+
+
+class GridGraph:
+    """Grafo implícito de uma grade de ocupação (bitmap de células livres)"""
+
+    def __init__(self, largura=0, altura=0, diagonais=True):
+        self.largura = largura
+        self.altura = altura
+        self.diagonais = diagonais
+        self.ocupacao = bytearray((largura * altura + 7) // 8)  # Bit 1 = célula livre
+        self.num_nos = 0
+        self.nos = _NosGrade(self)
+        self.posicoes = _PosicoesGrade(self)
+        self.recursos = {}
+        self.posicoes_layout = {}
+        self.escala_layout = 0.0
+        self._csr = None  # GraphCSR em cache (descartado a cada alteração da grade)
+
+    @staticmethod
+    def e_arquivo_grade(caminho_arquivo):
+        """Indica se o arquivo deve ser lido como grade de ocupação (pela extensão)"""
+        return os.path.splitext(caminho_arquivo)[1].lower() in EXTENSOES_GRADE
+
+    def id_no(self, x, y):
+        """Id do nó da célula (x, y)"""
+        return y * self.largura + x + 1
+
+    def coordenadas(self, no):
+        """Célula (x, y) do nó, ou None se o id não for uma célula livre"""
+        if not isinstance(no, int):
+            return None
+        i = no - 1
+        if i < 0 or i >= self.largura * self.altura or not (self.ocupacao[i >> 3] >> (i & 7)) & 1:
+            return None
+        return i % self.largura, i // self.largura
+
+    def livre(self, x, y):
+        """Indica se (x, y) está dentro da grade e livre"""
+        if x < 0 or y < 0 or x >= self.largura or y >= self.altura:
+            return False
+        i = y * self.largura + x
+        return (self.ocupacao[i >> 3] >> (i & 7)) & 1 == 1
+
+    def definir_livre(self, x, y, livre=True):
+        """Marca a célula (x, y) como livre ou obstáculo"""
+        i = y * self.largura + x
+        self._csr = None
+        atual = (self.ocupacao[i >> 3] >> (i & 7)) & 1
+        if livre and not atual:
+            self.ocupacao[i >> 3] |= 1 << (i & 7)
+            self.num_nos += 1
+        elif not livre and atual:
+            self.ocupacao[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+            self.num_nos -= 1
+
+    @classmethod
+    def de_linhas(cls, linhas, diagonais=True):
+        """Cria a grade a partir de linhas de texto ('.' livre, outro caractere obstáculo)"""
+        linhas = [linha.rstrip('\r\n') for linha in linhas]
+        grade = cls(max(map(len, linhas), default=0), len(linhas), diagonais)
+        for y, linha in enumerate(linhas):
+            grade._preencher_linha(y, linha)
+        return grade
+
+    def _preencher_linha(self, y, linha):
+        ocupacao = self.ocupacao
+        self._csr = None
+        base = y * self.largura
+        livres = 0
+        for x, caractere in enumerate(linha[:self.largura]):
+            if caractere in CELULAS_LIVRES:
+                i = base + x
+                ocupacao[i >> 3] |= 1 << (i & 7)
+                livres += 1
+        self.num_nos += livres
+
+    def carregar_de_arquivo(self, caminho_arquivo, progresso=None):
+        """
+        Carrega a grade de um arquivo .map
+
+        Args:
+            progresso: Função opcional chamada com a fração (0 a 1) já lida;
+                       se retornar False o carregamento é cancelado
+
+        Returns:
+            True se carregou; False em caso de erro ou cancelamento
+        """
+        try:
+            with open(caminho_arquivo, 'r', encoding='utf-8') as arquivo:
+                linhas = arquivo.read().splitlines()
+
+            # Cabeçalho opcional no formato dos mapas de benchmark
+            diagonais = self.diagonais
+            inicio = 0
+            while inicio < len(linhas):
+                partes = linhas[inicio].split()
+                if not partes or partes[0].startswith('#'):
+                    inicio += 1
+                    continue
+                chave = partes[0].lower()
+                if chave == 'type' and len(partes) > 1:
+                    diagonais = partes[1].lower() != 'four'
+                elif chave == 'map':
+                    inicio += 1
+                    break
+                elif chave not in ('height', 'width'):
+                    break
+                inicio += 1
+
+            linhas = [linha for linha in linhas[inicio:] if linha.strip()]
+            if not linhas:
+                raise ValueError("Arquivo inválido: grade vazia.")
+
+            self.largura = max(map(len, linhas))
+            self.altura = len(linhas)
+            self.diagonais = diagonais
+            self.ocupacao = bytearray((self.largura * self.altura + 7) // 8)
+            self.num_nos = 0
+            passo_progresso = max(1, len(linhas) // 100)
+            for y, linha in enumerate(linhas):
+                if progresso is not None and y % passo_progresso == 0:
+                    if progresso(y / len(linhas)) is False:
+                        return False
+                self._preencher_linha(y, linha)
+
+            if progresso is not None:
+                progresso(1.0)
+            return True
+
+        except Exception as e:
+            print(f"Erro ao carregar arquivo: {e}")
+            return False
+
+    def definir_layout(self, posicoes, escala):
+        """Guarda posições calculadas por layout_forcas (a grade já tem posições próprias)"""
+        self.posicoes_layout = posicoes
+        self.escala_layout = escala
+
+    def obter_vizinhos(self, no):
+        """Retorna os vizinhos de um nó com seus respectivos custos, calculados do bitmap"""
+        celula = self.coordenadas(no)
+        if celula is None:
+            return []
+        x, y = celula
+        livre = self.livre
+        largura = self.largura
+        vizinhos = []
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            if livre(x + dx, y + dy):
+                vizinhos.append((no + dy * largura + dx, 1.0))
+        if self.diagonais:
+            for dx, dy in ((1, 1), (1, -1), (-1, 1), (-1, -1)):
+                if livre(x + dx, y + dy) and livre(x + dx, y) and livre(x, y + dy):
+                    vizinhos.append((no + dy * largura + dx, DIAGONAL))
+        return vizinhos
+
+    def obter_custo_aresta(self, origem, destino):
+        """Retorna o custo da aresta entre dois nós"""
+        for vizinho, custo in self.obter_vizinhos(origem):
+            if vizinho == destino:
+                return custo
+        return float('inf')
+
+    def obter_recursos_aresta(self, origem, destino):
+        return ()
+
+    def para_csr(self):
+        """GraphCSR das arestas implícitas, construído uma vez até a próxima alteração"""
+        csr = self._csr
+        if csr is None:
+            csr = self._csr = GraphCSR.de_grafo(self)
+        return csr
+
+    def contar_arestas(self):
+        """Número de arestas (não direcionadas) implícitas na grade"""
+        return sum(len(self.obter_vizinhos(no)) for no in self.nos) // 2
+
+    def obter_dados_visualizacao(self):
+        """Retorna dados para visualização (as arestas só são materializadas aqui)"""
+        nos = list(self.nos)
+        arestas = []
+        posicoes = {}
+        for no in nos:
+            x, y = self.coordenadas(no)
+            posicoes[no] = (x * ESCALA_EXIBICAO_GRADE, y * ESCALA_EXIBICAO_GRADE)
+            for vizinho, custo in self.obter_vizinhos(no):
+                if vizinho > no:
+                    arestas.append((no, vizinho, custo))
+        return {
+            'nos': nos,
+            'arestas': arestas,
+            'posicoes': posicoes
+        }
+
+    def __repr__(self):
+        return f"GridGraph({self.largura}x{self.altura}, nos={self.num_nos}, diagonais={self.diagonais})"
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import heapq
+from .csr import GraphCSR
+
+
+def agrupar_por_grade(grafo, tamanho_celula):
+    """
+    Agrupa os nós em células quadradas de acordo com grafo.posicoes.
+    Nós sem posição ficam todos no mesmo agrupamento (None).
+    """
+    clusters = {}
+    for no in grafo.nos:
+        posicao = grafo.posicoes.get(no)
+        if posicao is None:
+            clusters[no] = None
+        else:
+            clusters[no] = (int(posicao[0] // tamanho_celula), int(posicao[1] // tamanho_celula))
+    return clusters
+
+
+class HierarchicalRouter:
+    """
+    Roteamento hierárquico no estilo HPA*.
+
+    O grafo é dividido em agrupamentos (níveis, zonas). Nós com alguma aresta
+    para outro agrupamento são entradas. No pré-processamento, o custo entre
+    cada par de entradas de um mesmo agrupamento é calculado com Dijkstra
+    restrito ao agrupamento, formando o grafo abstrato: entradas ligadas por
+    esses custos internos e pelas arestas que cruzam agrupamentos.
+
+    Na consulta, origem e destino são ligados às entradas dos seus
+    agrupamentos, o grafo abstrato é percorrido com Dijkstra e só então cada
+    trecho interno da rota escolhida é refinado, com buscas que não saem do
+    agrupamento daquele trecho. Como os custos internos são exatos, o custo
+    final é o mesmo de uma busca no grafo inteiro.
+    """
+
+    def __init__(self, grafo, clusters, csr=None):
+        """
+        Args:
+            grafo: Graph a ser roteado
+            clusters: Dicionário {no: agrupamento} ou função no -> agrupamento
+                      (ex: nível da mina); veja também agrupar_por_grade
+        """
+        self.csr = csr if csr is not None else GraphCSR.de_grafo(grafo)
+        csr = self.csr
+        obter = clusters if callable(clusters) else clusters.get
+        self.cluster = [obter(no) for no in csr.nos]
+
+        # Entradas de cada agrupamento
+        self.entradas = {}
+        for u in range(csr.num_nos):
+            for p in range(csr.indptr[u], csr.indptr[u + 1]):
+                if self.cluster[csr.indices[p]] != self.cluster[u]:
+                    self.entradas.setdefault(self.cluster[u], []).append(u)
+                    break
+
+        # Grafo abstrato: {entrada: [(vizinho, custo, interno), ...]}
+        self.abstrato = {}
+        for u_cluster, entradas in self.entradas.items():
+            for u in entradas:
+                arestas = self.abstrato.setdefault(u, [])
+                distancias, _ = self._dijkstra_interno(u)
+                for v in entradas:
+                    if v != u and v in distancias:
+                        arestas.append((v, distancias[v], True))
+                for p in range(csr.indptr[u], csr.indptr[u + 1]):
+                    v = csr.indices[p]
+                    if self.cluster[v] != u_cluster:
+                        arestas.append((v, csr.custos[p], False))
+
+        self._refinados = {}
+        self.nos_abstratos_expandidos = 0
+        self.agrupamentos_refinados = set()
+
+    def _dijkstra_interno(self, origem, alvo=None):
+        """Dijkstra que não sai do agrupamento da origem"""
+        csr = self.csr
+        cluster = self.cluster[origem]
+        distancias = {origem: 0.0}
+        pais = {origem: -1}
+        fixados = set()
+        heap = [(0.0, origem)]
+
+        while heap:
+            distancia, u = heapq.heappop(heap)
+            if u in fixados:
+                continue
+            fixados.add(u)
+            if u == alvo:
+                break
+            for p in range(csr.indptr[u], csr.indptr[u + 1]):
+                v = csr.indices[p]
+                if self.cluster[v] != cluster:
+                    continue
+                nova = distancia + csr.custos[p]
+                if nova < distancias.get(v, float('inf')):
+                    distancias[v] = nova
+                    pais[v] = u
+                    heapq.heappush(heap, (nova, v))
+
+        return distancias, pais
+
+    def _refinar(self, u, v):
+        """Caminho concreto de u a v dentro do agrupamento (em cache entre entradas)"""
+        if (u, v) in self._refinados:
+            return self._refinados[(u, v)]
+
+        self.agrupamentos_refinados.add(self.cluster[u])
+        _, pais = self._dijkstra_interno(u, v)
+        caminho = []
+        atual = v
+        while atual >= 0:
+            caminho.append(atual)
+            atual = pais[atual]
+        caminho.reverse()
+
+        # Trechos que envolvem origem/destino da consulta não são reaproveitáveis
+        if u in self.abstrato and v in self.abstrato:
+            self._refinados[(u, v)] = caminho
+        return caminho
+
+    def buscar(self, inicio, fim):
+        """
+        Busca o caminho de menor custo de inicio a fim.
+
+        Returns:
+            Tupla (caminho, custo); (None, inf) se não houver caminho
+        """
+        csr = self.csr
+        origem, alvo = csr.indice_de(inicio), csr.indice_de(fim)
+        self.nos_abstratos_expandidos = 0
+        self.agrupamentos_refinados = set()
+
+        if origem == alvo:
+            return [inicio], 0
+
+        # Liga origem e destino às entradas dos seus agrupamentos
+        distancias_origem, _ = self._dijkstra_interno(origem)
+        distancias_alvo, _ = self._dijkstra_interno(alvo)
+        saidas_origem = [(e, distancias_origem[e], True)
+                         for e in self.entradas.get(self.cluster[origem], []) if e in distancias_origem]
+        if self.cluster[origem] == self.cluster[alvo] and alvo in distancias_origem:
+            saidas_origem.append((alvo, distancias_origem[alvo], True))
+        chegadas_alvo = {e: distancias_alvo[e]
+                         for e in self.entradas.get(self.cluster[alvo], []) if e in distancias_alvo}
+
+        # Dijkstra no grafo abstrato
+        distancias = {origem: 0.0}
+        pais = {origem: (None, False)}
+        fixados = set()
+        heap = [(0.0, origem)]
+
+        while heap:
+            distancia, u = heapq.heappop(heap)
+            if u in fixados:
+                continue
+            fixados.add(u)
+            self.nos_abstratos_expandidos += 1
+            if u == alvo:
+                break
+
+            arestas = self.abstrato.get(u, [])
+            if u == origem:
+                arestas = saidas_origem + arestas
+            if u in chegadas_alvo and u != origem:
+                arestas = arestas + [(alvo, chegadas_alvo[u], True)]
+
+            for v, custo, interno in arestas:
+                nova = distancia + custo
+                if nova < distancias.get(v, float('inf')):
+                    distancias[v] = nova
+                    pais[v] = (u, interno)
+                    heapq.heappush(heap, (nova, v))
+
+        if alvo not in fixados:
+            return None, float('inf')
+
+        # Refina apenas os trechos internos da rota abstrata
+        trechos = []
+        atual = alvo
+        while pais[atual][0] is not None:
+            anterior, interno = pais[atual]
+            trechos.append((anterior, atual, interno))
+            atual = anterior
+        trechos.reverse()
+
+        caminho = [origem]
+        for u, v, interno in trechos:
+            if interno:
+                caminho.extend(self._refinar(u, v)[1:])
+            else:
+                caminho.append(v)
+
+        return [csr.nos[i] for i in caminho], distancias[alvo]
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+from collections import deque
+from .compact_tree import CompactTree
+
+CUSTO_MAXIMO_RAMO = 0.05  # Fração máxima do tempo da busca gasta copiando o ramo exibido
+
+
+class SearchHook:
+    """
+    Interface de observação dos eventos internos dos algoritmos de busca.
+
+    Os algoritmos guardam o hook numa variável local e só o chamam quando
+    ele não é None, portanto uma busca sem hook não paga nada além de um
+    teste de identidade por evento.
+    """
+
+    def on_expand(self, no):
+        """Chamado quando um nó é retirado da fronteira e expandido"""
+        pass
+
+    def on_generate(self, pai, filho):
+        """Chamado quando um sucessor é criado na árvore de busca"""
+        pass
+
+    def on_reopen(self, antigo, novo):
+        """Chamado quando um estado já gerado é reaberto com custo melhor"""
+        pass
+
+    def on_goal(self, no):
+        """Chamado quando o nó objetivo é encontrado"""
+        pass
+
+    def on_level(self, estados):
+        """Chamado pelas buscas vetorizadas (sem árvore) antes de expandir cada nível"""
+        pass
+
+
+class SearchCancelled(Exception):
+    """Levantada por um hook para interromper a busca em andamento"""
+    pass
+
+
+class CancelHook(SearchHook):
+    """
+    Hook que interrompe a busca (com SearchCancelled) na primeira expansão,
+    ou no próximo nível de uma busca vetorizada, depois de cancelar() ser
+    chamado, possivelmente de outra thread.
+    """
+
+    def __init__(self):
+        self.cancelado = False
+
+    def cancelar(self):
+        """Pede a interrupção da busca"""
+        self.cancelado = True
+
+    def on_expand(self, no):
+        if self.cancelado:
+            raise SearchCancelled()
+
+    def on_level(self, estados):
+        if self.cancelado:
+            raise SearchCancelled()
+
+
+class ProgressHook(CancelHook):
+    """
+    Hook que agrupa os estados expandidos e os entrega em lotes a
+    publicar(estados, ramo, profundidade, raiz), no máximo `frequencia`
+    vezes por segundo.
+
+    Nada do que é entregue é compartilhado com a busca: estados é uma lista
+    de estados; ramo é uma CompactTree com o ramo da raiz até o último nó
+    expandido, copiada na thread da busca (None nas buscas vetorizadas, que
+    não montam árvore), e profundidade é a desse nó; raiz conta as raízes
+    expandidas (muda a cada iteração do aprofundamento iterativo). A cópia do ramo é adiada quando
+    passaria de CUSTO_MAXIMO_RAMO do tempo da busca.
+
+    O relógio só é consultado a cada `checagem` expansões, então o custo
+    por evento é um append e uma comparação. publicar é chamado na thread
+    da busca e deve apenas repassar o lote (ex: emitir um sinal Qt).
+    """
+
+    def __init__(self, publicar=None, frequencia=30, checagem=64):
+        super().__init__()
+        self.publicar = publicar
+        self.intervalo = 1.0 / frequencia
+        self.checagem = max(1, int(checagem))
+        self.expansoes = 0
+        self.raizes = 0
+        self._lote = []
+        self._ultimo = None  # Último Node expandido (só acessado na thread da busca)
+        self._proximo_ramo = 0.0
+        self._proximo_envio = time.monotonic() + self.intervalo
+
+    def on_expand(self, no):
+        if self.cancelado:
+            raise SearchCancelled()
+        if no.pai is None:
+            self.raizes += 1
+        lote = self._lote
+        lote.append(no.estado)
+        self._ultimo = no
+        if len(lote) % self.checagem == 0 and time.monotonic() >= self._proximo_envio:
+            self.descarregar()
+
+    def on_level(self, estados):
+        if self.cancelado:
+            raise SearchCancelled()
+        self._lote.extend(estados)
+        if time.monotonic() >= self._proximo_envio:
+            self.descarregar()
+
+    def descarregar(self):
+        """Entrega imediatamente os estados acumulados (ex: ao fim da busca)"""
+        agora = time.monotonic()
+        self._proximo_envio = agora + self.intervalo
+        if not self._lote:
+            return
+        lote, self._lote = self._lote, []
+        self.expansoes += len(lote)
+        if self.publicar is None:
+            return
+        ramo, profundidade = None, 0
+        if self._ultimo is not None and agora >= self._proximo_ramo:
+            ramo, profundidade = CompactTree.de_ramo(self._ultimo), self._ultimo.profundidade
+            self._ultimo = None
+            custo = time.monotonic() - agora
+            self._proximo_ramo = agora + custo / CUSTO_MAXIMO_RAMO
+        self.publicar(lote, ramo, profundidade, self.raizes)
+
+
+class CounterHook(SearchHook):
+    """Hook que apenas contabiliza os eventos da busca"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Zera os contadores"""
+        self.expansoes = 0
+        self.geracoes = 0
+        self.reaberturas = 0
+        self.objetivos = 0
+
+    def on_expand(self, no):
+        self.expansoes += 1
+
+    def on_generate(self, pai, filho):
+        self.geracoes += 1
+
+    def on_reopen(self, antigo, novo):
+        self.reaberturas += 1
+
+    def on_goal(self, no):
+        self.objetivos += 1
+
+    def como_dict(self):
+        """Retorna os contadores como dicionário"""
+        return {
+            'expansoes': self.expansoes,
+            'geracoes': self.geracoes,
+            'reaberturas': self.reaberturas,
+            'objetivos': self.objetivos
+        }
+
+    def __repr__(self):
+        return (f"CounterHook(expansoes={self.expansoes}, geracoes={self.geracoes}, "
+                f"reaberturas={self.reaberturas}, objetivos={self.objetivos})")
+
+
+class SamplingTracer(SearchHook):
+    """
+    Hook que registra um evento a cada `intervalo` ocorrências.
+
+    Cada amostra é uma tupla (evento, estado, profundidade, custo, tempo),
+    com o tempo em segundos desde a criação (ou último reset) do tracer.
+    Apenas as `max_amostras` mais recentes são mantidas.
+    """
+
+    def __init__(self, intervalo=100, max_amostras=10000):
+        self.intervalo = max(1, int(intervalo))
+        self.amostras = deque(maxlen=max_amostras)
+        self.reset()
+
+    def reset(self):
+        """Descarta as amostras e reinicia o relógio"""
+        self.amostras.clear()
+        self._contador = 0
+        self._inicio = time.perf_counter()
+
+    def _amostrar(self, evento, no):
+        self._contador += 1
+        if self._contador % self.intervalo == 0:
+            self.amostras.append((
+                evento,
+                no.estado,
+                no.profundidade,
+                no.custo,
+                time.perf_counter() - self._inicio
+            ))
+
+    def on_expand(self, no):
+        self._amostrar('expand', no)
+
+    def on_generate(self, pai, filho):
+        self._amostrar('generate', filho)
+
+    def on_reopen(self, antigo, novo):
+        self._amostrar('reopen', novo)
+
+    def on_goal(self, no):
+        # O objetivo é sempre registrado, independente do intervalo
+        self.amostras.append((
+            'goal',
+            no.estado,
+            no.profundidade,
+            no.custo,
+            time.perf_counter() - self._inicio
+        ))
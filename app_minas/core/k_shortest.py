@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import heapq
+from itertools import islice
+from .csr import GraphCSR
+from .dijkstra import dijkstra_multiplas_fontes
+
+
+class KShortestPaths:
+    """
+    K menores caminhos sem ciclos (algoritmo de Yen) com geração preguiçosa.
+
+    Para cada destino é calculada uma única árvore de caminhos mínimos (um
+    Dijkstra a partir do destino, o grafo é não-direcionado), reaproveitada
+    em todas as buscas de desvio:
+
+    - se o caminho da árvore a partir do nó de desvio não usa nenhum nó ou
+      aresta bloqueados, ele já é o desvio ótimo e nenhuma busca é feita;
+    - caso contrário, o desvio é buscado com A* usando a distância da árvore
+      como heurística (exata no grafo original e admissível após as remoções).
+
+    As árvores ficam em cache por destino, de modo que várias consultas ao
+    mesmo destino também as reaproveitam.
+    """
+
+    def __init__(self, grafo, csr=None):
+        self.csr = csr if csr is not None else GraphCSR.de_grafo(grafo)
+        self._arvores = {}
+        self.buscas_desvio = 0  # Desvios que exigiram A*
+        self.desvios_da_arvore = 0  # Desvios obtidos direto da árvore
+
+    def _arvore(self, alvo):
+        if alvo not in self._arvores:
+            distancias, proximos, _ = dijkstra_multiplas_fontes(self.csr, [alvo])
+            self._arvores[alvo] = (distancias, proximos)
+        return self._arvores[alvo]
+
+    def _custo_aresta(self, u, v):
+        csr = self.csr
+        return min(csr.custos[p] for p in range(csr.indptr[u], csr.indptr[u + 1])
+                   if csr.indices[p] == v)
+
+    def _desvio(self, desvio, alvo, bloqueados, removidas):
+        """Menor caminho de `desvio` até `alvo` evitando nós e arestas removidos"""
+        distancias, proximos = self._arvore(alvo)
+        if distancias[desvio] == float('inf'):
+            return None, float('inf')
+
+        # Tenta o caminho da árvore
+        caminho = [desvio]
+        atual = desvio
+        valido = True
+        while atual != alvo:
+            seguinte = proximos[atual]
+            if seguinte in bloqueados or (atual == desvio and seguinte in removidas):
+                valido = False
+                break
+            caminho.append(seguinte)
+            atual = seguinte
+        if valido:
+            self.desvios_da_arvore += 1
+            return caminho, distancias[desvio]
+
+        # A* com a distância da árvore como heurística
+        self.buscas_desvio += 1
+        csr = self.csr
+        indptr, indices, custos = csr.indptr, csr.indices, csr.custos
+        melhor_g = {desvio: 0.0}
+        pais = {desvio: -1}
+        heap = [(distancias[desvio], 0.0, desvio)]
+        fechados = set()
+
+        while heap:
+            _, g, u = heapq.heappop(heap)
+            if u in fechados:
+                continue
+            fechados.add(u)
+            if u == alvo:
+                caminho = []
+                while u >= 0:
+                    caminho.append(u)
+                    u = pais[u]
+                caminho.reverse()
+                return caminho, g
+
+            for p in range(indptr[u], indptr[u + 1]):
+                v = indices[p]
+                if v in bloqueados or (u == desvio and v in removidas):
+                    continue
+                novo_g = g + custos[p]
+                if novo_g < melhor_g.get(v, float('inf')):
+                    melhor_g[v] = novo_g
+                    pais[v] = u
+                    heapq.heappush(heap, (novo_g + distancias[v], novo_g, v))
+
+        return None, float('inf')
+
+    def caminhos(self, inicio, fim):
+        """
+        Gera os caminhos sem ciclos de inicio a fim em ordem crescente de custo.
+
+        Yields:
+            Tuplas (caminho, custo), com o caminho em ids de nós
+        """
+        csr = self.csr
+        origem, alvo = csr.indice_de(inicio), csr.indice_de(fim)
+
+        if origem == alvo:
+            yield [inicio], 0
+            return
+
+        primeiro, custo = self._desvio(origem, alvo, set(), set())
+        if primeiro is None:
+            return
+
+        aceitos = []
+        candidatos = [(custo, primeiro)]
+        vistos = {tuple(primeiro)}
+
+        while candidatos:
+            custo, caminho = heapq.heappop(candidatos)
+            aceitos.append(caminho)
+            yield [csr.nos[i] for i in caminho], custo
+
+            # Gera os desvios a partir de cada nó do último caminho aceito
+            custo_raiz = 0.0
+            for i in range(len(caminho) - 1):
+                raiz = caminho[:i + 1]
+                desvio = caminho[i]
+
+                removidas = {
+                    aceito[i + 1] for aceito in aceitos
+                    if len(aceito) > i + 1 and aceito[:i + 1] == raiz
+                }
+                bloqueados = set(raiz[:-1])
+
+                trecho, custo_trecho = self._desvio(desvio, alvo, bloqueados, removidas)
+                if trecho is not None:
+                    novo = raiz[:-1] + trecho
+                    chave = tuple(novo)
+                    if chave not in vistos:
+                        vistos.add(chave)
+                        heapq.heappush(candidatos, (custo_raiz + custo_trecho, novo))
+
+                custo_raiz += self._custo_aresta(caminho[i], caminho[i + 1])
+
+    def k_menores_caminhos(self, inicio, fim, k):
+        """Retorna até k caminhos (caminho, custo) em ordem crescente de custo"""
+        return list(islice(self.caminhos(inicio, fim), k))
+
+
+def k_menores_caminhos(grafo, inicio, fim, k):
+    """Atalho para KShortestPaths(grafo).k_menores_caminhos(inicio, fim, k)"""
+    return KShortestPaths(grafo).k_menores_caminhos(inicio, fim, k)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+BFS de múltiplas origens com paralelismo de bits.
+
+Em vez de rodar uma busca em amplitude por origem, um lote de W origens é
+percorrido ao mesmo tempo: cada nó guarda um inteiro cujo bit k indica que
+a origem k do lote já o alcançou. Expandir um nível custa uma operação OR
+por aresta da fronteira para o lote inteiro. Os inteiros do Python têm
+tamanho arbitrário, então W pode passar de 64 sem mudar o algoritmo.
+
+O resultado é uma matriz de distâncias em saltos (uma linha por origem,
+array.array compacto) que pode ser gerada linha a linha e gravada em disco
+sem manter a matriz inteira em memória.
+"""
+
+import struct
+from array import array
+from .csr import GraphCSR
+from .utils import gravar_array, ler_array
+
+# Valor usado na matriz para nós inalcançáveis a partir da origem
+INALCANCAVEL = {'H': 0xFFFF, 'I': 0xFFFFFFFF}
+
+_ASSINATURA = b'MSBF'
+_CABECALHO = struct.Struct('<4sIIc')
+
+
+def _adjacencias(csr):
+    indptr, indices = csr.indptr, csr.indices
+    return [indices[indptr[i]:indptr[i + 1]].tolist() for i in range(csr.num_nos)]
+
+
+def _distancias_lote(adjacencias, indices_origens, tipo):
+    """Executa a BFS simultânea de um lote de origens (índices CSR)"""
+    n = len(adjacencias)
+    inalcancavel = INALCANCAVEL[tipo]
+    linhas = [array(tipo, [inalcancavel]) * n for _ in indices_origens]
+
+    vistos = [0] * n
+    fronteira = {}
+    for bit, origem in enumerate(indices_origens):
+        mascara = 1 << bit
+        vistos[origem] |= mascara
+        fronteira[origem] = fronteira.get(origem, 0) | mascara
+        linhas[bit][origem] = 0
+
+    nivel = 0
+    while fronteira:
+        nivel += 1
+        if nivel >= inalcancavel:
+            raise OverflowError(f"Distância maior que o suportado pelo tipo '{tipo}'")
+
+        # Propaga os bits da fronteira para os vizinhos
+        alcancados = {}
+        for u, bits in fronteira.items():
+            for v in adjacencias[u]:
+                alcancados[v] = alcancados.get(v, 0) | bits
+
+        fronteira = {}
+        for v, bits in alcancados.items():
+            novos = bits & ~vistos[v]
+            if not novos:
+                continue
+            vistos[v] |= novos
+            fronteira[v] = novos
+            while novos:
+                menor = novos & -novos
+                linhas[menor.bit_length() - 1][v] = nivel
+                novos ^= menor
+
+    return linhas
+
+
+def bfs_multiplas_origens(grafo, origens, largura_lote=64, tipo='H'):
+    """
+    Calcula as distâncias em saltos de cada origem para todos os nós.
+
+    Args:
+        grafo: Graph ou GraphCSR
+        origens: Nós de origem (ids do grafo)
+        largura_lote: Quantas origens são percorridas simultaneamente
+        tipo: Código do array.array das linhas ('H' = 2 bytes, 'I' = 4 bytes)
+
+    Yields:
+        Tuplas (origem, linha), onde linha[i] é a distância até csr.nos[i]
+        ou INALCANCAVEL[tipo] se o nó não for alcançável.
+    """
+    if tipo not in INALCANCAVEL:
+        raise ValueError("tipo deve ser 'H' ou 'I'")
+
+    csr = grafo if isinstance(grafo, GraphCSR) else GraphCSR.de_grafo(grafo)
+    adjacencias = _adjacencias(csr)
+    origens = list(origens)
+    largura_lote = max(1, int(largura_lote))
+
+    for inicio in range(0, len(origens), largura_lote):
+        lote = origens[inicio:inicio + largura_lote]
+        linhas = _distancias_lote(adjacencias, [csr.indice_de(o) for o in lote], tipo)
+        for origem, linha in zip(lote, linhas):
+            yield origem, linha
+
+
+def escrever_matriz_distancias(caminho_arquivo, grafo, origens, largura_lote=64, tipo='H'):
+    """
+    Grava a matriz de distâncias em disco, um lote por vez.
+
+    Formato binário (little-endian): cabeçalho 'MSBF', número de nós,
+    número de origens e tipo; ids dos nós (int64); ids das origens (int64);
+    depois uma linha de distâncias por origem.
+    """
+    csr = grafo if isinstance(grafo, GraphCSR) else GraphCSR.de_grafo(grafo)
+    origens = list(origens)
+
+    with open(caminho_arquivo, 'wb') as arquivo:
+        arquivo.write(_CABECALHO.pack(_ASSINATURA, csr.num_nos, len(origens), tipo.encode('ascii')))
+        gravar_array(array('q', csr.nos), arquivo)
+        gravar_array(array('q', origens), arquivo)
+        for _, linha in bfs_multiplas_origens(csr, origens, largura_lote, tipo):
+            gravar_array(linha, arquivo)
+
+    return caminho_arquivo
+
+
+class MatrizDistancias:
+    """Leitura com acesso aleatório de uma matriz gravada por escrever_matriz_distancias"""
+
+    def __init__(self, caminho_arquivo):
+        self.arquivo = open(caminho_arquivo, 'rb')
+        assinatura, num_nos, num_origens, tipo = _CABECALHO.unpack(self.arquivo.read(_CABECALHO.size))
+        if assinatura != _ASSINATURA:
+            raise ValueError("Arquivo não é uma matriz de distâncias")
+
+        self.tipo = tipo.decode('ascii')
+        self.inalcancavel = INALCANCAVEL[self.tipo]
+        self.nos = ler_array('q', self.arquivo, num_nos)
+        self.origens = ler_array('q', self.arquivo, num_origens).tolist()
+
+        self.indice_no = {no: i for i, no in enumerate(self.nos)}
+        self.indice_origem = {origem: i for i, origem in enumerate(self.origens)}
+        self._inicio_linhas = self.arquivo.tell()
+        self._tamanho_linha = num_nos * array(self.tipo).itemsize
+
+    def linha(self, origem):
+        """Retorna a linha de distâncias da origem"""
+        self.arquivo.seek(self._inicio_linhas + self.indice_origem[origem] * self._tamanho_linha)
+        return ler_array(self.tipo, self.arquivo, len(self.nos))
+
+    def distancia(self, origem, no):
+        """Distância em saltos da origem ao nó (None se inalcançável)"""
+        itemsize = array(self.tipo).itemsize
+        self.arquivo.seek(self._inicio_linhas + self.indice_origem[origem] * self._tamanho_linha
+                          + self.indice_no[no] * itemsize)
+        valor = ler_array(self.tipo, self.arquivo, 1)
+        return None if valor[0] == self.inalcancavel else valor[0]
+
+    def fechar(self):
+        self.arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
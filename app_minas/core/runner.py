@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+from .compact_tree import CompactTree
+from .search_algorithms import SearchAlgorithms
+from .search_algorithms_p import SearchAlgorithmsP, LIMITE_MEMORIA_SMA, LARGURA_FEIXE
+from .utils import calcular_custo_caminho, validar_entrada
+
+# Nomes dos algoritmos como aparecem na interface
+ALGORITMOS_NAO_PONDERADOS = [
+    "Busca em Amplitude",
+    "Busca em Amplitude Vetorizada",
+    "Busca em Profundidade",
+    "Busca em Profundidade Limitada",
+    "Busca por Aprofundamento Iterativo",
+    "Busca Bidirecional"
+]
+
+ALGORITMOS_PONDERADOS = [
+    "Custo Uniforme",
+    "Greedy",
+    "A-estrela",
+    "AIA-estrela",
+    "SMA-estrela",
+    "Greedy em Feixe",
+    "A-estrela Ponderada em Feixe",
+    "Jump Point Search"
+]
+
+ALGORITMOS = ALGORITMOS_NAO_PONDERADOS + ALGORITMOS_PONDERADOS
+
+# Nomes curtos aceitos pela linha de comando e pelo serviço de rotas
+APELIDOS = {
+    'bfs': "Busca em Amplitude",
+    'bfs-vetorizada': "Busca em Amplitude Vetorizada",
+    'dfs': "Busca em Profundidade",
+    'dls': "Busca em Profundidade Limitada",
+    'iddfs': "Busca por Aprofundamento Iterativo",
+    'bidirecional': "Busca Bidirecional",
+    'ucs': "Custo Uniforme",
+    'greedy': "Greedy",
+    'a-estrela': "A-estrela",
+    'aia-estrela': "AIA-estrela",
+    'sma-estrela': "SMA-estrela",
+    'greedy-feixe': "Greedy em Feixe",
+    'a-estrela-feixe': "A-estrela Ponderada em Feixe",
+    'jps': "Jump Point Search"
+}
+
+
+def executar_algoritmo(grafo, algoritmo, origem, destino, limite_profundidade=None, hook=None,
+                       arvore_compacta=False, estatisticas=None):
+    """
+    Executa um algoritmo de busca pelo nome usado na interface
+
+    Com arvore_compacta=True a árvore de busca é devolvida como CompactTree
+    (arrays), pronta para ser enviada a outra thread ou processo.
+
+    Para o SMA-estrela, limite_profundidade é o limite de memória em nós
+    (padrão LIMITE_MEMORIA_SMA) e o dicionário estatisticas, se fornecido,
+    recebe nos_esquecidos, nos_regenerados e pico_memoria. Para as buscas em
+    feixe, limite_profundidade é a largura do feixe (padrão LARGURA_FEIXE) e
+    estatisticas recebe largura_final e ampliacoes.
+
+    Returns:
+        Tupla (caminho, arvore, custo, nos_visitados). caminho é None
+        quando não há caminho e arvore é None para algoritmo desconhecido.
+    """
+    if algoritmo in ALGORITMOS_PONDERADOS:
+        search_p = SearchAlgorithmsP(hook=hook)
+
+        if algoritmo == "Custo Uniforme":
+            resultado = search_p.custo_uniforme(grafo, origem, destino)
+        elif algoritmo == "Greedy":
+            resultado = search_p.greedy(grafo, origem, destino)
+        elif algoritmo == "A-estrela":
+            resultado = search_p.a_estrela(grafo, origem, destino)
+        elif algoritmo == "SMA-estrela":
+            limite = limite_profundidade if limite_profundidade is not None else LIMITE_MEMORIA_SMA
+            resultado = search_p.sma_estrela(grafo, origem, destino, limite)
+            if estatisticas is not None:
+                estatisticas['nos_esquecidos'] = search_p.nos_esquecidos
+                estatisticas['nos_regenerados'] = search_p.nos_regenerados
+                estatisticas['nos_reexpandidos'] = search_p.nos_reexpandidos
+                estatisticas['pico_memoria'] = search_p.pico_memoria
+        elif algoritmo in ("Greedy em Feixe", "A-estrela Ponderada em Feixe"):
+            largura = limite_profundidade if limite_profundidade is not None else LARGURA_FEIXE
+            if algoritmo == "Greedy em Feixe":
+                resultado = search_p.greedy_feixe(grafo, origem, destino, largura)
+            else:
+                resultado = search_p.a_estrela_ponderada_feixe(grafo, origem, destino, largura)
+            if estatisticas is not None:
+                estatisticas['largura_final'] = search_p.largura_final
+                estatisticas['ampliacoes'] = search_p.ampliacoes
+        elif algoritmo == "Jump Point Search":
+            resultado = search_p.jump_point_search(grafo, origem, destino)
+        else:
+            resultado = search_p.aia_estrela(grafo, origem, destino)
+
+        # Quando origem == destino os algoritmos ponderados não retornam custo
+        caminho, arvore = resultado[0], resultado[1]
+        custo = resultado[2] if len(resultado) > 2 else 0
+        if arvore_compacta and arvore is not None:
+            arvore = CompactTree.de_arvore(arvore)
+        return caminho, arvore, custo, search_p.nos_visitados
+
+    search = SearchAlgorithms(hook=hook)
+
+    if algoritmo == "Busca em Amplitude":
+        caminho, arvore = search.busca_amplitude(grafo, origem, destino)
+    elif algoritmo == "Busca em Amplitude Vetorizada":
+        # Não monta árvore de busca; arvore fica None. O CSR fica em cache no
+        # grafo, então só a primeira consulta paga a conversão
+        caminho, arvore = search.busca_amplitude_vetorizada(grafo, origem, destino,
+                                                             csr=grafo.para_csr())[0], None
+    elif algoritmo == "Busca em Profundidade":
+        caminho, arvore = search.busca_profundidade(grafo, origem, destino)
+    elif algoritmo == "Busca em Profundidade Limitada":
+        limite = limite_profundidade if limite_profundidade is not None else 5
+        caminho, arvore = search.busca_profundidade_limitada(grafo, origem, destino, limite)
+    elif algoritmo == "Busca por Aprofundamento Iterativo":
+        limite_inicial = limite_profundidade if limite_profundidade is not None else 1
+        caminho, arvore = search.busca_aprofundamento_iterativo(grafo, origem, destino, limite_inicial)
+    elif algoritmo == "Busca Bidirecional":
+        caminho, arvore = search.busca_bidirecional(grafo, origem, destino)
+    else:
+        return None, None, 0, []
+
+    custo = calcular_custo_caminho(grafo, caminho) if caminho else 0
+    if arvore_compacta and arvore is not None:
+        arvore = CompactTree.de_arvore(arvore)
+    return caminho, arvore, custo, search.nos_visitados
+
+
+def resolver_algoritmo(nome):
+    """Converte um apelido ou nome completo no nome usado pela interface"""
+    if nome in ALGORITMOS:
+        return nome
+    algoritmo = APELIDOS.get(nome.lower())
+    if algoritmo is None:
+        raise ValueError(f"Algoritmo desconhecido: {nome}")
+    return algoritmo
+
+
+def executar_consulta(grafo, nos, algoritmo, consulta, limite_padrao=None, com_arvore=False,
+                      com_visitacao=False):
+    """
+    Executa uma consulta e retorna o registro de resultado
+
+    Com com_arvore=True o registro inclui também 'arvore', a árvore de busca
+    como CompactTree (None quando a consulta falha antes da busca), e com
+    com_visitacao=True inclui 'visitacao', a lista com a ordem de visitação.
+    Estatísticas específicas do algoritmo (ex: nos_esquecidos do SMA*) são
+    acrescentadas ao registro.
+    """
+    numero, origem, destino, limite = consulta
+    registro = {
+        'linha': numero,
+        'origem': origem,
+        'destino': destino,
+        'algoritmo': algoritmo,
+        'encontrado': False,
+        'custo': None,
+        'tamanho_caminho': 0,
+        'nos_visitados': 0,
+        'tempo_ms': 0.0,
+        'caminho': [],
+        'erro': None
+    }
+    if com_arvore:
+        registro['arvore'] = None
+    if com_visitacao:
+        registro['visitacao'] = []
+
+    if destino is None:
+        registro['erro'] = "Consulta deve ter origem e destino"
+        return registro
+
+    valido, resultado = validar_entrada(origem, destino, nos)
+    if not valido:
+        registro['erro'] = resultado
+        return registro
+    origem, destino = resultado
+    registro['origem'], registro['destino'] = origem, destino
+
+    try:
+        limite = int(limite) if limite is not None else limite_padrao
+    except (TypeError, ValueError, OverflowError):
+        registro['erro'] = "Limite de profundidade deve ser um número inteiro"
+        return registro
+
+    inicio = time.perf_counter()
+    estatisticas = {}
+    try:
+        caminho, arvore, custo, nos_visitados = executar_algoritmo(
+            grafo, algoritmo, origem, destino, limite, arvore_compacta=com_arvore,
+            estatisticas=estatisticas
+        )
+    except Exception as e:
+        registro['erro'] = f"Erro durante a busca: {e}"
+        return registro
+    registro['tempo_ms'] = round((time.perf_counter() - inicio) * 1000, 3)
+
+    registro['nos_visitados'] = len(nos_visitados)
+    registro.update(estatisticas)
+    if com_arvore:
+        registro['arvore'] = arvore
+    if com_visitacao:
+        registro['visitacao'] = nos_visitados
+    if caminho:
+        registro['encontrado'] = True
+        registro['custo'] = custo
+        registro['tamanho_caminho'] = len(caminho)
+        registro['caminho'] = caminho
+    return registro
@@ -3,13 +3,15 @@
 
 from collections import deque
 from .graph_model import Node
+from .csr import GraphCSR, bfs_por_niveis
 
 class SearchAlgorithms:
     """Classe que implementa os algoritmos de busca"""
     
-    def __init__(self):
+    def __init__(self, hook=None):
         self.nos_visitados = []  # Para rastrear a ordem de visitação
         self.arvore_busca = None  # Raiz da árvore de busca
+        self.hook = hook  # Observador opcional dos eventos da busca (ver core.hooks)
         
     def busca_amplitude(self, grafo, inicio, fim):
         """
@@ -18,6 +20,7 @@ class SearchAlgorithms:
         """
         self.nos_visitados = []
         self.arvore_busca = None
+        hook = self.hook
 
         if inicio == fim:
             return [inicio], Node(estado=inicio)
@@ -38,6 +41,8 @@ class SearchAlgorithms:
         while fila:
             atual = fila.popleft()
             atual.expandido = True
+            if hook is not None:
+                hook.on_expand(atual)
             
             # Obter vizinhos
             vizinhos = grafo.obter_vizinhos(atual.estado)
@@ -59,6 +64,8 @@ class SearchAlgorithms:
                     )
                     
                     atual.adicionar_filho(filho)
+                    if hook is not None:
+                        hook.on_generate(atual, filho)
                     fila.append(filho)
                     visitados[vizinho] = filho
                     self.nos_visitados.append(vizinho)
@@ -66,11 +73,62 @@ class SearchAlgorithms:
                     # Verificar se encontrou o objetivo
                     if vizinho == fim:
                         filho.objetivo = True
+                        if hook is not None:
+                            hook.on_goal(filho)
                         caminho = self._reconstruir_caminho(filho)
                         return caminho, self.arvore_busca
                         
         return None, self.arvore_busca
         
+    def busca_amplitude_vetorizada(self, grafo, inicio, fim, csr=None, por_nivel=False):
+        """
+        Busca em Amplitude vetorizada (requer NumPy)
+        Expande cada nível inteiro de uma vez sobre a representação CSR.
+        Retorna o mesmo caminho e a mesma ordem de visitação que busca_amplitude,
+        mas não monta a árvore de busca; do hook só é chamado on_level, com os
+        estados de cada nível antes de expandi-lo (o que permite cancelar a
+        busca entre níveis).
+
+        Args:
+            csr: GraphCSR já construído (reaproveitável entre buscas no mesmo grafo)
+            por_nivel: Se True, retorna também a lista de nós descobertos em cada nível
+
+        Returns:
+            Tupla (caminho, niveis); niveis é None quando por_nivel é False
+        """
+        self.nos_visitados = []
+        self.arvore_busca = None
+
+        if inicio == fim:
+            return [inicio], ([[inicio]] if por_nivel else None)
+
+        if csr is None:
+            csr = GraphCSR.de_grafo(grafo)
+
+        nos = csr.nos
+        hook = self.hook
+
+        def avisar_nivel(fronteira):
+            hook.on_level([nos[i] for i in fronteira.tolist()])
+
+        pais, niveis = bfs_por_niveis(csr, csr.indice_de(inicio), csr.indice_de(fim),
+                                      avisar_nivel if hook is not None else None)
+
+        niveis_nos = [[nos[i] for i in nivel.tolist()] for nivel in niveis]
+        for nivel in niveis_nos:
+            self.nos_visitados.extend(nivel)
+
+        caminho = None
+        atual = csr.indice_de(fim)
+        if pais[atual] >= 0:
+            caminho = []
+            while atual >= 0:
+                caminho.append(nos[atual])
+                atual = int(pais[atual])
+            caminho.reverse()
+
+        return caminho, (niveis_nos if por_nivel else None)
+
     def busca_profundidade(self, grafo, inicio, fim):
         """
         Busca em Profundidade (DFS)
@@ -78,6 +136,7 @@ class SearchAlgorithms:
         """
         self.nos_visitados = []
         self.arvore_busca = None
+        hook = self.hook
 
         if inicio == fim:
             return [inicio], Node(estado=inicio)
@@ -98,10 +157,12 @@ class SearchAlgorithms:
         while pilha:
             atual = pilha.pop()
             atual.expandido = True
+            if hook is not None:
+                hook.on_expand(atual)
             
             # Obter vizinhos (em ordem reversa para manter consistência)
-            vizinhos = grafo.obter_vizinhos(atual.estado)
-            vizinhos.reverse()
+            # (cópia invertida: reverse() in-place alteraria a lista de adjacência do grafo)
+            vizinhos = grafo.obter_vizinhos(atual.estado)[::-1]
             
             for vizinho, custo_aresta in vizinhos:
                 # Para DFS, precisamos permitir revisitar nós se eles não estiverem no caminho atual
@@ -119,6 +180,8 @@ class SearchAlgorithms:
                     )
                     
                     atual.adicionar_filho(filho)
+                    if hook is not None:
+                        hook.on_generate(atual, filho)
                     pilha.append(filho)
                     visitados[vizinho] = filho
                     self.nos_visitados.append(vizinho)
@@ -126,6 +189,8 @@ class SearchAlgorithms:
                     # Verificar se encontrou o objetivo
                     if vizinho == fim:
                         filho.objetivo = True
+                        if hook is not None:
+                            hook.on_goal(filho)
                         caminho = self._reconstruir_caminho(filho)
                         return caminho, self.arvore_busca
                         
@@ -138,6 +203,7 @@ class SearchAlgorithms:
         """
         self.nos_visitados = []
         self.arvore_busca = None
+        hook = self.hook
 
         if inicio == fim:
             return [inicio], Node(estado=inicio)
@@ -158,12 +224,13 @@ class SearchAlgorithms:
         while pilha:
             atual = pilha.pop()
             atual.expandido = True
+            if hook is not None:
+                hook.on_expand(atual)
             
             # Verificar limite de profundidade
             if atual.profundidade < limite:
                 # Obter vizinhos
-                vizinhos = grafo.obter_vizinhos(atual.estado)
-                vizinhos.reverse()
+                vizinhos = grafo.obter_vizinhos(atual.estado)[::-1]
                 
                 for vizinho, custo_aresta in vizinhos:
                     if vizinho not in visitados:
@@ -176,6 +243,8 @@ class SearchAlgorithms:
                         )
                         
                         atual.adicionar_filho(filho)
+                        if hook is not None:
+                            hook.on_generate(atual, filho)
                         pilha.append(filho)
                         visitados[vizinho] = filho
                         self.nos_visitados.append(vizinho)
@@ -183,6 +252,8 @@ class SearchAlgorithms:
                         # Verificar se encontrou o objetivo
                         if vizinho == fim:
                             filho.objetivo = True
+                            if hook is not None:
+                                hook.on_goal(filho)
                             caminho = self._reconstruir_caminho(filho)
                             return caminho, self.arvore_busca
                             
@@ -207,6 +278,7 @@ class SearchAlgorithms:
         """
         self.nos_visitados = []
         self.arvore_busca = None
+        hook = self.hook
         
         if inicio == fim:
             return [inicio], Node(estado=inicio)
@@ -235,6 +307,8 @@ class SearchAlgorithms:
             if fila_inicio:
                 atual = fila_inicio.popleft()
                 atual.expandido = True
+                if hook is not None:
+                    hook.on_expand(atual)
                 
                 vizinhos = grafo.obter_vizinhos(atual.estado)
                 for vizinho, custo_aresta in vizinhos:
@@ -248,11 +322,15 @@ class SearchAlgorithms:
                         )
                         
                         atual.adicionar_filho(filho)
+                        if hook is not None:
+                            hook.on_generate(atual, filho)
                         visitados_inicio[vizinho] = filho
                         self.nos_visitados.append(vizinho)
                         
                         # Verificar se encontrou nó da outra busca
                         if vizinho in visitados_fim:
+                            if hook is not None:
+                                hook.on_goal(filho)
                             caminho = self._reconstruir_caminho_bidirecional(
                                 filho, visitados_fim[vizinho]
                             )
@@ -264,6 +342,8 @@ class SearchAlgorithms:
             if fila_fim:
                 atual = fila_fim.popleft()
                 atual.expandido = True
+                if hook is not None:
+                    hook.on_expand(atual)
                 
                 vizinhos = grafo.obter_vizinhos(atual.estado)
                 for vizinho, custo_aresta in vizinhos:
@@ -277,10 +357,14 @@ class SearchAlgorithms:
                         )
                         
                         atual.adicionar_filho(filho)
+                        if hook is not None:
+                            hook.on_generate(atual, filho)
                         visitados_fim[vizinho] = filho
                         
                         # Verificar se encontrou nó da outra busca
                         if vizinho in visitados_inicio:
+                            if hook is not None:
+                                hook.on_goal(filho)
                             caminho = self._reconstruir_caminho_bidirecional(
                                 visitados_inicio[vizinho], filho
                             )
@@ -290,6 +374,62 @@ class SearchAlgorithms:
                         
         return None, self.arvore_busca
         
+    def busca_amplitude_multiobjetivo(self, grafo, inicio, fins):
+        """
+        Busca em Amplitude com múltiplos objetivos
+        Para no primeiro objetivo alcançado (o mais próximo em número de arestas)
+
+        Returns:
+            Tupla (caminho, arvore, objetivo_alcancado)
+        """
+        self.nos_visitados = []
+        self.arvore_busca = None
+        hook = self.hook
+        fins = set(fins)
+
+        if inicio in fins:
+            return [inicio], Node(estado=inicio), inicio
+
+        fila = deque()
+
+        raiz = Node(pai=None, estado=inicio, custo=0, profundidade=0)
+        self.arvore_busca = raiz
+        fila.append(raiz)
+
+        visitados = {inicio: raiz}
+        self.nos_visitados.append(inicio)
+
+        while fila:
+            atual = fila.popleft()
+            atual.expandido = True
+            if hook is not None:
+                hook.on_expand(atual)
+
+            for vizinho, custo_aresta in grafo.obter_vizinhos(atual.estado):
+                if vizinho not in visitados:
+                    filho = Node(
+                        pai=atual,
+                        estado=vizinho,
+                        custo=atual.custo + custo_aresta,
+                        profundidade=atual.profundidade + 1
+                    )
+
+                    atual.adicionar_filho(filho)
+                    if hook is not None:
+                        hook.on_generate(atual, filho)
+                    fila.append(filho)
+                    visitados[vizinho] = filho
+                    self.nos_visitados.append(vizinho)
+
+                    # Verificar se encontrou algum dos objetivos
+                    if vizinho in fins:
+                        filho.objetivo = True
+                        if hook is not None:
+                            hook.on_goal(filho)
+                        return self._reconstruir_caminho(filho), self.arvore_busca, vizinho
+
+        return None, self.arvore_busca, None
+
     def _reconstruir_caminho(self, no_final):
         """Reconstrói o caminho do nó inicial até o nó final"""
         caminho = []
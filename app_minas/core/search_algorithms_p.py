@@ -1,14 +1,30 @@
+import heapq
+from bisect import bisect_left, insort
 from collections import deque
 from .node_p import NodeP
 from math import sqrt, fabs
 from .graph_model import Graph
+from .grid_graph import GridGraph, DIAGONAL
+
+LIMITE_MEMORIA_SMA = 1000  # Nós mantidos na árvore de busca pelo SMA* (padrão)
+LARGURA_FEIXE = 64  # Nós mantidos em cada nível da busca em feixe (padrão)
+PESO_A_ESTRELA = 1.5  # Peso da heurística no A* ponderado: f(n) = g(n) + w * h(n)
 
 class SearchAlgorithmsP:
     """Classe que implementa os algoritmos de busca ponderados"""
     
-    def __init__(self):
+    def __init__(self, hook=None):
         self.nos_visitados = []  # Para rastrear a ordem de visitação
         self.arvore_busca = None  # Raiz da árvore de busca
+        self.hook = hook  # Observador opcional dos eventos da busca (ver core.hooks)
+        # Estatísticas do SMA*
+        self.nos_esquecidos = 0
+        self.nos_regenerados = 0
+        self.pico_memoria = 0
+        self.nos_reexpandidos = 0
+        # Estatísticas da busca em feixe
+        self.largura_final = 0
+        self.ampliacoes = 0
         
     def _reconstruir_caminho(self, no_final):
         """Reconstrói o caminho do nó inicial até o nó final"""
@@ -55,6 +71,17 @@ class SearchAlgorithmsP:
                 # Se a posição não estiver definida, retorna 0 (heurística admissível)
                 return 0
         
+        # Posições calculadas pelo layout por forças, na escala que as torna admissíveis
+        posicoes_layout = getattr(grafo, 'posicoes_layout', None)
+        if posicoes_layout and grafo.escala_layout > 0:
+            try:
+                pos_atual = posicoes_layout[no_atual]
+                pos_destino = posicoes_layout[no_destino]
+                return grafo.escala_layout * sqrt((pos_atual[0] - pos_destino[0])**2 +
+                                                  (pos_atual[1] - pos_destino[1])**2)
+            except KeyError:
+                return 0
+        
         # Heurística de distância Manhattan (admissível se custo >= 1)
         # return fabs(no_atual - no_destino)
         
@@ -68,6 +95,7 @@ class SearchAlgorithmsP:
         """Busca de Custo Uniforme (UCS)"""
         self.nos_visitados = []
         self.arvore_busca = None
+        hook = self.hook
         
         if inicio == fim:
             return [inicio], NodeP(estado=inicio, v1=0, v2=0)
@@ -88,9 +116,13 @@ class SearchAlgorithmsP:
             atual = lista.popleft()
             atual.expandido = True
             self.nos_visitados.append(atual.estado) # Adiciona o nó sendo expandido à ordem de visitação
+            if hook is not None:
+                hook.on_expand(atual)
             
             # Chegou ao objetivo
             if atual.estado == fim:
+                if hook is not None:
+                    hook.on_goal(atual)
                 caminho = self._reconstruir_caminho(atual)
                 return caminho, self.arvore_busca, atual.v2
             
@@ -108,6 +140,8 @@ class SearchAlgorithmsP:
                     
                     # Atualiza o nó visitado
                     if vizinho in visitado:
+                        if hook is not None:
+                            hook.on_reopen(visitado[vizinho], filho)
                         # Remove o nó antigo da lista (se estiver lá)
                         try:
                             lista.remove(visitado[vizinho])
@@ -116,6 +150,8 @@ class SearchAlgorithmsP:
                     
                     visitado[vizinho] = filho
                     atual.adicionar_filho(filho)
+                    if hook is not None:
+                        hook.on_generate(atual, filho)
                     self._inserir_ordenado(lista, filho)
                     
         return None, self.arvore_busca, 0
@@ -127,6 +163,7 @@ class SearchAlgorithmsP:
         """Busca Gulosa (Greedy Best-First Search)"""
         self.nos_visitados = []
         self.arvore_busca = None
+        hook = self.hook
         
         if inicio == fim:
             return [inicio], NodeP(estado=inicio, v1=0, v2=0)
@@ -148,9 +185,13 @@ class SearchAlgorithmsP:
             atual = lista.popleft()
             atual.expandido = True
             self.nos_visitados.append(atual.estado) # Adiciona o nó sendo expandido à ordem de visitação
+            if hook is not None:
+                hook.on_expand(atual)
             
             # Chegou ao objetivo
             if atual.estado == fim:
+                if hook is not None:
+                    hook.on_goal(atual)
                 caminho = self._reconstruir_caminho(atual)
                 return caminho, self.arvore_busca, atual.v2
             
@@ -170,6 +211,8 @@ class SearchAlgorithmsP:
                     
                     # Atualiza o nó visitado
                     if vizinho in visitado:
+                        if hook is not None:
+                            hook.on_reopen(visitado[vizinho], filho)
                         try:
                             lista.remove(visitado[vizinho])
                         except ValueError:
@@ -177,6 +220,8 @@ class SearchAlgorithmsP:
                     
                     visitado[vizinho] = filho
                     atual.adicionar_filho(filho)
+                    if hook is not None:
+                        hook.on_generate(atual, filho)
                     self._inserir_ordenado(lista, filho)
                     
         return None, self.arvore_busca, 0
@@ -188,6 +233,7 @@ class SearchAlgorithmsP:
         """Busca A* (A-Star Search)"""
         self.nos_visitados = []
         self.arvore_busca = None
+        hook = self.hook
         
         if inicio == fim:
             return [inicio], NodeP(estado=inicio, v1=0, v2=0)
@@ -209,9 +255,13 @@ class SearchAlgorithmsP:
             atual = lista.popleft()
             atual.expandido = True
             self.nos_visitados.append(atual.estado) # Adiciona o nó sendo expandido à ordem de visitação
+            if hook is not None:
+                hook.on_expand(atual)
             
             # Chegou ao objetivo
             if atual.estado == fim:
+                if hook is not None:
+                    hook.on_goal(atual)
                 caminho = self._reconstruir_caminho(atual)
                 return caminho, self.arvore_busca, atual.v2
             
@@ -230,6 +280,8 @@ class SearchAlgorithmsP:
                     
                     # Atualiza o nó visitado
                     if vizinho in visitado:
+                        if hook is not None:
+                            hook.on_reopen(visitado[vizinho], filho)
                         try:
                             lista.remove(visitado[vizinho])
                         except ValueError:
@@ -237,6 +289,8 @@ class SearchAlgorithmsP:
                     
                     visitado[vizinho] = filho
                     atual.adicionar_filho(filho)
+                    if hook is not None:
+                        hook.on_generate(atual, filho)
                     self._inserir_ordenado(lista, filho)
                     
         return None, self.arvore_busca, 0
@@ -248,6 +302,7 @@ class SearchAlgorithmsP:
         """Busca A* com Aprofundamento Iterativo (IDA*)"""
         self.nos_visitados = []
         self.arvore_busca = None
+        hook = self.hook
         
         if inicio == fim:
             return [inicio], NodeP(estado=inicio, v1=0, v2=0)
@@ -278,9 +333,13 @@ class SearchAlgorithmsP:
                 # remove o nó com menor v1 (f(n))
                 atual = lista.popleft()
                 atual.expandido = True
+                if hook is not None:
+                    hook.on_expand(atual)
                 
                 # Chegou ao objetivo
                 if atual.estado == fim:
+                    if hook is not None:
+                        hook.on_goal(atual)
                     caminho = self._reconstruir_caminho(atual)
                     return caminho, self.arvore_busca, atual.v2
                 
@@ -303,6 +362,8 @@ class SearchAlgorithmsP:
                         
                         # Atualiza o nó visitado
                         if vizinho in visitado:
+                            if hook is not None:
+                                hook.on_reopen(visitado[vizinho], filho)
                             try:
                                 lista.remove(visitado[vizinho])
                             except ValueError:
@@ -310,10 +371,684 @@ class SearchAlgorithmsP:
                         
                         visitado[vizinho] = filho
                         atual.adicionar_filho(filho)
+                        if hook is not None:
+                            hook.on_generate(atual, filho)
                         self._inserir_ordenado(lista, filho)
                         self.nos_visitados.append(vizinho)
                         
             if proximo_limite == float('inf'):
                 return None, self.arvore_busca, 0 # Caminho não encontrado
             
-            limite = proximo_limite 
\ No newline at end of file
+            limite = proximo_limite
+
+    # -----------------------------------------------------------------------------
+    # SMA ESTRELA (Simplified Memory-bounded A*)
+    # -----------------------------------------------------------------------------
+    def sma_estrela(self, grafo: Graph, inicio, fim, limite_memoria=LIMITE_MEMORIA_SMA):
+        """
+        Busca A* com memória limitada (SMA*)
+
+        A árvore de busca nunca passa de limite_memoria nós. Cada passo gera
+        um único sucessor do melhor nó (menor f(n), o mais profundo em caso
+        de empate), em ordem crescente de f(n): um nó já expandido concorre
+        na fila com o f(n) do próximo sucessor que ainda pode gerar. Com a
+        memória cheia, a folha de maior f(n) (a mais rasa em caso de empate)
+        é esquecida e o pai guarda o f(n) dela para regenerá-la se voltar a
+        ser a melhor opção. Quando todos os sucessores de um nó foram
+        gerados, o f(n) do nó passa a ser o menor f(n) dos filhos, valor
+        propagado para os ancestrais. Sucessores que não cabem na memória
+        junto com o próprio caminho recebem f(n) infinito.
+
+        Como a busca é em árvore, um mesmo estado pode ser alcançado por muitos
+        caminhos. Um sucessor é descartado quando um nó do mesmo estado
+        presente na árvore, ou um filho esquecido guardado por um nó da
+        árvore, tem g(n) e profundidade menores ou iguais (dominado): o
+        caminho dominante continua representado na árvore. Esses índices só
+        referenciam nós em memória, portanto também são limitados por
+        limite_memoria; um estado que saiu da árvore pode voltar a ser gerado
+        por outro caminho. Se o melhor caminho exige muito mais nós do que o
+        limite, as regenerações dominam o tempo de busca; o mesmo vale para
+        um objetivo inalcançável, que só é descartado depois de esgotada a
+        parte do grafo alcançável a partir da origem.
+
+        nos_visitados guarda as primeiras limite_memoria expansões; as
+        expansões de nós regenerados são contadas em nos_reexpandidos.
+
+        O caminho é ótimo sempre que o melhor caminho cabe em limite_memoria
+        nós. nos_esquecidos, nos_regenerados, nos_reexpandidos e pico_memoria
+        ficam disponíveis ao final da busca.
+        """
+        if limite_memoria < 2:
+            raise ValueError("O limite de memória do SMA* deve ser de pelo menos 2 nós")
+        self.nos_visitados = []
+        self.arvore_busca = None
+        self.nos_esquecidos = 0
+        self.nos_regenerados = 0
+        self.nos_reexpandidos = 0
+        self.pico_memoria = 1
+        hook = self.hook
+        infinito = float('inf')
+
+        if inicio == fim:
+            return [inicio], NodeP(estado=inicio, v1=0, v2=0)
+
+        # v1 = f(n) (propagado dos filhos), v2 = g(n)
+        raiz = NodeP(pai=None, estado=inicio, v1=self._heuristica_grafo(grafo, inicio, fim), v2=0)
+        self.arvore_busca = raiz
+
+        memoria = 1
+
+        pendentes = {}   # Nó -> sucessores (f, ordem, estado, g) ainda não gerados, o melhor no fim
+        esquecidos = {}  # Nó -> {estado: (f, g)} dos filhos esquecidos
+        fila = []        # Entradas (f, -profundidade, ordem, nó) ordenadas: a melhor primeiro
+        entradas = {}    # Nó -> sua entrada na fila
+        na_arvore = {inicio: [raiz]}  # Estado -> nós desse estado em memória
+        pais_esquecidos = {}  # Estado -> nós em memória com um filho esquecido desse estado
+        regenerados = set()  # Nós em memória que foram regenerados
+        ordem = 0
+
+        def chave(no):
+            # Nó já expandido: o melhor f(n) que ele ainda pode gerar (sucessor
+            # pendente ou filho esquecido); os filhos em memória têm entrada própria
+            valores = [f for f, _ in esquecidos.get(no, {}).values()]
+            if pendentes.get(no):
+                valores.append(pendentes[no][-1][0])
+            return min(valores, default=no.v1)
+
+        def enfileirar(no):
+            nonlocal ordem
+            ordem += 1
+            entrada = (chave(no), -no.profundidade, ordem, no)
+            entradas[no] = entrada
+            insort(fila, entrada)
+
+        def desenfileirar(no):
+            entrada = entradas.pop(no, None)
+            if entrada is not None:
+                del fila[bisect_left(fila, entrada)]
+
+        def propagar_f(no):
+            # f(n) de nós com todos os sucessores gerados = menor f(n) dos filhos
+            while no is not None and not pendentes.get(no):
+                valores = [filho.v1 for filho in no.filhos]
+                valores.extend(f for f, _ in esquecidos.get(no, {}).values())
+                novo = min(valores, default=infinito)
+                if novo == no.v1:
+                    break
+                no.v1 = novo
+                if no in entradas:
+                    desenfileirar(no)
+                    enfileirar(no)
+                no = no.pai
+
+        def remover_indice(indice, estado, no):
+            nos = indice[estado]
+            nos.remove(no)
+            if not nos:
+                del indice[estado]
+
+        def dominado(estado, g, profundidade):
+            if any(no.v2 <= g and no.profundidade <= profundidade
+                   for no in na_arvore.get(estado, ())):
+                return True
+            return any(esquecidos[pai][estado][1] <= g and pai.profundidade < profundidade
+                       for pai in pais_esquecidos.get(estado, ()))
+
+        enfileirar(raiz)
+
+        while fila:
+            atual = fila[0][3]
+            if fila[0][0] == infinito:
+                break  # Nenhum caminho restante cabe na memória
+
+            # Chegou ao objetivo
+            if atual.estado == fim:
+                if hook is not None:
+                    hook.on_goal(atual)
+                caminho = self._reconstruir_caminho(atual)
+                return caminho, self.arvore_busca, atual.v2
+
+            if atual not in pendentes:
+                atual.expandido = True
+                if atual in regenerados:
+                    self.nos_reexpandidos += 1
+                if len(self.nos_visitados) < limite_memoria:
+                    self.nos_visitados.append(atual.estado)
+                if hook is not None:
+                    hook.on_expand(atual)
+                # Sucessores fora do próprio caminho (evita ciclos)
+                no_caminho = set()
+                no = atual
+                while no is not None:
+                    no_caminho.add(no.estado)
+                    no = no.pai
+                # Gerados em ordem crescente de f(n): enquanto houver sucessores
+                # melhores na árvore, os piores não ocupam memória
+                sucessores = []
+                for i, (vizinho, custo_aresta) in enumerate(grafo.obter_vizinhos(atual.estado)):
+                    if vizinho in no_caminho:
+                        continue
+                    v2 = atual.v2 + custo_aresta
+                    if vizinho != fim and atual.profundidade + 2 >= limite_memoria:
+                        v1 = infinito  # O caminho até ele ocupa toda a memória
+                    else:
+                        v1 = max(atual.v1, v2 + self._heuristica_grafo(grafo, vizinho, fim))
+                    sucessores.append((v1, i, vizinho, v2))
+                sucessores.sort(reverse=True)
+                pendentes[atual] = sucessores
+
+            # Descarta os sucessores dominados por um nó (ou filho esquecido) da árvore
+            sucessores = pendentes[atual]
+            while sucessores and dominado(sucessores[-1][2], sucessores[-1][3],
+                                          atual.profundidade + 1):
+                sucessores.pop()
+
+            if sucessores:
+                # Melhor sucessor ainda não gerado
+                v1, _, vizinho, v2 = sucessores.pop()
+                regenerado = False
+            elif esquecidos.get(atual):
+                # Regenera o filho esquecido de menor f(n), com o f(n) guardado
+                filhos_esquecidos = esquecidos[atual]
+                vizinho = min(filhos_esquecidos, key=filhos_esquecidos.get)
+                v1, v2 = filhos_esquecidos.pop(vizinho)
+                remover_indice(pais_esquecidos, vizinho, atual)
+                regenerado = True
+            else:
+                # Sem sucessores restantes: beco sem saída ou, se os demais foram
+                # descartados depois de gerar outros filhos, f(n) vem dos filhos
+                if atual.filhos:
+                    desenfileirar(atual)
+                propagar_f(atual)
+                continue
+
+            # Memória cheia: esquece a pior folha (nunca um nó do caminho até atual)
+            if memoria >= limite_memoria:
+                for entrada in reversed(fila):
+                    folha = entrada[3]
+                    if folha is not atual and not folha.filhos:
+                        break
+                desenfileirar(folha)
+                pai = folha.pai
+                pai.filhos.remove(folha)
+                anterior = esquecidos.setdefault(pai, {}).get(folha.estado)
+                if anterior is None:
+                    pais_esquecidos.setdefault(folha.estado, []).append(pai)
+                if anterior is None or entrada[0] < anterior[0]:
+                    esquecidos[pai][folha.estado] = (entrada[0], folha.v2)
+                pendentes.pop(folha, None)
+                for estado in esquecidos.pop(folha, ()):
+                    remover_indice(pais_esquecidos, estado, folha)
+                regenerados.discard(folha)
+                remover_indice(na_arvore, folha.estado, folha)
+                memoria -= 1
+                self.nos_esquecidos += 1
+                desenfileirar(pai)
+                enfileirar(pai)
+
+            filho = NodeP(pai=atual, estado=vizinho, v1=v1, v2=v2)
+            atual.adicionar_filho(filho)
+            memoria += 1
+            self.pico_memoria = max(self.pico_memoria, memoria)
+            na_arvore.setdefault(vizinho, []).append(filho)
+            if regenerado:
+                regenerados.add(filho)
+                self.nos_regenerados += 1
+            if hook is not None:
+                hook.on_generate(atual, filho)
+            enfileirar(filho)
+
+            # Todos os sucessores gerados: f(n) passa a vir dos filhos (inclusive
+            # os esquecidos) e, se estão todos em memória, o nó sai da fila
+            if not pendentes[atual]:
+                if not esquecidos.get(atual):
+                    desenfileirar(atual)
+                propagar_f(atual)
+            if atual in entradas:
+                desenfileirar(atual)
+                enfileirar(atual)
+
+        return None, self.arvore_busca, 0
+
+    # -----------------------------------------------------------------------------
+    # BUSCA EM FEIXE (Greedy e A* ponderado)
+    # -----------------------------------------------------------------------------
+    def _zona(self, grafo: Graph, estado, tamanho_zona):
+        """Célula (tamanho_zona x tamanho_zona) da posição do nó; sem posição, o próprio nó"""
+        posicao = grafo.posicoes.get(estado)
+        if posicao is None:
+            posicao = getattr(grafo, 'posicoes_layout', {}).get(estado)
+        if posicao is None:
+            return estado
+        return int(posicao[0] // tamanho_zona), int(posicao[1] // tamanho_zona)
+
+    def busca_feixe(self, grafo: Graph, inicio, fim, largura=LARGURA_FEIXE, peso=None,
+                    tamanho_zona=None, max_por_zona=None, ampliar=True):
+        """
+        Busca em feixe (beam search) pela melhor escolha
+
+        Expande sempre o nó aberto de menor f(n), como o Greedy (peso=None,
+        f(n) = h(n)) ou o A* ponderado (f(n) = g(n) + peso * h(n)), mas a
+        lista de abertos guarda no máximo `largura` nós: ao passar do limite,
+        o pior é descartado. Os estados já expandidos ficam numa tabela de no
+        máximo `largura` entradas; cheia, a expansão mais antiga sai dela e,
+        a partir daí, sucessores que estão no caminho do nó expandido também
+        são descartados (evita ciclos). A árvore de busca guarda só os
+        abertos e seus ancestrais, de modo que memória e tempo por expansão
+        dependem da largura, não do tamanho do mapa. Se nada é descartado
+        (largura maior ou igual ao número de nós), o resultado é o mesmo do
+        greedy (peso=None) ou do a_estrela (peso=1).
+
+        Com tamanho_zona e max_por_zona, o descarte prefere o pior nó de uma
+        zona (célula tamanho_zona x tamanho_zona das posições dos nós) com
+        mais de max_por_zona abertos, o que evita um feixe concentrado num
+        único corredor.
+
+        Se os abertos se esgotarem sem encontrar o objetivo depois de algum
+        descarte e ampliar=True, a busca é repetida com o dobro da largura.
+        largura_final e ampliacoes ficam disponíveis ao final; nos_visitados
+        acumula as expansões de todas as tentativas.
+        """
+        if largura < 1:
+            raise ValueError("A largura do feixe deve ser de pelo menos 1 nó")
+        self.nos_visitados = []
+        self.arvore_busca = None
+        self.largura_final = largura
+        self.ampliacoes = 0
+        hook = self.hook
+        por_zona_ativo = bool(max_por_zona and tamanho_zona)
+
+        if inicio == fim:
+            return [inicio], NodeP(estado=inicio, v1=0, v2=0)
+
+        def podar(no, atual):
+            # Remove da árvore o nó e os ancestrais que ficaram sem filhos
+            while no is not atual and no.pai is not None and not no.filhos:
+                no.pai.filhos.remove(no)
+                no = no.pai
+
+        def remover_aberto(entrada):
+            del abertos[bisect_left(abertos, entrada[:2])]
+            del entradas[entrada[2].estado]
+            if por_zona_ativo:
+                por_zona[self._zona(grafo, entrada[2].estado, tamanho_zona)] -= 1
+
+        while True:
+            h_inicial = self._heuristica_grafo(grafo, inicio, fim)
+            raiz = NodeP(pai=None, estado=inicio, v1=h_inicial if peso is None else peso * h_inicial, v2=0)
+            self.arvore_busca = raiz
+
+            abertos = [(raiz.v1, 0, raiz)]  # Entradas (v1, ordem, nó) ordenadas: a melhor primeiro
+            entradas = {inicio: abertos[0]}  # Estado -> entrada do nó aberto desse estado
+            fechados = {}  # Estado -> nó expandido, na ordem de expansão (no máximo `largura`)
+            por_zona = {}  # Zona -> número de abertos nela
+            if por_zona_ativo:
+                por_zona[self._zona(grafo, inicio, tamanho_zona)] = 1
+            ordem = 0
+            descartou = False
+            esqueceu = False
+
+            while abertos:
+                # remove o nó com menor v1
+                atual = abertos[0][2]
+                remover_aberto(abertos[0])
+                atual.expandido = True
+                self.nos_visitados.append(atual.estado)
+                if hook is not None:
+                    hook.on_expand(atual)
+
+                # Chegou ao objetivo
+                if atual.estado == fim:
+                    if hook is not None:
+                        hook.on_goal(atual)
+                    caminho = self._reconstruir_caminho(atual)
+                    return caminho, self.arvore_busca, atual.v2
+
+                fechados[atual.estado] = atual
+                if len(fechados) > largura:
+                    del fechados[next(iter(fechados))]
+                    esqueceu = True
+
+                # Com a tabela de expandidos incompleta, evita ciclos pelo próprio caminho
+                no_caminho = set()
+                no = atual.pai if esqueceu else None
+                while no is not None:
+                    no_caminho.add(no.estado)
+                    no = no.pai
+
+                for vizinho, custo_aresta in grafo.obter_vizinhos(atual.estado):
+                    v2 = atual.v2 + custo_aresta
+                    entrada = entradas.get(vizinho)
+                    anterior = entrada[2] if entrada is not None else fechados.get(vizinho)
+                    if vizinho in no_caminho or (anterior is not None and v2 >= anterior.v2):
+                        continue
+                    h = self._heuristica_grafo(grafo, vizinho, fim)
+                    v1 = h if peso is None else v2 + peso * h
+                    filho = NodeP(pai=atual, estado=vizinho, v1=v1, v2=v2)
+
+                    # Estado já conhecido por um caminho pior
+                    if anterior is not None:
+                        if hook is not None:
+                            hook.on_reopen(anterior, filho)
+                        if entrada is not None:
+                            remover_aberto(entrada)
+                            podar(anterior, atual)
+                        else:
+                            del fechados[vizinho]
+
+                    atual.adicionar_filho(filho)
+                    if hook is not None:
+                        hook.on_generate(atual, filho)
+                    ordem += 1
+                    entrada = (v1, ordem, filho)
+                    insort(abertos, entrada)
+                    entradas[vizinho] = entrada
+                    if por_zona_ativo:
+                        zona = self._zona(grafo, vizinho, tamanho_zona)
+                        por_zona[zona] = por_zona.get(zona, 0) + 1
+
+                    # Feixe cheio: descarta o pior aberto (de preferência de uma zona lotada)
+                    if len(abertos) > largura:
+                        descartou = True
+                        pior = abertos[-1]
+                        if por_zona_ativo:
+                            for candidato in reversed(abertos):
+                                if por_zona[self._zona(grafo, candidato[2].estado, tamanho_zona)] > max_por_zona:
+                                    pior = candidato
+                                    break
+                        remover_aberto(pior)
+                        podar(pior[2], atual)
+
+                podar(atual, None)
+
+            # Abertos esgotados: amplia apenas se algum nó foi descartado
+            if not (ampliar and descartou):
+                return None, self.arvore_busca, 0
+            largura *= 2
+            self.largura_final = largura
+            self.ampliacoes += 1
+
+    def greedy_feixe(self, grafo: Graph, inicio, fim, largura=LARGURA_FEIXE, **opcoes):
+        """Busca Gulosa em feixe: f(n) = h(n) (ver busca_feixe)"""
+        return self.busca_feixe(grafo, inicio, fim, largura, peso=None, **opcoes)
+
+    def a_estrela_ponderada_feixe(self, grafo: Graph, inicio, fim, largura=LARGURA_FEIXE,
+                                  peso=PESO_A_ESTRELA, **opcoes):
+        """A* ponderado em feixe: f(n) = g(n) + peso * h(n) (ver busca_feixe)"""
+        return self.busca_feixe(grafo, inicio, fim, largura, peso=peso, **opcoes)
+
+    # -----------------------------------------------------------------------------
+    # JUMP POINT SEARCH (grades de ocupação)
+    # -----------------------------------------------------------------------------
+    @staticmethod
+    def _saltar_reto(livre, x, y, dx, dy, fx, fy):
+        """Avança em linha reta até o objetivo ou uma célula com vizinho forçado; None se bloqueado"""
+        while livre(x, y):
+            if x == fx and y == fy:
+                return x, y
+            if dx:
+                if (livre(x, y - 1) and not livre(x - dx, y - 1)) or \
+                        (livre(x, y + 1) and not livre(x - dx, y + 1)):
+                    return x, y
+            elif (livre(x - 1, y) and not livre(x - 1, y - dy)) or \
+                    (livre(x + 1, y) and not livre(x + 1, y - dy)):
+                return x, y
+            x += dx
+            y += dy
+        return None
+
+    def _saltar(self, livre, x, y, dx, dy, fx, fy):
+        """Próximo ponto de salto a partir de (x, y) na direção (dx, dy), ou None"""
+        if not dx or not dy:
+            return self._saltar_reto(livre, x, y, dx, dy, fx, fy)
+        while livre(x, y):
+            if x == fx and y == fy:
+                return x, y
+            # Na diagonal, para onde uma das varreduras retas encontra um ponto de salto
+            if self._saltar_reto(livre, x + dx, y, dx, 0, fx, fy) is not None or \
+                    self._saltar_reto(livre, x, y + dy, 0, dy, fx, fy) is not None:
+                return x, y
+            if not (livre(x + dx, y) and livre(x, y + dy)):
+                return None  # Não corta quinas
+            x += dx
+            y += dy
+        return None
+
+    @staticmethod
+    def _direcoes_podadas(livre, x, y, pai):
+        """Direções a explorar a partir de (x, y), podadas pela direção de chegada"""
+        if pai is None:
+            direcoes = [(dx, dy) for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)) if livre(x + dx, y + dy)]
+            direcoes.extend((dx, dy) for dx, dy in ((1, 1), (1, -1), (-1, 1), (-1, -1))
+                            if livre(x + dx, y) and livre(x, y + dy))
+            return direcoes
+
+        px, py = pai
+        dx = (x > px) - (x < px)
+        dy = (y > py) - (y < py)
+        direcoes = []
+        if dx and dy:
+            vertical = livre(x, y + dy)
+            horizontal = livre(x + dx, y)
+            if vertical:
+                direcoes.append((0, dy))
+            if horizontal:
+                direcoes.append((dx, 0))
+            if vertical and horizontal:
+                direcoes.append((dx, dy))
+        elif dx:
+            acima = livre(x, y + 1)
+            abaixo = livre(x, y - 1)
+            if livre(x + dx, y):
+                direcoes.append((dx, 0))
+                if acima:
+                    direcoes.append((dx, 1))
+                if abaixo:
+                    direcoes.append((dx, -1))
+            if acima:
+                direcoes.append((0, 1))
+            if abaixo:
+                direcoes.append((0, -1))
+        else:
+            direita = livre(x + 1, y)
+            esquerda = livre(x - 1, y)
+            if livre(x, y + dy):
+                direcoes.append((0, dy))
+                if direita:
+                    direcoes.append((1, dy))
+                if esquerda:
+                    direcoes.append((-1, dy))
+            if direita:
+                direcoes.append((1, 0))
+            if esquerda:
+                direcoes.append((-1, 0))
+        return direcoes
+
+    def jump_point_search(self, grafo: GridGraph, inicio, fim):
+        """
+        Jump Point Search (JPS) em grades de ocupação 8-conectadas
+
+        A* sobre os pontos de salto: a partir de cada nó expandido a busca
+        avança em linha reta (ou na diagonal) pelo bitmap da grade, sem
+        gerar as células intermediárias, até o objetivo ou uma célula com
+        vizinho forçado por um obstáculo. A árvore de busca contém apenas
+        os pontos de salto, mas o caminho retornado lista todas as células
+        (ids de nó), com o mesmo custo ótimo do A*. Heurística octil.
+
+        Exige um GridGraph; em grades 4-conectadas executa o A* comum.
+        """
+        if not isinstance(grafo, GridGraph):
+            raise ValueError("Jump Point Search requer um grafo de grade (arquivo .map)")
+        if not grafo.diagonais:
+            return self.a_estrela(grafo, inicio, fim)
+
+        self.nos_visitados = []
+        self.arvore_busca = None
+        hook = self.hook
+
+        if inicio == fim:
+            return [inicio], NodeP(estado=inicio, v1=0, v2=0)
+
+        origem = grafo.coordenadas(inicio)
+        destino = grafo.coordenadas(fim)
+        if origem is None or destino is None:
+            return None, self.arvore_busca, 0
+        fx, fy = destino
+        livre = grafo.livre
+
+        def octil(x1, y1, x2, y2):
+            ddx = abs(x1 - x2)
+            ddy = abs(y1 - y2)
+            return max(ddx, ddy) + (DIAGONAL - 1) * min(ddx, ddy)
+
+        # v1 = f(n) = g(n) + h(n)
+        raiz = NodeP(pai=None, estado=inicio, v1=octil(*origem, fx, fy), v2=0)
+        self.arvore_busca = raiz
+        abertos = {inicio: raiz}  # Melhor nó gerado para cada ponto de salto
+        fechados = set()
+        lista = [(raiz.v1, 0, raiz)]
+        contador = 1
+
+        while lista:
+            _, _, atual = heapq.heappop(lista)
+            if atual.estado in fechados or abertos.get(atual.estado) is not atual:
+                continue  # Entrada substituída por um caminho melhor
+            fechados.add(atual.estado)
+            atual.expandido = True
+            self.nos_visitados.append(atual.estado)
+            if hook is not None:
+                hook.on_expand(atual)
+
+            # Chegou ao objetivo
+            if atual.estado == fim:
+                if hook is not None:
+                    hook.on_goal(atual)
+                return self._caminho_grade(grafo, self._reconstruir_caminho(atual)), self.arvore_busca, atual.v2
+
+            x, y = grafo.coordenadas(atual.estado)
+            pai = grafo.coordenadas(atual.pai.estado) if atual.pai is not None else None
+            for dx, dy in self._direcoes_podadas(livre, x, y, pai):
+                ponto = self._saltar(livre, x + dx, y + dy, dx, dy, fx, fy)
+                if ponto is None:
+                    continue
+                jx, jy = ponto
+                vizinho = grafo.id_no(jx, jy)
+                if vizinho in fechados:
+                    continue
+                v2 = atual.v2 + octil(x, y, jx, jy)
+                anterior = abertos.get(vizinho)
+                if anterior is not None and anterior.v2 <= v2:
+                    continue
+                filho = NodeP(pai=atual, estado=vizinho, v1=v2 + octil(jx, jy, fx, fy), v2=v2)
+                if anterior is not None and hook is not None:
+                    hook.on_reopen(anterior, filho)
+                abertos[vizinho] = filho
+                atual.adicionar_filho(filho)
+                if hook is not None:
+                    hook.on_generate(atual, filho)
+                heapq.heappush(lista, (filho.v1, contador, filho))
+                contador += 1
+
+        return None, self.arvore_busca, 0
+
+    @staticmethod
+    def _caminho_grade(grafo: GridGraph, pontos):
+        """Expande a sequência de pontos de salto em todas as células do caminho"""
+        caminho = [pontos[0]]
+        for origem, destino in zip(pontos, pontos[1:]):
+            x, y = grafo.coordenadas(origem)
+            bx, by = grafo.coordenadas(destino)
+            dx = (bx > x) - (bx < x)
+            dy = (by > y) - (by < y)
+            while (x, y) != (bx, by):
+                x += dx
+                y += dy
+                caminho.append(grafo.id_no(x, y))
+        return caminho
+
+    # -----------------------------------------------------------------------------
+    # MÚLTIPLOS OBJETIVOS (objetivo mais próximo)
+    # -----------------------------------------------------------------------------
+    def _heuristica_multiobjetivo(self, grafo: Graph, no_atual, fins):
+        """Menor heurística entre todos os objetivos (admissível se cada uma for)"""
+        return min(self._heuristica_grafo(grafo, no_atual, fim) for fim in fins)
+
+    def _busca_multiobjetivo(self, grafo: Graph, inicio, fins, usar_heuristica):
+        """Busca de melhor escolha que para no primeiro objetivo expandido"""
+        self.nos_visitados = []
+        self.arvore_busca = None
+        hook = self.hook
+        fins = set(fins)
+
+        if inicio in fins:
+            return [inicio], NodeP(estado=inicio, v1=0, v2=0), 0, inicio
+
+        if not fins:
+            return None, self.arvore_busca, 0, None  # Nenhum objetivo a alcançar
+
+        lista = deque()
+
+        h_inicial = self._heuristica_multiobjetivo(grafo, inicio, fins) if usar_heuristica else 0
+        raiz = NodeP(pai=None, estado=inicio, v1=h_inicial, v2=0)
+        self.arvore_busca = raiz
+        lista.append(raiz)
+
+        visitado = {inicio: raiz}
+
+        while lista:
+            atual = lista.popleft()
+            atual.expandido = True
+            self.nos_visitados.append(atual.estado)
+            if hook is not None:
+                hook.on_expand(atual)
+
+            # O primeiro objetivo retirado da lista é o de menor custo
+            if atual.estado in fins:
+                atual.objetivo = True
+                if hook is not None:
+                    hook.on_goal(atual)
+                caminho = self._reconstruir_caminho(atual)
+                return caminho, self.arvore_busca, atual.v2, atual.estado
+
+            for vizinho, custo_aresta in grafo.obter_vizinhos(atual.estado):
+                v2 = atual.v2 + custo_aresta
+                v1 = v2
+                if usar_heuristica:
+                    v1 += self._heuristica_multiobjetivo(grafo, vizinho, fins)
+
+                if (vizinho not in visitado) or (v2 < visitado[vizinho].v2):
+                    filho = NodeP(pai=atual, estado=vizinho, v1=v1, v2=v2)
+
+                    if vizinho in visitado:
+                        if hook is not None:
+                            hook.on_reopen(visitado[vizinho], filho)
+                        try:
+                            lista.remove(visitado[vizinho])
+                        except ValueError:
+                            pass
+
+                    visitado[vizinho] = filho
+                    atual.adicionar_filho(filho)
+                    if hook is not None:
+                        hook.on_generate(atual, filho)
+                    self._inserir_ordenado(lista, filho)
+
+        return None, self.arvore_busca, 0, None
+
+    def custo_uniforme_multiobjetivo(self, grafo: Graph, inicio, fins):
+        """
+        Custo Uniforme até o objetivo de menor custo entre vários
+
+        Returns:
+            Tupla (caminho, arvore, custo, objetivo_alcancado)
+        """
+        return self._busca_multiobjetivo(grafo, inicio, fins, usar_heuristica=False)
+
+    def a_estrela_multiobjetivo(self, grafo: Graph, inicio, fins):
+        """
+        A* até o objetivo de menor custo entre vários, com h(n) = min h(n, objetivo)
+
+        Returns:
+            Tupla (caminho, arvore, custo, objetivo_alcancado)
+        """
+        return self._busca_multiobjetivo(grafo, inicio, fins, usar_heuristica=True)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Versões passo a passo (geradores) dos algoritmos de busca.
+
+Cada método tem o mesmo nome e a mesma semântica do algoritmo equivalente
+em SearchAlgorithms/SearchAlgorithmsP, mas em vez de montar a árvore de
+busca completa ele produz eventos compactos à medida que a busca avança:
+
+    ('expandir', estado, custo, profundidade)
+    ('fronteira', estado_pai, ((estado, custo), ...))
+    ('iteracao', limite)            # apenas nas buscas iterativas
+    ('objetivo', caminho, custo)
+
+Se o gerador terminar sem emitir 'objetivo', o caminho não existe.
+Internamente só são mantidos dicionários estado -> pai e a fronteira,
+de modo que a memória não cresce com o número de eventos já consumidos.
+O consumidor pode interromper a busca a qualquer momento parando de
+iterar (ou chamando close() no gerador).
+"""
+
+import heapq
+from collections import deque
+from .search_algorithms_p import SearchAlgorithmsP
+
+EXPANDIR = 'expandir'
+FRONTEIRA = 'fronteira'
+ITERACAO = 'iteracao'
+OBJETIVO = 'objetivo'
+
+
+class SearchSteps:
+    """Algoritmos de busca como geradores de eventos"""
+
+    def __init__(self):
+        self._ponderados = SearchAlgorithmsP()
+
+    def _heuristica(self, grafo, no_atual, no_destino):
+        return self._ponderados._heuristica_grafo(grafo, no_atual, no_destino)
+
+    def _reconstruir_caminho(self, pais, estado):
+        """Reconstrói o caminho a partir do dicionário estado -> pai"""
+        caminho = []
+        while estado is not None:
+            caminho.append(estado)
+            estado = pais[estado]
+        caminho.reverse()
+        return caminho
+
+    # -----------------------------------------------------------------------------
+    # BUSCAS NÃO PONDERADAS
+    # -----------------------------------------------------------------------------
+    def busca_amplitude(self, grafo, inicio, fim):
+        """Busca em Amplitude (BFS) passo a passo"""
+        if inicio == fim:
+            yield (OBJETIVO, [inicio], 0)
+            return
+
+        fila = deque([(inicio, 0, 0)])
+        pais = {inicio: None}
+
+        while fila:
+            estado, custo, profundidade = fila.popleft()
+            yield (EXPANDIR, estado, custo, profundidade)
+
+            novos = []
+            for vizinho, custo_aresta in grafo.obter_vizinhos(estado):
+                if vizinho not in pais:
+                    custo_total = custo + custo_aresta
+                    pais[vizinho] = estado
+                    novos.append((vizinho, custo_total))
+
+                    if vizinho == fim:
+                        yield (FRONTEIRA, estado, tuple(novos))
+                        yield (OBJETIVO, self._reconstruir_caminho(pais, vizinho), custo_total)
+                        return
+
+                    fila.append((vizinho, custo_total, profundidade + 1))
+
+            if novos:
+                yield (FRONTEIRA, estado, tuple(novos))
+
+    def busca_profundidade(self, grafo, inicio, fim):
+        """Busca em Profundidade (DFS) passo a passo"""
+        return self.busca_profundidade_limitada(grafo, inicio, fim, float('inf'))
+
+    def busca_profundidade_limitada(self, grafo, inicio, fim, limite):
+        """Busca em Profundidade Limitada passo a passo"""
+        if inicio == fim:
+            yield (OBJETIVO, [inicio], 0)
+            return
+
+        pilha = [(inicio, 0, 0)]
+        pais = {inicio: None}
+
+        while pilha:
+            estado, custo, profundidade = pilha.pop()
+            yield (EXPANDIR, estado, custo, profundidade)
+
+            if profundidade >= limite:
+                continue
+
+            novos = []
+            # Vizinhos em ordem reversa, como na versão completa
+            for vizinho, custo_aresta in reversed(grafo.obter_vizinhos(estado)):
+                if vizinho not in pais:
+                    custo_total = custo + custo_aresta
+                    pais[vizinho] = estado
+                    novos.append((vizinho, custo_total))
+
+                    if vizinho == fim:
+                        yield (FRONTEIRA, estado, tuple(novos))
+                        yield (OBJETIVO, self._reconstruir_caminho(pais, vizinho), custo_total)
+                        return
+
+                    pilha.append((vizinho, custo_total, profundidade + 1))
+
+            if novos:
+                yield (FRONTEIRA, estado, tuple(novos))
+
+    def busca_aprofundamento_iterativo(self, grafo, inicio, fim, limite_inicial=1):
+        """Busca por Aprofundamento Iterativo passo a passo"""
+        for limite in range(limite_inicial, grafo.num_nos + 1):
+            yield (ITERACAO, limite)
+            for evento in self.busca_profundidade_limitada(grafo, inicio, fim, limite):
+                yield evento
+                if evento[0] == OBJETIVO:
+                    return
+
+    def busca_bidirecional(self, grafo, inicio, fim):
+        """Busca Bidirecional passo a passo"""
+        if inicio == fim:
+            yield (OBJETIVO, [inicio], 0)
+            return
+
+        fila_inicio = deque([(inicio, 0, 0)])
+        fila_fim = deque([(fim, 0, 0)])
+        pais_inicio = {inicio: None}
+        pais_fim = {fim: None}
+        custos_inicio = {inicio: 0}
+        custos_fim = {fim: 0}
+
+        direcoes = (
+            (fila_inicio, pais_inicio, custos_inicio, pais_fim, custos_fim),
+            (fila_fim, pais_fim, custos_fim, pais_inicio, custos_inicio),
+        )
+
+        while fila_inicio and fila_fim:
+            for sentido, (fila, pais, custos, pais_outro, custos_outro) in enumerate(direcoes):
+                if not fila:
+                    continue
+
+                estado, custo, profundidade = fila.popleft()
+                yield (EXPANDIR, estado, custo, profundidade)
+
+                novos = []
+                for vizinho, custo_aresta in grafo.obter_vizinhos(estado):
+                    if vizinho not in pais:
+                        custo_total = custo + custo_aresta
+                        pais[vizinho] = estado
+                        custos[vizinho] = custo_total
+                        novos.append((vizinho, custo_total))
+
+                        # Encontro das duas buscas
+                        if vizinho in pais_outro:
+                            yield (FRONTEIRA, estado, tuple(novos))
+                            caminho_proprio = self._reconstruir_caminho(pais, vizinho)
+                            caminho_outro = self._reconstruir_caminho(pais_outro, vizinho)
+                            if sentido == 0:
+                                caminho = caminho_proprio + caminho_outro[::-1][1:]
+                            else:
+                                caminho = caminho_outro + caminho_proprio[::-1][1:]
+                            yield (OBJETIVO, caminho, custo_total + custos_outro[vizinho])
+                            return
+
+                        fila.append((vizinho, custo_total, profundidade + 1))
+
+                if novos:
+                    yield (FRONTEIRA, estado, tuple(novos))
+
+    # -----------------------------------------------------------------------------
+    # BUSCAS PONDERADAS
+    # -----------------------------------------------------------------------------
+    def _melhor_primeiro(self, grafo, inicio, fim, peso_g, peso_h, limite=float('inf')):
+        """
+        Busca de melhor escolha genérica com f(n) = peso_g * g(n) + peso_h * h(n).
+
+        Nós com f(n) acima de `limite` são descartados. Retorna (via
+        StopIteration) o menor f(n) descartado, usado pela AIA-estrela.
+        """
+        h_inicial = self._heuristica(grafo, inicio, fim) if peso_h else 0
+        contador = 0
+        lista = [(peso_h * h_inicial, contador, inicio, 0, 0)]
+        pais = {inicio: None}
+        melhor_g = {inicio: 0}
+        proximo_limite = float('inf')
+
+        while lista:
+            _, _, estado, g, profundidade = heapq.heappop(lista)
+            if g > melhor_g[estado]:
+                continue  # Entrada obsoleta: o estado foi reaberto com custo menor
+
+            yield (EXPANDIR, estado, g, profundidade)
+
+            if estado == fim:
+                yield (OBJETIVO, self._reconstruir_caminho(pais, estado), g)
+                return proximo_limite
+
+            novos = []
+            for vizinho, custo_aresta in grafo.obter_vizinhos(estado):
+                v2 = g + custo_aresta
+                v1 = peso_g * v2
+                if peso_h:
+                    v1 += peso_h * self._heuristica(grafo, vizinho, fim)
+
+                if v1 > limite:
+                    proximo_limite = min(proximo_limite, v1)
+                    continue
+
+                if vizinho not in melhor_g or v2 < melhor_g[vizinho]:
+                    melhor_g[vizinho] = v2
+                    pais[vizinho] = estado
+                    contador += 1
+                    heapq.heappush(lista, (v1, contador, vizinho, v2, profundidade + 1))
+                    novos.append((vizinho, v2))
+
+            if novos:
+                yield (FRONTEIRA, estado, tuple(novos))
+
+        return proximo_limite
+
+    def custo_uniforme(self, grafo, inicio, fim):
+        """Busca de Custo Uniforme (UCS) passo a passo"""
+        if inicio == fim:
+            yield (OBJETIVO, [inicio], 0)
+            return
+        yield from self._melhor_primeiro(grafo, inicio, fim, 1, 0)
+
+    def greedy(self, grafo, inicio, fim):
+        """Busca Gulosa (Greedy) passo a passo"""
+        if inicio == fim:
+            yield (OBJETIVO, [inicio], 0)
+            return
+        yield from self._melhor_primeiro(grafo, inicio, fim, 0, 1)
+
+    def a_estrela(self, grafo, inicio, fim):
+        """Busca A* passo a passo"""
+        if inicio == fim:
+            yield (OBJETIVO, [inicio], 0)
+            return
+        yield from self._melhor_primeiro(grafo, inicio, fim, 1, 1)
+
+    def aia_estrela(self, grafo, inicio, fim):
+        """Busca AIA-estrela (IDA*) passo a passo"""
+        if inicio == fim:
+            yield (OBJETIVO, [inicio], 0)
+            return
+
+        limite = self._heuristica(grafo, inicio, fim)
+        while limite != float('inf'):
+            yield (ITERACAO, limite)
+            encontrado = False
+            passos = self._melhor_primeiro(grafo, inicio, fim, 1, 1, limite)
+            while True:
+                try:
+                    evento = next(passos)
+                except StopIteration as fim_iteracao:
+                    proximo_limite = fim_iteracao.value
+                    break
+                yield evento
+                if evento[0] == OBJETIVO:
+                    encontrado = True
+            if encontrado:
+                return
+            limite = proximo_limite
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Grafo em memória compartilhada para processos de trabalho sem cópia.
+
+O grafo é exportado uma única vez como arrays planos (ids dos nós, CSR da
+adjacência, posições e o layout por forças com a sua escala) para um bloco
+de multiprocessing.shared_memory ou para um arquivo mapeado em memória.
+Cada processo anexa o bloco pelo nome e obtém uma SharedGraphView, uma
+visão somente leitura com a mesma interface de consulta de Graph (nos,
+num_nos, posicoes, posicoes_layout, escala_layout, obter_vizinhos,
+obter_custo_aresta), utilizável diretamente pelos algoritmos de busca.
+N processos custam, portanto, uma única cópia do grafo.
+
+Recursos extras por aresta (Graph.recursos) não são exportados.
+"""
+
+import math
+import mmap
+import struct
+from array import array
+from multiprocessing import shared_memory
+from .csr import GraphCSR
+
+_ASSINATURA = b'SHGR'
+_VERSAO = 2
+# assinatura, versão, nós, arestas direcionadas, ids contíguos, flags, escala do layout
+# (blocos da versão 1 tinham zeros no lugar da escala e só o bit de posições,
+# então são lidos como estão)
+_CABECALHO = struct.Struct('<4sIqqIId')
+_TAMANHO_CABECALHO = 40  # Múltiplo de 8, para alinhar os arrays
+_COM_POSICOES = 1
+_COM_LAYOUT = 2
+
+
+def _layout(n, m, flags):
+    """Deslocamentos (em bytes) de cada array no bloco e o tamanho total"""
+    nos = _TAMANHO_CABECALHO
+    indptr = nos + 8 * n
+    indices = indptr + 8 * (n + 1)
+    custos = indices + 8 * m
+    posicoes = custos + 8 * m
+    layout = posicoes + (16 * n if flags & _COM_POSICOES else 0)
+    total = layout + (16 * n if flags & _COM_LAYOUT else 0)
+    return nos, indptr, indices, custos, posicoes, layout, total
+
+
+def _flags(grafo):
+    flags = _COM_POSICOES if grafo.posicoes else 0
+    if getattr(grafo, 'posicoes_layout', None):
+        flags |= _COM_LAYOUT
+    return flags
+
+
+def _coordenadas(nos, posicoes):
+    """Array (x0, y0, x1, y1, ...) na ordem dos nós; NaN para nós sem posição"""
+    coordenadas = array('d')
+    for no in nos:
+        x, y = posicoes.get(no, (math.nan, math.nan))
+        coordenadas.extend((float(x), float(y)))
+    return coordenadas
+
+
+def _serializar(grafo, buffer):
+    """Escreve o grafo no buffer (que deve ter tamanho_exportado(grafo) bytes)"""
+    csr = GraphCSR.de_grafo(grafo)
+    n, m = csr.num_nos, csr.num_arestas
+    contiguos = all(isinstance(no, int) and no == csr.nos[0] + i for i, no in enumerate(csr.nos))
+    flags = _flags(grafo)
+    escala = float(getattr(grafo, 'escala_layout', 0.0)) if flags & _COM_LAYOUT else 0.0
+
+    d_nos, d_indptr, d_indices, d_custos, d_posicoes, d_layout, total = _layout(n, m, flags)
+    _CABECALHO.pack_into(buffer, 0, _ASSINATURA, _VERSAO, n, m, int(contiguos), flags, escala)
+
+    visao = memoryview(buffer)
+    visao[d_nos:d_indptr].cast('q')[:] = memoryview(array('q', csr.nos))
+    visao[d_indptr:d_indices].cast('q')[:] = memoryview(csr.indptr)
+    visao[d_indices:d_custos].cast('q')[:] = memoryview(csr.indices)
+    visao[d_custos:d_posicoes].cast('d')[:] = memoryview(csr.custos)
+    if flags & _COM_POSICOES:
+        visao[d_posicoes:d_layout].cast('d')[:] = memoryview(_coordenadas(csr.nos, grafo.posicoes))
+    if flags & _COM_LAYOUT:
+        visao[d_layout:total].cast('d')[:] = memoryview(_coordenadas(csr.nos, grafo.posicoes_layout))
+    visao.release()
+
+
+def tamanho_exportado(grafo):
+    """Número de bytes ocupados pelo grafo exportado"""
+    m = sum(len(grafo.obter_vizinhos(no)) for no in grafo.nos)
+    return _layout(len(grafo.nos), m, _flags(grafo))[-1]
+
+
+class SharedGraph:
+    """Dono de um bloco de memória compartilhada com o grafo exportado"""
+
+    def __init__(self, memoria):
+        self.memoria = memoria
+
+    @classmethod
+    def exportar(cls, grafo, nome=None):
+        """Copia o grafo para um novo bloco de memória compartilhada"""
+        memoria = shared_memory.SharedMemory(name=nome, create=True, size=tamanho_exportado(grafo))
+        _serializar(grafo, memoria.buf)
+        return cls(memoria)
+
+    @property
+    def nome(self):
+        """Nome usado pelos processos para anexar o bloco (SharedGraphView.anexar)"""
+        return self.memoria.name
+
+    def visao(self):
+        """Visão somente leitura no próprio processo dono"""
+        return SharedGraphView(self.memoria.buf)
+
+    def fechar(self, remover=True):
+        """Fecha o bloco e, por padrão, o remove do sistema"""
+        self.memoria.close()
+        if remover:
+            self.memoria.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+
+def exportar_arquivo(grafo, caminho_arquivo):
+    """Grava o grafo no formato compartilhado, para uso com SharedGraphView.abrir_arquivo"""
+    buffer = bytearray(tamanho_exportado(grafo))
+    _serializar(grafo, buffer)
+    with open(caminho_arquivo, 'wb') as arquivo:
+        arquivo.write(buffer)
+    return caminho_arquivo
+
+
+class _NosCompartilhados:
+    """Sequência somente leitura dos ids dos nós com teste de pertinência O(1)"""
+
+    def __init__(self, visao):
+        self._visao = visao
+
+    def __len__(self):
+        return len(self._visao._nos)
+
+    def __getitem__(self, i):
+        return self._visao._nos[i]
+
+    def __iter__(self):
+        return iter(self._visao._nos)
+
+    def __contains__(self, no):
+        return self._visao.indice_de(no) is not None
+
+
+class _PosicoesCompartilhadas:
+    """Mapeamento somente leitura no -> (x, y) sobre um array de coordenadas"""
+
+    def __init__(self, visao, atributo='_posicoes'):
+        self._visao = visao
+        self._atributo = atributo  # '_posicoes' ou '_layout'
+
+    def __bool__(self):
+        return getattr(self._visao, self._atributo) is not None
+
+    def __len__(self):
+        return len(self._visao._nos) if self else 0
+
+    def __getitem__(self, no):
+        i = self._visao.indice_de(no)
+        if i is None or not self:
+            raise KeyError(no)
+        coordenadas = getattr(self._visao, self._atributo)
+        x, y = coordenadas[2 * i], coordenadas[2 * i + 1]
+        if math.isnan(x):
+            raise KeyError(no)
+        return (x, y)
+
+    def get(self, no, padrao=None):
+        try:
+            return self[no]
+        except KeyError:
+            return padrao
+
+    def __contains__(self, no):
+        return self.get(no) is not None
+
+    def __iter__(self):
+        return (no for no in self._visao._nos if no in self)
+
+    def items(self):
+        return ((no, self[no]) for no in self)
+
+
+class SharedGraphView:
+    """
+    Visão somente leitura de um grafo exportado, compatível com as
+    consultas feitas pelos algoritmos de busca em Graph.
+    """
+
+    def __init__(self, buffer, memoria=None, arquivo=None):
+        self._memoria = memoria
+        self._arquivo = arquivo
+        self._buffer = buffer
+        visao = memoryview(buffer).toreadonly()
+        self._visao = visao
+
+        assinatura, versao, n, m, contiguos, flags, escala = _CABECALHO.unpack_from(visao, 0)
+        if assinatura != _ASSINATURA:
+            raise ValueError("Bloco não contém um grafo exportado")
+        if versao > _VERSAO:
+            raise ValueError(f"Versão {versao} do grafo exportado não suportada")
+
+        d_nos, d_indptr, d_indices, d_custos, d_posicoes, d_layout, total = _layout(n, m, flags)
+        self._nos = visao[d_nos:d_indptr].cast('q')
+        self.indptr = visao[d_indptr:d_indices].cast('q')
+        self.indices = visao[d_indices:d_custos].cast('q')
+        self.custos = visao[d_custos:d_posicoes].cast('d')
+        self._posicoes = visao[d_posicoes:d_layout].cast('d') if flags & _COM_POSICOES else None
+        self._layout = visao[d_layout:total].cast('d') if flags & _COM_LAYOUT else None
+
+        self._base = self._nos[0] if (contiguos and n) else None
+        self._indice = None  # Criado sob demanda se os ids não forem contíguos
+        self._csr = None  # GraphCSR criado na primeira chamada de para_csr
+
+        self.num_nos = n
+        self.nos = _NosCompartilhados(self)
+        self.posicoes = _PosicoesCompartilhadas(self)
+        # Layout por forças exportado junto, para a mesma heurística em todos os processos
+        self.posicoes_layout = _PosicoesCompartilhadas(self, '_layout')
+        self.escala_layout = escala
+        self.recursos = {}
+
+    @classmethod
+    def anexar(cls, nome):
+        """Anexa um bloco criado por SharedGraph.exportar em outro processo"""
+        try:
+            # Python 3.13+: o processo anexado não rastreia (nem remove) o bloco
+            memoria = shared_memory.SharedMemory(name=nome, track=False)
+        except TypeError:
+            # Versões anteriores: processos filhos do exportador compartilham o
+            # rastreador de recursos dele, então o bloco só é removido pelo dono
+            memoria = shared_memory.SharedMemory(name=nome)
+        return cls(memoria.buf, memoria=memoria)
+
+    @classmethod
+    def abrir_arquivo(cls, caminho_arquivo):
+        """Mapeia em memória um arquivo gravado por exportar_arquivo"""
+        arquivo = open(caminho_arquivo, 'rb')
+        mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapa, arquivo=arquivo)
+
+    def indice_de(self, no):
+        """Índice do nó nos arrays, ou None se não existir"""
+        if self._base is not None:
+            if not isinstance(no, int):
+                return None
+            i = no - self._base
+            return i if 0 <= i < self.num_nos else None
+        if self._indice is None:
+            self._indice = {valor: i for i, valor in enumerate(self._nos)}
+        return self._indice.get(no)
+
+    def obter_vizinhos(self, no):
+        """Retorna os vizinhos de um nó com seus respectivos custos"""
+        i = self.indice_de(no)
+        if i is None:
+            return []
+        nos, indices, custos = self._nos, self.indices, self.custos
+        return [(nos[indices[p]], custos[p]) for p in range(self.indptr[i], self.indptr[i + 1])]
+
+    def obter_custo_aresta(self, origem, destino):
+        """Retorna o custo da aresta entre dois nós"""
+        for vizinho, custo in self.obter_vizinhos(origem):
+            if vizinho == destino:
+                return custo
+        return float('inf')
+
+    def obter_recursos_aresta(self, origem, destino):
+        return ()
+
+    def para_csr(self):
+        """GraphCSR sobre os mesmos buffers, usando o buffer de ids e indice_de da visão"""
+        if self._csr is None:
+            self._csr = GraphCSR(self._nos, self.indptr, self.indices, self.custos, self.indice_de)
+        return self._csr
+
+    def fechar(self):
+        """Libera a visão (não remove o bloco compartilhado)"""
+        self._csr = None
+        for atributo in ('_nos', 'indptr', 'indices', 'custos', '_posicoes', '_layout', '_visao'):
+            valor = getattr(self, atributo)
+            if valor is not None:
+                valor.release()
+        if self._memoria is not None:
+            self._memoria.close()
+        if self._arquivo is not None:
+            self._buffer.close()
+            self._arquivo.close()
+
+    def __repr__(self):
+        return f"SharedGraphView(nos={self.num_nos}, arestas={len(self.indices) // 2})"
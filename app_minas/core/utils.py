@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import sys
+from array import array
+
 def calcular_custo_caminho(grafo, caminho):
     """Calcula o custo total de um caminho"""
     if not caminho or len(caminho) < 2:
@@ -29,23 +32,75 @@ def validar_entrada(origem, destino, nos_grafo):
             
         return True, (origem_int, destino_int)
         
-    except ValueError:
+    except (TypeError, ValueError, OverflowError):
+        # TypeError: None, listas ou objetos vindos de JSON; OverflowError: Infinity
         return False, "Origem e destino devem ser números inteiros"
 
-def formatar_resultado(caminho, custo, algoritmo, nos_visitados):
-    """Formata o resultado da busca para exibição"""
+TAMANHO_PAGINA_VISITACAO = 1000  # Nós por bloco da ordem de visitação
+
+ROTULOS_ESTATISTICAS = {
+    'nos_esquecidos': "Nós esquecidos",
+    'nos_regenerados': "Nós regenerados",
+    'nos_reexpandidos': "Nós reexpandidos",
+    'pico_memoria': "Pico de memória (nós)",
+    'largura_final': "Largura final do feixe",
+    'ampliacoes': "Ampliações do feixe"
+}
+
+def formatar_resumo(caminho, custo, algoritmo, nos_visitados, estatisticas=None):
+    """
+    Formata o resultado da busca sem a ordem de visitação
+
+    estatisticas são os valores específicos do algoritmo preenchidos por
+    executar_algoritmo (ex: nós esquecidos pelo SMA*), exibidos ao final.
+    """
     if not caminho:
-        return f"Algoritmo: {algoritmo}\nResultado: Caminho não encontrado"
-        
-    resultado = f"Algoritmo: {algoritmo}\n"
-    resultado += f"Caminho encontrado: {' → '.join(map(str, caminho))}\n"
-    resultado += f"Custo total: {custo}\n"
-    resultado += f"Número de nós no caminho: {len(caminho)}\n"
-    resultado += f"Nós visitados: {len(nos_visitados)}\n"
-    resultado += f"Ordem de visitação: {' → '.join(map(str, nos_visitados))}"
-    
+        resultado = f"Algoritmo: {algoritmo}\nResultado: Caminho não encontrado"
+    else:
+        resultado = f"Algoritmo: {algoritmo}\n"
+        resultado += f"Caminho encontrado: {' → '.join(map(str, caminho))}\n"
+        resultado += f"Custo total: {custo}\n"
+        resultado += f"Número de nós no caminho: {len(caminho)}\n"
+        resultado += f"Nós visitados: {len(nos_visitados)}"
+
+    for chave, valor in (estatisticas or {}).items():
+        resultado += f"\n{ROTULOS_ESTATISTICAS.get(chave, chave)}: {valor}"
+
     return resultado
 
+def paginar_visitacao(nos_visitados, tamanho_pagina=TAMANHO_PAGINA_VISITACAO):
+    """
+    Gera a ordem de visitação em blocos de texto, sob demanda.
+
+    Os blocos devem ser unidos com ' → ' entre si; cada um cobre no máximo
+    tamanho_pagina nós, de modo que só o trecho exibido ou gravado é formatado.
+    """
+    for inicio in range(0, len(nos_visitados), tamanho_pagina):
+        yield ' → '.join(map(str, nos_visitados[inicio:inicio + tamanho_pagina]))
+
+def escrever_resultado(arquivo, caminho, custo, algoritmo, nos_visitados,
+                       tamanho_pagina=TAMANHO_PAGINA_VISITACAO, estatisticas=None):
+    """Escreve em um arquivo aberto o mesmo texto de formatar_resultado, bloco a bloco"""
+    arquivo.write(formatar_resumo(caminho, custo, algoritmo, nos_visitados, estatisticas))
+    if not caminho:
+        return
+    arquivo.write("\nOrdem de visitação: ")
+    for numero, bloco in enumerate(paginar_visitacao(nos_visitados, tamanho_pagina)):
+        if numero:
+            arquivo.write(' → ')
+        arquivo.write(bloco)
+
+def formatar_resultado(caminho, custo, algoritmo, nos_visitados):
+    """
+    Formata o resultado da busca para exibição, incluindo a ordem de
+    visitação completa (para buscas grandes prefira formatar_resumo e
+    paginar_visitacao ou escrever_resultado)
+    """
+    resultado = formatar_resumo(caminho, custo, algoritmo, nos_visitados)
+    if not caminho:
+        return resultado
+    return resultado + f"\nOrdem de visitação: {' → '.join(paginar_visitacao(nos_visitados))}"
+
 def criar_arquivo_exemplo():
     """Cria um arquivo de exemplo para teste"""
     conteudo = """10
@@ -71,3 +126,32 @@ def criar_arquivo_exemplo():
         
     return "exemplo_grafo.txt"
 
+def gravar_array(valores, arquivo):
+    """Grava o array em little-endian, qualquer que seja a ordem da máquina"""
+    if sys.byteorder == 'big':
+        valores = array(valores.typecode, valores)
+        valores.byteswap()
+    valores.tofile(arquivo)
+
+def ler_array(tipo, arquivo, quantidade):
+    """Lê quantidade valores little-endian do arquivo para um array na ordem da máquina"""
+    valores = array(tipo)
+    valores.fromfile(arquivo, quantidade)
+    if sys.byteorder == 'big':
+        valores.byteswap()
+    return valores
+
+def array_para_bytes(valores):
+    """Bytes do array em little-endian, qualquer que seja a ordem da máquina"""
+    if sys.byteorder == 'big':
+        valores = array(valores.typecode, valores)
+        valores.byteswap()
+    return valores.tobytes()
+
+def array_de_bytes(tipo, dados):
+    """Array na ordem da máquina a partir de bytes little-endian"""
+    valores = array(tipo)
+    valores.frombytes(dados)
+    if sys.byteorder == 'big':
+        valores.byteswap()
+    return valores
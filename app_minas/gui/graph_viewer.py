@@ -1,44 +1,246 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from PyQt5.QtWidgets import (QWidget, QGraphicsView, QGraphicsScene, 
-                             QGraphicsEllipseItem, QGraphicsLineItem, 
-                             QGraphicsTextItem, QVBoxLayout, QScrollBar)
-from PyQt5.QtCore import Qt, QRectF, QPointF
-from PyQt5.QtGui import QPen, QBrush, QColor, QFont, QPainter
+from PyQt5.QtWidgets import (QWidget, QGraphicsView, QGraphicsScene,
+                             QGraphicsEllipseItem, QGraphicsLineItem,
+                             QGraphicsSimpleTextItem, QGraphicsItem,
+                             QStyleOptionGraphicsItem, QVBoxLayout)
+from PyQt5.QtCore import Qt, QRectF, QPointF, QTimer
+from PyQt5.QtGui import QPen, QBrush, QColor, QFont, QPainter, QPainterPath, QPolygonF
 import math
+import time
+
+NODE_RADIUS = 35
+EDGES_PER_BATCH = 2000  # Arestas por item agrupado (cada item é uma célula da grade)
+NODES_PER_BATCH = 1000
+LABEL_MIN_SCALE = 0.25  # Escala mínima da view para exibir rótulos de nós e custos
+MAX_LABELS = 1500  # Acima disso a região visível é densa demais para rótulos
+DETAIL_MIN_LOD = 0.05  # Abaixo disso nós viram pontos e arestas, linhas finas
+BATCH_TIME_BUDGET = 0.03  # Segundos por etapa de criação dos itens agrupados
+MAX_EXPLORED_PER_FRAME = 400  # Nós expandidos coloridos por lote de progresso; o resto fica para o fim
+
+# Camadas da cena
+Z_EDGES, Z_PATH_EDGES, Z_NODES, Z_EXPLORED, Z_PATH_NODES, Z_LABELS = range(6)
+
+
+class SpatialGrid:
+    """Índice espacial em grade uniforme: célula -> itens"""
+
+    def __init__(self, bounds, num_items, items_per_cell):
+        cells = max(1, num_items // items_per_cell)
+        side = max(1, int(math.sqrt(cells)))
+        self.left = bounds.left()
+        self.top = bounds.top()
+        self.cell_width = max(bounds.width() / side, 1.0)
+        self.cell_height = max(bounds.height() / side, 1.0)
+        self.cells = {}
+
+    def cell_of(self, x, y):
+        return (int((x - self.left) // self.cell_width), int((y - self.top) // self.cell_height))
+
+    def insert(self, x, y, item):
+        self.cells.setdefault(self.cell_of(x, y), []).append(item)
+
+    def insert_many(self, points, items):
+        """Insere vários itens de uma vez; points são pares (x, y) na ordem de items"""
+        left, top, width, height = self.left, self.top, self.cell_width, self.cell_height
+        cells = self.cells
+        for (x, y), item in zip(points, items):
+            cell = (int((x - left) // width), int((y - top) // height))
+            bucket = cells.get(cell)
+            if bucket is None:
+                cells[cell] = [item]
+            else:
+                bucket.append(item)
+
+    def cell_rect(self, cell):
+        return QRectF(self.left + cell[0] * self.cell_width, self.top + cell[1] * self.cell_height,
+                      self.cell_width, self.cell_height)
+
+    def query(self, rect, margin=0):
+        """Gera os itens das células que intersectam o retângulo"""
+        x0, y0 = self.cell_of(rect.left() - margin, rect.top() - margin)
+        x1, y1 = self.cell_of(rect.right() + margin, rect.bottom() + margin)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self.cells):
+            # Retângulo maior que a grade ocupada: percorre as células existentes
+            for (cx, cy), items in self.cells.items():
+                if x0 <= cx <= x1 and y0 <= cy <= y1:
+                    yield from items
+            return
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                yield from self.cells.get((cx, cy), ())
+
+
+class _EdgeBatchItem(QGraphicsItem):
+    """Várias arestas desenhadas como um único QPainterPath"""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.pen = QPen(QColor(0, 0, 0), 2)
+        self.thin_pen = QPen(QColor(0, 0, 0), 0)  # Cosmética: 1 pixel em qualquer zoom
+        self.rect = path.boundingRect().adjusted(-2, -2, 2, 2)
+        self.setZValue(Z_EDGES)
+
+    def boundingRect(self):
+        return self.rect
+
+    def paint(self, painter, option, widget=None):
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        if lod < DETAIL_MIN_LOD:
+            painter.setRenderHint(QPainter.Antialiasing, False)
+            painter.setPen(self.thin_pen)
+        else:
+            painter.setRenderHint(QPainter.Antialiasing, True)
+            painter.setPen(self.pen)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPath(self.path)
+
+
+class _NodeBatchItem(QGraphicsItem):
+    """Vários nós desenhados como um único QPainterPath (ou pontos, de longe)"""
+
+    def __init__(self, centers):
+        super().__init__()
+        self.path = QPainterPath()
+        self.path.setFillRule(Qt.WindingFill)
+        for x, y in centers:
+            self.path.addEllipse(QPointF(x, y), NODE_RADIUS, NODE_RADIUS)
+        self.points = QPolygonF([QPointF(x, y) for x, y in centers])
+        self.brush = QBrush(QColor(200, 200, 255))
+        self.pen = QPen(QColor(0, 0, 0), 2)
+        self.point_pen = QPen(QColor(80, 80, 160), 3)
+        self.point_pen.setCosmetic(True)
+        self.rect = self.path.boundingRect().adjusted(-2, -2, 2, 2)
+        self.setZValue(Z_NODES)
+
+    def boundingRect(self):
+        return self.rect
+
+    def paint(self, painter, option, widget=None):
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        if lod < DETAIL_MIN_LOD:
+            painter.setRenderHint(QPainter.Antialiasing, False)
+            painter.setPen(self.point_pen)
+            painter.drawPoints(self.points)
+        else:
+            painter.setRenderHint(QPainter.Antialiasing, True)
+            painter.setPen(self.pen)
+            painter.setBrush(self.brush)
+            painter.drawPath(self.path)
+
+
+class _ExploredBatchItem(_NodeBatchItem):
+    """
+    Nós já expandidos pela busca em andamento em uma célula da grade.
+
+    Recebe nós novos a cada lote de progresso. O retângulo é o da célula
+    desde o início, para que acrescentar nós não mexa no índice da cena, e
+    os círculos só entram no QPainterPath quando o item é desenhado com
+    detalhe, pois de longe bastam os pontos.
+    """
+
+    def __init__(self, cell_rect):
+        super().__init__([])
+        self.brush = QBrush(QColor(255, 200, 100))
+        self.pen = QPen(QColor(200, 100, 0), 2)
+        self.point_pen = QPen(QColor(230, 120, 0), 3)
+        self.point_pen.setCosmetic(True)
+        self.pending = []  # Centros ainda fora do caminho
+        margin = NODE_RADIUS + 2
+        self.rect = cell_rect.adjusted(-margin, -margin, margin, margin)
+        self.setZValue(Z_EXPLORED)
+
+    def add(self, centers):
+        """Acrescenta nós (dentro da célula) ao item sem recriá-lo"""
+        self.pending.extend(centers)
+        self.points += QPolygonF([QPointF(x, y) for x, y in centers])
+        self.update()
+
+    def paint(self, painter, option, widget=None):
+        if self.pending and \
+                QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform()) >= DETAIL_MIN_LOD:
+            for x, y in self.pending:
+                self.path.addEllipse(QPointF(x, y), NODE_RADIUS, NODE_RADIUS)
+            self.pending = []
+        super().paint(painter, option, widget)
+
 
 class GraphViewer(QWidget):
+    """
+    Visualizador do grafo com nível de detalhe.
+
+    Arestas e nós são agrupados por células de uma grade em poucos itens
+    desenhados como QPainterPath, de modo que a cena tem dezenas de itens
+    mesmo em mapas com centenas de milhares de arestas; o índice da cena
+    descarta as células fora da área visível. Rótulos de nós e custos só
+    são criados acima de uma escala mínima e apenas para a área visível,
+    consultada no índice espacial. O caminho destacado e os nós já
+    expandidos pela busca em andamento são camadas à parte, atualizadas
+    incrementalmente.
+    """
+
     def __init__(self):
         super().__init__()
         self.graph_data = None
         self.path_nodes = []
+        self.path_set = set()
+        self.path_edges = set()
+        self.path_node_items = {}  # no -> QGraphicsEllipseItem destacado
+        self.path_edge_items = {}  # (no1, no2) -> QGraphicsLineItem destacado
+        self.explored = set()
+        self.explored_items = {}  # célula -> _ExploredBatchItem
+        self.explored_deferred = []  # Listas de nós expandidos ainda não coloridos
+        self.label_items = {}  # chave -> QGraphicsSimpleTextItem visível
+        self.node_grid = None
+        self.edge_grid = None
+        self.edge_list = []
         self.setup_ui()
-        
+
     def setup_ui(self):
         """Configura a interface do visualizador de grafo"""
         layout = QVBoxLayout(self)
-        
+
         # Cria a cena e a view
         self.scene = QGraphicsScene()
         self.view = QGraphicsView(self.scene)
         self.view.setRenderHint(QPainter.Antialiasing)
         self.view.setRenderHint(QPainter.TextAntialiasing)
-        self.view.setRenderHint(QPainter.SmoothPixmapTransform)
         self.view.setDragMode(QGraphicsView.ScrollHandDrag)
-        self.view.setViewportUpdateMode(QGraphicsView.BoundingRectViewportUpdate)
+        self.view.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.view.setOptimizationFlags(QGraphicsView.DontAdjustForAntialiasing)
         self.view.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
         self.view.setResizeAnchor(QGraphicsView.AnchorUnderMouse)
-        
+
         # Sobrescreve o wheelEvent para zoom
         self.view.wheelEvent = self.wheelEvent
-        
+
+        # Itens agrupados restantes são criados nas próximas iterações do laço de eventos
+        self.pending_batches = []
+        self.batch_timer = QTimer(self)
+        self.batch_timer.setSingleShot(True)
+        self.batch_timer.setInterval(0)
+        self.batch_timer.timeout.connect(self.process_pending_batches)
+        self.explored_timer = QTimer(self)
+        self.explored_timer.setSingleShot(True)
+        self.explored_timer.setInterval(0)
+        self.explored_timer.timeout.connect(self.process_deferred_explored)
+
+        # Rótulos são atualizados depois que o usuário para de mover/aproximar
+        self.label_timer = QTimer(self)
+        self.label_timer.setSingleShot(True)
+        self.label_timer.setInterval(60)
+        self.label_timer.timeout.connect(self.update_labels)
+        self.view.horizontalScrollBar().valueChanged.connect(self.schedule_label_update)
+        self.view.verticalScrollBar().valueChanged.connect(self.schedule_label_update)
+
         layout.addWidget(self.view)
-        
+
     def set_graph(self, nodes, edges, node_positions=None):
         """
         Define o grafo a ser visualizado
-        
+
         Args:
             nodes: Lista de nós (ex: [1, 2, 3, 4, 5])
             edges: Lista de arestas com custos (ex: [(1, 2, 10), (2, 3, 15)])
@@ -50,118 +252,315 @@ class GraphViewer(QWidget):
             'positions': node_positions or self.calculate_positions(nodes)
         }
         self.draw_graph()
-        
+
     def calculate_positions(self, nodes):
         """Calcula posições automáticas para os nós em um layout circular"""
         positions = {}
         num_nodes = len(nodes)
-        
+
         if num_nodes == 1:
             positions[nodes[0]] = (0, 0)
             return positions
-            
+
         # Layout circular
         radius = 500
         center_x, center_y = 0, 0
-        
+
         for i, node in enumerate(nodes):
             angle = 2 * math.pi * i / num_nodes
             x = center_x + radius * math.cos(angle)
             y = center_y + radius * math.sin(angle)
             positions[node] = (x, y)
-            
+
         return positions
-        
-    def draw_graph(self):
+
+    def update_positions(self, node_positions, fit=True):
+        """Atualiza as posições dos nós (ex: layout em andamento) mantendo o caminho destacado"""
+        if self.graph_data:
+            self.graph_data['positions'] = node_positions
+            self.draw_graph(fit)
+
+    def draw_graph(self, fit=True):
         """Desenha o grafo na cena"""
         if not self.graph_data:
             return
-            
+
         self.scene.clear()
-        
+        self.pending_batches = []
+        self.path_node_items = {}
+        self.path_edge_items = {}
+        self.explored_items = {}
+        self.explored_deferred = []  # Todos os expandidos são redesenhados abaixo
+        self.explored_timer.stop()
+        self.label_items = {}
+
         nodes = self.graph_data['nodes']
         edges = self.graph_data['edges']
         positions = self.graph_data['positions']
-        
-        # Desenhar arestas primeiro
-        for edge in edges:
-            node1, node2 = edge[0], edge[1]
-            if node1 in positions and node2 in positions:
-                cost = edge[2]
-                self.draw_edge(positions[node1], positions[node2], cost)
-        
-        # Desenhar nós
-        for node in nodes:
-            if node in positions:
-                is_path_node = node in self.path_nodes
-                self.draw_node(positions[node], str(node), is_path_node)
-                
+
+        visible_nodes = [node for node in nodes if node in positions]
+        self.edge_list = [edge for edge in edges if edge[0] in positions and edge[1] in positions]
+        if not visible_nodes:
+            return
+
+        xs = [positions[node][0] for node in visible_nodes]
+        ys = [positions[node][1] for node in visible_nodes]
+        bounds = QRectF(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+
+        # Arestas agrupadas pela célula do ponto médio, nós pela célula do centro
+        self.edge_grid = SpatialGrid(bounds, len(self.edge_list), EDGES_PER_BATCH)
+        midpoints = []
+        for edge in self.edge_list:
+            (x1, y1), (x2, y2) = positions[edge[0]], positions[edge[1]]
+            midpoints.append(((x1 + x2) / 2, (y1 + y2) / 2))
+        self.edge_grid.insert_many(midpoints, range(len(self.edge_list)))
+        self.node_grid = SpatialGrid(bounds, len(visible_nodes), NODES_PER_BATCH)
+        self.node_grid.insert_many([positions[node] for node in visible_nodes], visible_nodes)
+
+        # Caminho destacado atual
+        for node in self.path_set:
+            self._add_path_node(node)
+        for key in self.path_edges:
+            self._add_path_edge(key)
+        self._add_explored(self.explored)
+
         # Ajustar a view para mostrar todo o grafo
-        self.view.fitInView(self.scene.itemsBoundingRect(), Qt.KeepAspectRatio)
-        
-    def draw_node(self, position, label, is_path_node=False):
-        """Desenha um nó na posição especificada"""
-        x, y = position
-        radius = 35
-        
-        if is_path_node:
-            brush = QBrush(QColor(255, 100, 100))
-            pen = QPen(QColor(200, 0, 0), 3)
-        else:
-            brush = QBrush(QColor(200, 200, 255))
-            pen = QPen(QColor(0, 0, 0), 2)
-        
-        circle = QGraphicsEllipseItem(x - radius, y - radius, 2 * radius, 2 * radius)
-        circle.setBrush(brush)
-        circle.setPen(pen)
+        margin = NODE_RADIUS + 30
+        rect = bounds.adjusted(-margin, -margin, margin, margin)
+        self.scene.setSceneRect(rect)
+        if fit:
+            self.view.fitInView(rect, Qt.KeepAspectRatio)
+
+        self.queue_batches()
+        self.update_labels()
+
+    def queue_batches(self):
+        """
+        Enfileira a criação dos itens agrupados: primeiro as células na área
+        visível, depois as demais em ordem de distância, em etapas que não
+        travam a interface
+        """
+        visible = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        center = visible.center()
+
+        def priority(grid, cell):
+            rect = grid.cell_rect(cell)
+            offset = rect.center() - center
+            return (not rect.intersects(visible), offset.x() ** 2 + offset.y() ** 2)
+
+        jobs = [(priority(self.edge_grid, cell), 0, cell) for cell in self.edge_grid.cells]
+        jobs += [(priority(self.node_grid, cell), 1, cell) for cell in self.node_grid.cells]
+        jobs.sort(reverse=True)  # Retirados do fim da lista
+        self.pending_batches = [(kind, cell) for _, kind, cell in jobs]
+        self.process_pending_batches()
+
+    def process_pending_batches(self):
+        """Cria itens agrupados pendentes até esgotar o tempo da etapa"""
+        positions = self.graph_data['positions'] if self.graph_data else None
+        start = time.perf_counter()
+        while self.pending_batches and time.perf_counter() - start < BATCH_TIME_BUDGET:
+            kind, cell = self.pending_batches.pop()
+            if kind == 0:
+                path = QPainterPath()
+                for i in self.edge_grid.cells[cell]:
+                    node1, node2 = self.edge_list[i][0], self.edge_list[i][1]
+                    path.moveTo(*positions[node1])
+                    path.lineTo(*positions[node2])
+                self.scene.addItem(_EdgeBatchItem(path))
+            else:
+                self.scene.addItem(_NodeBatchItem([positions[node] for node in self.node_grid.cells[cell]]))
+        if self.pending_batches:
+            self.batch_timer.start()
+
+    @staticmethod
+    def _edge_key(node1, node2):
+        """Chave de uma aresta não-direcionada"""
+        return (node1, node2) if str(node1) <= str(node2) else (node2, node1)
+
+    def _add_path_node(self, node):
+        positions = self.graph_data['positions']
+        if node not in positions:
+            return
+        x, y = positions[node]
+        circle = QGraphicsEllipseItem(x - NODE_RADIUS, y - NODE_RADIUS, 2 * NODE_RADIUS, 2 * NODE_RADIUS)
+        circle.setBrush(QBrush(QColor(255, 100, 100)))
+        circle.setPen(QPen(QColor(200, 0, 0), 3))
+        circle.setZValue(Z_PATH_NODES)
         self.scene.addItem(circle)
-        
-        text = QGraphicsTextItem(label)
-        text.setFont(QFont("Arial", 12, QFont.Bold))
-        text.setPos(x - 10, y - 10)
-        self.scene.addItem(text)
-        
-    def draw_edge(self, pos1, pos2, cost):
-        """Desenha uma aresta entre duas posições e exibe o custo"""
-        x1, y1 = pos1
-        x2, y2 = pos2
-        
+        self.path_node_items[node] = circle
+
+    def _add_path_edge(self, key):
+        positions = self.graph_data['positions']
+        if key[0] not in positions or key[1] not in positions:
+            return
+        (x1, y1), (x2, y2) = positions[key[0]], positions[key[1]]
         line = QGraphicsLineItem(x1, y1, x2, y2)
-        line.setPen(QPen(QColor(0, 0, 0), 2))
+        line.setPen(QPen(QColor(200, 0, 0), 4))
+        line.setZValue(Z_PATH_EDGES)
         self.scene.addItem(line)
-        
-        mid_x = (x1 + x2) / 2
-        mid_y = (y1 + y2) / 2
-        
-        dx = x2 - x1
-        dy = y2 - y1
-        length = math.sqrt(dx*dx + dy*dy)
-        
-        offset_dist = 20
-        if length > 0:
-            nx = -dy / length
-            ny = dx / length
-            offset_x = nx * offset_dist
-            offset_y = ny * offset_dist
-        else:
-            offset_x = offset_y = 0
-        
-        text = QGraphicsTextItem(str(cost))
-        text.setFont(QFont("Arial", 10))
-        text.setDefaultTextColor(QColor(0, 0, 0))
-        
-        text_rect = text.boundingRect()
-        text.setPos(mid_x - text_rect.width() / 2 + offset_x,
-                    mid_y - text_rect.height() / 2 + offset_y)
-        
-        self.scene.addItem(text)
-        
+        self.path_edge_items[key] = line
+
     def highlight_path(self, path):
-        """Destaca o caminho encontrado"""
+        """
+        Destaca o caminho encontrado.
+
+        Apenas os nós e arestas que entraram ou saíram do caminho são
+        atualizados; a cena não é redesenhada.
+        """
+        path = list(path or [])
+        new_set = set(path)
+        new_edges = {self._edge_key(a, b) for a, b in zip(path, path[1:])}
+
+        if self.graph_data:
+            for node in self.path_set - new_set:
+                item = self.path_node_items.pop(node, None)
+                if item is not None:
+                    self.scene.removeItem(item)
+            for node in new_set - self.path_set:
+                self._add_path_node(node)
+            for key in self.path_edges - new_edges:
+                item = self.path_edge_items.pop(key, None)
+                if item is not None:
+                    self.scene.removeItem(item)
+            for key in new_edges - self.path_edges:
+                self._add_path_edge(key)
+
         self.path_nodes = path
+        self.path_set = new_set
+        self.path_edges = new_edges
+
+    def _add_explored(self, nodes):
+        positions = self.graph_data['positions']
+        grid = self.node_grid
+        left, top, width, height = grid.left, grid.top, grid.cell_width, grid.cell_height
+        by_cell = {}
+        for node in nodes:
+            center = positions.get(node)
+            if center is not None:
+                cell = (int((center[0] - left) // width), int((center[1] - top) // height))
+                bucket = by_cell.get(cell)
+                if bucket is None:
+                    by_cell[cell] = [center]
+                else:
+                    bucket.append(center)
+        for cell, centers in by_cell.items():
+            item = self.explored_items.get(cell)
+            if item is None:
+                item = _ExploredBatchItem(grid.cell_rect(cell))
+                self.scene.addItem(item)
+                self.explored_items[cell] = item
+            item.add(centers)
+
+    def mark_explored(self, nodes):
+        """
+        Colore os nós expandidos pela busca em andamento.
+
+        Chamado a cada lote de progresso: apenas os itens das células que
+        receberam nós novos são alterados. Como a interface disputa o GIL
+        com a busca, no máximo MAX_EXPLORED_PER_FRAME nós são coloridos por
+        lote, uma amostra espaçada que mantém a forma da região explorada;
+        os demais ficam para flush_explored.
+        """
+        new_nodes = [node for node in dict.fromkeys(nodes) if node not in self.explored]
+        self.explored.update(new_nodes)
+        if not self.graph_data or self.node_grid is None:
+            return
+        if len(new_nodes) > MAX_EXPLORED_PER_FRAME:
+            step = -(-len(new_nodes) // MAX_EXPLORED_PER_FRAME)
+            self.explored_deferred.extend(new_nodes[k::step] for k in range(1, step))
+            new_nodes = new_nodes[::step]
+        self._add_explored(new_nodes)
+
+    def flush_explored(self):
+        """Colore, em etapas que não travam a interface, os nós adiados durante a busca"""
+        if self.explored_deferred:
+            self.explored_timer.start()
+
+    def process_deferred_explored(self):
+        start = time.perf_counter()
+        while self.explored_deferred and time.perf_counter() - start < BATCH_TIME_BUDGET:
+            self._add_explored(self.explored_deferred.pop())
+        if self.explored_deferred:
+            self.explored_timer.start()
+
+    def clear_explored(self):
+        """Remove a coloração dos nós expandidos"""
+        for item in self.explored_items.values():
+            self.scene.removeItem(item)
+        self.explored_items = {}
+        self.explored = set()
+        self.explored_deferred = []
+        self.explored_timer.stop()
+
+    def schedule_label_update(self):
         if self.graph_data:
-            self.draw_graph()
-            
+            self.label_timer.start()
+
+    def _visible_labels(self):
+        """Rótulos desejados para a área visível: {chave: (texto, x, y, centralizar)}"""
+        if self.view.transform().m11() < LABEL_MIN_SCALE:
+            return {}
+
+        positions = self.graph_data['positions']
+        rect = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        labels = {}
+
+        for node in self.node_grid.query(rect, NODE_RADIUS):
+            x, y = positions[node]
+            if rect.contains(x, y):
+                labels[('n', node)] = (str(node), x - 6, y - 6, False)
+                if len(labels) > MAX_LABELS:
+                    return {}
+
+        for i in self.edge_grid.query(rect):
+            node1, node2, cost = self.edge_list[i][0], self.edge_list[i][1], self.edge_list[i][2]
+            (x1, y1), (x2, y2) = positions[node1], positions[node2]
+            mid_x, mid_y = (x1 + x2) / 2, (y1 + y2) / 2
+            if not rect.contains(mid_x, mid_y):
+                continue
+
+            dx = x2 - x1
+            dy = y2 - y1
+            length = math.sqrt(dx*dx + dy*dy)
+
+            offset_dist = 20
+            if length > 0:
+                offset_x = -dy / length * offset_dist
+                offset_y = dx / length * offset_dist
+            else:
+                offset_x = offset_y = 0
+
+            labels[('e', i)] = (str(cost), mid_x + offset_x, mid_y + offset_y, True)
+            if len(labels) > MAX_LABELS:
+                break
+
+        return labels
+
+    def update_labels(self):
+        """Cria os rótulos que entraram na área visível e remove os que saíram"""
+        if not self.graph_data or self.node_grid is None:
+            return
+
+        wanted = self._visible_labels()
+        for key in [key for key in self.label_items if key not in wanted]:
+            self.scene.removeItem(self.label_items.pop(key))
+
+        node_font = QFont("Arial", 12, QFont.Bold)
+        cost_font = QFont("Arial", 10)
+        for key, (label, x, y, centered) in wanted.items():
+            if key in self.label_items:
+                continue
+            text = QGraphicsSimpleTextItem(label)
+            text.setFont(cost_font if centered else node_font)
+            if centered:
+                text_rect = text.boundingRect()
+                x -= text_rect.width() / 2
+                y -= text_rect.height() / 2
+            text.setPos(x, y)
+            text.setZValue(Z_LABELS)
+            self.scene.addItem(text)
+            self.label_items[key] = text
+
     def wheelEvent(self, event):
         """Implementa a funcionalidade de zoom com a roda do mouse"""
         zoom_factor = 1.15
@@ -169,10 +568,28 @@ class GraphViewer(QWidget):
             self.view.scale(zoom_factor, zoom_factor)
         else:
             self.view.scale(1.0 / zoom_factor, 1.0 / zoom_factor)
+        self.schedule_label_update()
         event.accept()
-            
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_label_update()
+
     def clear_graph(self):
         """Limpa o grafo"""
         self.scene.clear()
+        self.pending_batches = []
         self.graph_data = None
         self.path_nodes = []
+        self.path_set = set()
+        self.path_edges = set()
+        self.path_node_items = {}
+        self.path_edge_items = {}
+        self.explored = set()
+        self.explored_items = {}
+        self.explored_deferred = []
+        self.explored_timer.stop()
+        self.label_items = {}
+        self.node_grid = None
+        self.edge_grid = None
+        self.edge_list = []
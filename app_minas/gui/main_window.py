@@ -6,7 +6,7 @@ from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QComboBox, QTextEdit, QFrame, QSplitter, QScrollArea,
                              QSizePolicy)
 from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QFont, QPalette, QColor, QIntValidator
+from PyQt5.QtGui import QFont, QPalette, QColor, QIntValidator, QTextCursor
 from .graph_viewer import GraphViewer
 from .tree_viewer import TreeViewer
 
@@ -77,6 +77,7 @@ class MainWindow(QMainWindow):
         self.combo_metodo = QComboBox()
         self.combo_metodo.addItems([
             "Busca em Amplitude",
+            "Busca em Amplitude Vetorizada",
             "Busca em Profundidade",
             "Busca em Profundidade Limitada",
             "Busca por Aprofundamento Iterativo",
@@ -84,7 +85,11 @@ class MainWindow(QMainWindow):
             "Custo Uniforme",
             "Greedy",
             "A-estrela",
-            "AIA-estrela"
+            "AIA-estrela",
+            "SMA-estrela",
+            "Greedy em Feixe",
+            "A-estrela Ponderada em Feixe",
+            "Jump Point Search"
         ])
         layout.addWidget(self.combo_metodo)
 
@@ -113,12 +118,29 @@ class MainWindow(QMainWindow):
             }
         """)
         layout.addWidget(self.btn_executar)
+
+        # Estado da fila de buscas
+        self.label_fila = QLabel("Nenhuma busca em andamento")
+        self.label_fila.setWordWrap(True)
+        self.label_fila.setStyleSheet("color: #555; font-size: 11px;")
+        layout.addWidget(self.label_fila)
         
         # Área de texto para resultados
         self.text_resultado = QTextEdit()
         self.text_resultado.setMaximumHeight(200)
         self.text_resultado.setPlaceholderText("Os resultados da busca aparecerão aqui...")
+        self.text_resultado.setReadOnly(True)
         layout.addWidget(self.text_resultado)
+
+        # A ordem de visitação é exibida em páginas, carregadas ao rolar até o fim
+        self.visitacao = None  # Gerador das próximas páginas
+        self.proxima_pagina = None
+        self.paginas_exibidas = 0
+        self.btn_mais_visitacao = QPushButton("Carregar mais da ordem de visitação")
+        self.btn_mais_visitacao.setVisible(False)
+        self.btn_mais_visitacao.clicked.connect(self.load_more_visitation)
+        layout.addWidget(self.btn_mais_visitacao)
+        self.text_resultado.verticalScrollBar().valueChanged.connect(self.on_result_scrolled)
         
         # Espaçamento flexível
         layout.addStretch()
@@ -126,6 +148,14 @@ class MainWindow(QMainWindow):
     def toggle_limite_profundidade_input(self, index):
         metodo_selecionado = self.combo_metodo.itemText(index)
         if metodo_selecionado in ["Busca em Profundidade Limitada", "Busca por Aprofundamento Iterativo"]:
+            self.input_limite_profundidade.setPlaceholderText("Limite de Profundidade (opcional)")
+            self.input_limite_profundidade.setVisible(True)
+        elif metodo_selecionado == "SMA-estrela":
+            # O mesmo campo define o limite de memória do SMA*
+            self.input_limite_profundidade.setPlaceholderText("Limite de Memória em nós (opcional)")
+            self.input_limite_profundidade.setVisible(True)
+        elif metodo_selecionado in ["Greedy em Feixe", "A-estrela Ponderada em Feixe"]:
+            self.input_limite_profundidade.setPlaceholderText("Largura do Feixe (opcional)")
             self.input_limite_profundidade.setVisible(True)
         else:
             self.input_limite_profundidade.setVisible(False)
@@ -269,9 +299,50 @@ class MainWindow(QMainWindow):
             'limite_profundidade': self.input_limite_profundidade.text()
         }
         
-    def set_resultado(self, texto):
-        """Define o texto do resultado"""
-        self.text_resultado.setText(texto)
+    def set_resultado(self, texto, visitacao=None, total_visitados=0):
+        """
+        Define o texto do resultado.
+
+        visitacao é um iterável de blocos de texto da ordem de visitação (ver
+        paginar_visitacao); só o primeiro bloco é exibido de imediato e os
+        demais são carregados ao rolar até o fim ou pelo botão.
+        """
+        self.visitacao = None
+        self.proxima_pagina = None
+        self.paginas_exibidas = 0
+        self.text_resultado.setPlainText(texto)
+        if visitacao is not None:
+            self.visitacao = iter(visitacao)
+            self.proxima_pagina = next(self.visitacao, None)
+            self.btn_mais_visitacao.setToolTip(f"{total_visitados} nós visitados no total")
+            self.append_result_text("\nOrdem de visitação: ")
+            self.load_more_visitation()
+        self.btn_mais_visitacao.setVisible(self.proxima_pagina is not None)
+
+    def append_result_text(self, texto):
+        """Acrescenta texto ao fim do resultado sem mover a rolagem"""
+        cursor = QTextCursor(self.text_resultado.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(texto)
+
+    def load_more_visitation(self):
+        """Exibe a próxima página da ordem de visitação"""
+        if self.proxima_pagina is None:
+            return
+        self.append_result_text(' → ' + self.proxima_pagina if self.paginas_exibidas else self.proxima_pagina)
+        self.paginas_exibidas += 1
+        self.proxima_pagina = next(self.visitacao, None)
+        if self.proxima_pagina is None:
+            self.visitacao = None
+            self.btn_mais_visitacao.setVisible(False)
+
+    def on_result_scrolled(self, valor):
+        if self.proxima_pagina is not None and valor == self.text_resultado.verticalScrollBar().maximum():
+            self.load_more_visitation()
+        
+    def set_fila(self, texto):
+        """Define o texto do estado da fila de buscas"""
+        self.label_fila.setText(texto)
         
     def get_graph_viewer(self):
         """Retorna o widget de visualização do grafo"""
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Layout de árvore "tidy" (Reingold-Tilford com as melhorias de Walker e
+Buchheim et al.) em tempo linear e sem recursão.
+
+As subárvores são posicionadas de baixo para cima e empurradas apenas o
+necessário para não se sobreporem, comparando seus contornos (mantidos
+com threads); os deslocamentos acumulados (mod) são aplicados numa
+segunda passagem de cima para baixo. Ambas as passagens percorrem a
+ordem por níveis calculada uma única vez, o que permite árvores profundas
+(DFS) ou muito largas (BFS com 100k nós) sem estourar a pilha.
+"""
+
+
+def tidy_tree_layout(root, children=None, distance=1.0, key=id):
+    """
+    Calcula as posições dos nós de uma árvore.
+
+    Args:
+        root: Nó raiz
+        children: Função nó -> lista de filhos (padrão: node.filhos)
+        distance: Distância mínima entre nós vizinhos no mesmo nível
+        key: Função nó -> chave do resultado (padrão: id)
+
+    Returns:
+        Dicionário {key(no): (x, profundidade)}, com x em unidades de distance
+    """
+    if root is None:
+        return {}
+    if children is None:
+        children = lambda node: getattr(node, 'filhos', None) or []
+
+    # Ordem por níveis: todo filho tem índice maior que o do pai e os
+    # filhos de um mesmo pai têm índices consecutivos
+    nodes = [root]
+    parent = [-1]
+    number = [0]  # Posição entre os irmãos
+    depth = [0]
+    kids = []
+    i = 0
+    while i < len(nodes):
+        node_children = children(nodes[i])
+        first = len(nodes)
+        for k, child in enumerate(node_children):
+            nodes.append(child)
+            parent.append(i)
+            number.append(k)
+            depth.append(depth[i] + 1)
+        kids.append(range(first, len(nodes)))
+        i += 1
+
+    n = len(nodes)
+    prelim = [0.0] * n
+    mod = [0.0] * n
+    shift = [0.0] * n
+    change = [0.0] * n
+    thread = [-1] * n
+    ancestor = list(range(n))
+    midpoint = [0.0] * n
+
+    def left(v):
+        return kids[v][0] if kids[v] else thread[v]
+
+    def right(v):
+        return kids[v][-1] if kids[v] else thread[v]
+
+    def move_subtree(wl, wr, amount):
+        subtrees = number[wr] - number[wl]
+        change[wr] -= amount / subtrees
+        shift[wr] += amount
+        change[wl] += amount / subtrees
+        prelim[wr] += amount
+        mod[wr] += amount
+
+    def apportion(v, default_ancestor):
+        if number[v] == 0:
+            return default_ancestor
+        siblings = kids[parent[v]]
+        vir = vor = v
+        vil = siblings[number[v] - 1]
+        vol = siblings[0]
+        sir = sor = mod[vir]
+        sil = mod[vil]
+        sol = mod[vol]
+        while right(vil) >= 0 and left(vir) >= 0:
+            vil = right(vil)
+            vir = left(vir)
+            vol = left(vol)
+            vor = right(vor)
+            ancestor[vor] = v
+            amount = (prelim[vil] + sil) - (prelim[vir] + sir) + distance
+            if amount > 0:
+                a = ancestor[vil]
+                if parent[a] != parent[v]:
+                    a = default_ancestor
+                move_subtree(a, v, amount)
+                sir += amount
+                sor += amount
+            sil += mod[vil]
+            sir += mod[vir]
+            sol += mod[vol]
+            sor += mod[vor]
+        if right(vil) >= 0 and right(vor) < 0:
+            thread[vor] = right(vil)
+            mod[vor] += sil - sor
+        else:
+            if left(vir) >= 0 and left(vol) < 0:
+                thread[vol] = left(vir)
+                mod[vol] += sir - sol
+            default_ancestor = v
+        return default_ancestor
+
+    # Primeira passagem (ordem por níveis invertida: filhos antes dos pais).
+    # A parte do posicionamento de cada filho que depende do irmão à
+    # esquerda é feita pelo pai, percorrendo os filhos da esquerda para a direita.
+    for v in range(n - 1, -1, -1):
+        node_kids = kids[v]
+        if not node_kids:
+            continue
+        default_ancestor = node_kids[0]
+        for w in node_kids:
+            if number[w] == 0:
+                prelim[w] = midpoint[w]
+            elif kids[w]:
+                prelim[w] = prelim[w - 1] + distance
+                mod[w] = prelim[w] - midpoint[w]
+            else:
+                prelim[w] = prelim[w - 1] + distance
+            default_ancestor = apportion(w, default_ancestor)
+
+        # Aplica os deslocamentos acumulados nos filhos (da direita para a esquerda)
+        total_shift = total_change = 0.0
+        for w in reversed(node_kids):
+            prelim[w] += total_shift
+            mod[w] += total_shift
+            total_change += change[w]
+            total_shift += shift[w] + total_change
+
+        midpoint[v] = (prelim[node_kids[0]] + prelim[node_kids[-1]]) / 2
+    prelim[0] = midpoint[0]
+
+    # Segunda passagem (pais antes dos filhos): soma os mods dos ancestrais
+    x = [0.0] * n
+    accumulated = [0.0] * n
+    x[0] = prelim[0]
+    for v in range(1, n):
+        p = parent[v]
+        accumulated[v] = accumulated[p] + mod[p]
+        x[v] = prelim[v] + accumulated[v]
+
+    return {key(nodes[v]): (x[v], depth[v]) for v in range(n)}
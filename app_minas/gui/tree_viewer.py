@@ -1,188 +1,417 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from PyQt5.QtWidgets import (QWidget, QGraphicsView, QGraphicsScene, 
-                             QGraphicsEllipseItem, QGraphicsLineItem, 
+from PyQt5.QtWidgets import (QWidget, QGraphicsView, QGraphicsScene,
+                             QGraphicsEllipseItem, QGraphicsRectItem,
+                             QGraphicsPathItem, QGraphicsSimpleTextItem,
                              QGraphicsTextItem, QVBoxLayout)
-from PyQt5.QtCore import Qt, QRectF, QPointF
-from PyQt5.QtGui import QPen, QBrush, QColor, QFont, QPainter
+from PyQt5.QtCore import Qt, QRectF, QPointF, QTimer
+from PyQt5.QtGui import QPen, QBrush, QColor, QFont, QPainter, QPainterPath
+import time
+from core.compact_tree import CompactTree
+from .graph_viewer import SpatialGrid
+from .tree_layout import tidy_tree_layout
+
+NODE_RADIUS = 25
+CHILDREN_PER_PAGE = 25  # Filhos exibidos por vez em um nó expandido
+MAX_NODE_ITEMS = 3000  # Acima disso na área visível, apenas as conexões são desenhadas
+PROGRESS_INTERVAL = 200  # ms mínimos entre redesenhos da árvore durante a busca
+PROGRESS_DUTY = 0.02  # Fração máxima do tempo gasta redesenhando a árvore durante a busca
+
+
+class _MoreChildren:
+    """Marcador dos filhos ainda não exibidos de um nó expandido"""
+
+    def __init__(self, parent, remaining):
+        self.parent = parent  # Índice do nó na árvore compacta
+        self.remaining = remaining
+
+
+def _entry_key(entry):
+    """Chave de um item exibido: o índice do nó ou, para o marcador, -1 - índice do pai"""
+    return -1 - entry.parent if isinstance(entry, _MoreChildren) else entry
+
 
 class TreeViewer(QWidget):
+    """
+    Visualizador virtualizado da árvore de busca.
+
+    A árvore é exibida a partir de uma CompactTree (arrays de pais,
+    estados, custos e flags), sem percorrer objetos Node; os nós são
+    identificados pelo índice nos arrays. Inicialmente apenas o caminho da
+    raiz ao objetivo (a espinha) fica expandido, com até CHILDREN_PER_PAGE
+    filhos por nó; os demais nós aparecem recolhidos, com um contador de
+    descendentes, e são expandidos ou recolhidos com um clique. Filhos
+    excedentes ficam em um marcador "+N", que exibe a próxima página ao ser
+    clicado. O layout é calculado somente para a parte exibida e os itens
+    gráficos dos nós são criados apenas para a área visível da view.
+
+    Durante a busca, show_progress exibe o ramo da raiz até o último nó
+    expandido, copiado pela thread da busca. O intervalo entre redesenhos cresce com o custo de cada um,
+    para que a interface não dispute o GIL com a busca mais do que
+    PROGRESS_DUTY do tempo.
+    """
+
     def __init__(self):
         super().__init__()
         self.setup_ui()
-        self.tree_data = None
-        
+        self.tree = None  # CompactTree exibida
+        self.search_type = ""
+        self.expanded = set()  # Índices dos nós expandidos
+        self.pages = {}  # Índice do nó -> quantidade de filhos exibidos
+        self.spine = set()  # Índices dos nós do caminho até o objetivo
+        self.subtree_sizes = None
+        self.entries = {}  # Chave -> índice do nó ou _MoreChildren exibido
+        self.positions = {}
+        self.node_grid = None
+        self.node_items = {}  # Chave -> itens gráficos do item visível
+        self.progress_branch = None
+        self.progress_root = None
+        self.progress_pending = False
+
     def setup_ui(self):
         """Configura a interface do visualizador de árvore"""
         layout = QVBoxLayout(self)
-        
+
         # Cria a cena e a view
         self.scene = QGraphicsScene()
         self.view = QGraphicsView(self.scene)
         self.view.setRenderHint(QPainter.Antialiasing)
         self.view.setRenderHint(QPainter.TextAntialiasing)
-        self.view.setRenderHint(QPainter.SmoothPixmapTransform)
         self.view.setDragMode(QGraphicsView.ScrollHandDrag)
-        self.view.setViewportUpdateMode(QGraphicsView.BoundingRectViewportUpdate)
+        self.view.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
         self.view.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
         self.view.setResizeAnchor(QGraphicsView.AnchorUnderMouse)
-        
+
+        # Sobrescreve os eventos de zoom e clique
+        self.view.wheelEvent = self.wheelEvent
+        self.view.mousePressEvent = self.view_mouse_press
+
+        # Itens dos nós são recriados depois que o usuário para de mover/aproximar
+        self.items_timer = QTimer(self)
+        self.items_timer.setSingleShot(True)
+        self.items_timer.setInterval(40)
+        self.items_timer.timeout.connect(self.update_visible_items)
+        self.view.horizontalScrollBar().valueChanged.connect(self.schedule_items_update)
+        self.view.verticalScrollBar().valueChanged.connect(self.schedule_items_update)
+
+        # Redesenho da busca em andamento, agrupando os lotes de progresso
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setSingleShot(True)
+        self.progress_timer.setInterval(PROGRESS_INTERVAL)
+        self.progress_timer.timeout.connect(self.flush_progress)
+
         layout.addWidget(self.view)
-        
-    def set_tree(self, root_node, search_type=""):
+
+    def set_tree(self, tree, search_type="", path=None):
         """
         Define a árvore de busca a ser visualizada
-        
+
         Args:
-            root_node: Nó raiz da árvore de busca
+            tree: CompactTree (ou nó raiz de uma árvore de Node, convertida aqui)
             search_type: Tipo de busca realizada
+            path: Caminho encontrado (lista de estados), usado para localizar
+                  o objetivo quando os nós não estão marcados como objetivo
         """
-        self.tree_data = {
-            'root': root_node,
-            'search_type': search_type
-        }
-        self.draw_tree()
-        
-    def draw_tree(self):
-        """Desenha a árvore de busca na cena"""
-        if not self.tree_data or not self.tree_data['root']:
+        self.progress_timer.stop()
+        self.progress_branch = None
+        self.progress_root = None
+        self.progress_pending = False
+        if tree is not None and not isinstance(tree, CompactTree):
+            tree = CompactTree.de_arvore(tree)
+        self.show_tree(tree, search_type, path)
+        self.draw_tree(fit=True)
+
+    def show_tree(self, tree, search_type="", path=None, subtree_sizes=True):
+        """Prepara o estado de exibição da árvore (espinha expandida)"""
+        self.tree = tree if tree is not None and len(tree) else None
+        self.search_type = search_type
+        self.expanded = set()
+        self.pages = {}
+        self.spine = set()
+        self.subtree_sizes = None
+        if self.tree is None:
+            return
+
+        if subtree_sizes:
+            self.subtree_sizes = self.tree.tamanhos_subarvores()
+        goal = self.tree.encontrar_objetivo(path)
+        node = goal if goal is not None else self.tree.raiz
+        parents = self.tree.pais
+        while node >= 0:
+            self.spine.add(node)
+            self.expanded.add(node)
+            node = parents[node]
+
+    def show_progress(self, branch, depth, root=0):
+        """
+        Exibe a busca em andamento
+
+        Args:
+            branch: CompactTree com o ramo da raiz até o último nó expandido
+                    (CompactTree.de_ramo), nos índices 0 a depth
+            depth: Profundidade do último nó expandido
+            root: Número da raiz da busca; a view é reenquadrada quando muda
+        """
+        self.progress_branch = (branch, depth, root)
+        if self.progress_timer.isActive():
+            self.progress_pending = True
+        else:
+            self.draw_progress()
+
+    def flush_progress(self):
+        if self.progress_pending:
+            self.draw_progress()
+
+    def draw_progress(self):
+        """
+        Redesenha o ramo da raiz até o último nó expandido. A árvore ainda
+        cresce na thread da busca, então só esse ramo (com os filhos de cada
+        nó) é recebido, e os nós recolhidos ficam sem contador.
+        """
+        self.progress_pending = False
+        if self.progress_branch is None:
             return
-            
+
+        start = time.perf_counter()
+        tree, depth, root = self.progress_branch
+        fit = self.progress_root != root
+        self.progress_root = root
+        self.show_tree(tree, subtree_sizes=False)
+        # A espinha vai até o último nó expandido (índices 0 a profundidade), não até um objetivo
+        self.spine = set(range(depth + 1))
+        self.expanded = set(self.spine)
+        self.draw_tree(fit=fit)
+        elapsed = time.perf_counter() - start
+        self.progress_timer.start(max(PROGRESS_INTERVAL, int(1000 * elapsed / PROGRESS_DUTY)))
+
+    def visible_children(self, entry):
+        """Filhos exibidos de um nó (com o marcador dos excedentes)"""
+        if isinstance(entry, _MoreChildren) or entry not in self.expanded:
+            return []
+        children = self.tree.filhos(entry)
+        shown = self.pages.get(entry, CHILDREN_PER_PAGE)
+        if len(children) <= shown:
+            return list(children)
+
+        visible = list(children[:shown])
+        # O filho da espinha é sempre exibido
+        for child in children[shown:]:
+            if child in self.spine:
+                visible.append(child)
+                break
+        visible.append(_MoreChildren(entry, len(children) - len(visible)))
+        return visible
+
+    def draw_tree(self, fit=False):
+        """Desenha a parte exibida da árvore de busca na cena"""
+        if self.tree is None:
+            return
+
         self.scene.clear()
-        
-        # Calcular posições dos nós na árvore
-        positions = self.calculate_tree_positions(self.tree_data['root'])
-        
-        if not positions:
+        self.node_items = {}
+
+        # Layout apenas da parte exibida
+        self.entries = {}
+        children_of = {}
+
+        def children(entry):
+            visible = self.visible_children(entry)
+            key = _entry_key(entry)
+            self.entries[key] = entry
+            children_of[key] = visible
+            return visible
+
+        layout = tidy_tree_layout(self.tree.raiz, children, key=_entry_key)
+        if not layout:
             return
-            
-        # Desenhar conexões primeiro
-        self.draw_tree_connections(self.tree_data['root'], positions)
-        
-        # Desenhar nós
-        self.draw_tree_nodes(self.tree_data['root'], positions)
-        
-        # Ajustar a view
-        self.view.fitInView(self.scene.itemsBoundingRect(), Qt.KeepAspectRatio)
-        
-    def calculate_tree_positions(self, root):
-        """Calcula as posições dos nós na árvore usando layout hierárquico"""
-        positions = {}
-        
-        # Primeira passagem: calcular largura de cada subárvore
-        def calculate_subtree_width(node):
-            if not hasattr(node, 'filhos') or not node.filhos:
-                return 1
-            return max(1, sum(calculate_subtree_width(child) for child in node.filhos))
-        
-        # Segunda passagem: atribuir posições
-        def assign_positions(node, x, y, available_width):
-            positions[id(node)] = (x, y)
-            
-            if hasattr(node, 'filhos') and node.filhos:
-                num_children = len(node.filhos)
-                child_spacing = available_width / max(1, num_children)
-                start_x = x - available_width/2 + child_spacing/2
-                
-                for i, child in enumerate(node.filhos):
-                    child_x = start_x + i * child_spacing
-                    child_width = calculate_subtree_width(child) * 60
-                    assign_positions(child, child_x, y + 80, child_width)
-        
-        # Calcular largura total da árvore
-        total_width = calculate_subtree_width(root) * 80
-        
-        # Atribuir posições começando da raiz
-        assign_positions(root, 0, 0, total_width)
-        
-        return positions
-        
-    def draw_tree_nodes(self, root, positions):
-        """Desenha os nós da árvore"""
-        def draw_node_recursive(node):
-            if id(node) not in positions:
-                return
-                
-            x, y = positions[id(node)]
-            
-            # Desenhar nó
-            radius = 25
-            circle = QGraphicsEllipseItem(x - radius, y - radius, 2 * radius, 2 * radius)
-            
-            # Cor baseada no estado do nó
-            if hasattr(node, 'objetivo') and node.objetivo:
-                brush = QBrush(QColor(100, 255, 100))  # Verde para objetivo
-                pen = QPen(QColor(0, 150, 0), 3)
-            elif hasattr(node, 'expandido') and node.expandido:
-                brush = QBrush(QColor(255, 200, 100))  # Laranja para expandido
-                pen = QPen(QColor(200, 100, 0), 2)
-            else:
-                brush = QBrush(QColor(200, 200, 255))  # Azul para não expandido
-                pen = QPen(QColor(0, 0, 150), 2)
-                
-            circle.setBrush(brush)
-            circle.setPen(pen)
-            self.scene.addItem(circle)
-            
-            # Rótulo do nó
-            label = str(node.estado) if hasattr(node, 'estado') else "?"
-            text = QGraphicsTextItem(label)
-            text.setFont(QFont("Arial", 10, QFont.Bold))
-            
-            # Centralizar o texto
+        self.positions = {key: (x * 60, depth * 80) for key, (x, depth) in layout.items()}
+
+        # Conexões: um único caminho para as comuns e outro para a espinha
+        connections = QPainterPath()
+        spine_connections = QPainterPath()
+        for key, visible in children_of.items():
+            x1, y1 = self.positions[key]
+            for child in visible:
+                child_key = _entry_key(child)
+                target = spine_connections if child_key in self.spine else connections
+                target.moveTo(x1, y1)
+                target.lineTo(*self.positions[child_key])
+        item = QGraphicsPathItem(connections)
+        item.setPen(QPen(QColor(100, 100, 100), 2))
+        self.scene.addItem(item)
+        item = QGraphicsPathItem(spine_connections)
+        item.setPen(QPen(QColor(0, 150, 0), 4))
+        self.scene.addItem(item)
+
+        xs = [x for x, _ in self.positions.values()]
+        ys = [y for _, y in self.positions.values()]
+        bounds = QRectF(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+        self.node_grid = SpatialGrid(bounds, len(self.positions), 200)
+        for key, (x, y) in self.positions.items():
+            self.node_grid.insert(x, y, key)
+
+        rect = bounds.adjusted(-2 * NODE_RADIUS, -2 * NODE_RADIUS, 2 * NODE_RADIUS, 2 * NODE_RADIUS)
+        self.scene.setSceneRect(rect)
+        if fit:
+            # Ajustar a view
+            self.view.fitInView(rect, Qt.KeepAspectRatio)
+        self.update_visible_items()
+
+    def schedule_items_update(self):
+        if self.tree is not None:
+            self.items_timer.start()
+
+    def update_visible_items(self):
+        """Cria os itens dos nós que entraram na área visível e remove os que saíram"""
+        if self.tree is None or self.node_grid is None:
+            return
+
+        rect = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        wanted = set()
+        for key in self.node_grid.query(rect, NODE_RADIUS):
+            wanted.add(key)
+            if len(wanted) > MAX_NODE_ITEMS:
+                wanted = set()
+                break
+
+        for key in [key for key in self.node_items if key not in wanted]:
+            for item in self.node_items.pop(key):
+                self.scene.removeItem(item)
+        for key in wanted:
+            if key not in self.node_items:
+                self.node_items[key] = self.draw_entry(self.entries[key], key, *self.positions[key])
+
+    def draw_entry(self, entry, key, x, y):
+        """Desenha um nó (ou marcador de filhos excedentes) e retorna seus itens"""
+        if isinstance(entry, _MoreChildren):
+            box = QGraphicsRectItem(x - NODE_RADIUS, y - NODE_RADIUS / 2, 2 * NODE_RADIUS, NODE_RADIUS)
+            box.setBrush(QBrush(QColor(235, 235, 235)))
+            box.setPen(QPen(QColor(120, 120, 120), 1, Qt.DashLine))
+            box.setData(0, key)
+            text = QGraphicsSimpleTextItem(f"+{entry.remaining}")
+            text.setFont(QFont("Arial", 9))
             text_rect = text.boundingRect()
-            text.setPos(x - text_rect.width()/2, y - text_rect.height()/2)
+            text.setPos(x - text_rect.width() / 2, y - text_rect.height() / 2)
+            text.setData(0, key)
+            self.scene.addItem(box)
             self.scene.addItem(text)
-            
-            # Desenhar filhos recursivamente
-            if hasattr(node, 'filhos'):
-                for child in node.filhos:
-                    draw_node_recursive(child)
-                    
-        draw_node_recursive(root)
-        
-    def draw_tree_connections(self, root, positions):
-        """Desenha as conexões entre os nós da árvore"""
-        def draw_connections_recursive(node):
-            if id(node) not in positions:
+            return [box, text]
+
+        tree = self.tree
+        circle = QGraphicsEllipseItem(x - NODE_RADIUS, y - NODE_RADIUS, 2 * NODE_RADIUS, 2 * NODE_RADIUS)
+
+        # Cor baseada no estado do nó
+        if tree.objetivo(entry):
+            brush = QBrush(QColor(100, 255, 100))  # Verde para objetivo
+            pen = QPen(QColor(0, 150, 0), 3)
+        elif tree.expandido(entry):
+            brush = QBrush(QColor(255, 200, 100))  # Laranja para expandido
+            pen = QPen(QColor(200, 100, 0), 2)
+        else:
+            brush = QBrush(QColor(200, 200, 255))  # Azul para não expandido
+            pen = QPen(QColor(0, 0, 150), 2)
+
+        circle.setBrush(brush)
+        circle.setPen(pen)
+        circle.setData(0, key)
+        self.scene.addItem(circle)
+        items = [circle]
+
+        # Rótulo do nó
+        text = QGraphicsSimpleTextItem(str(tree.estados[entry]))
+        text.setFont(QFont("Arial", 10, QFont.Bold))
+        text_rect = text.boundingRect()
+        text.setPos(x - text_rect.width()/2, y - text_rect.height()/2)
+        text.setData(0, key)
+        self.scene.addItem(text)
+        items.append(text)
+
+        # Contador de descendentes ocultos de um nó recolhido
+        if self.subtree_sizes is not None and entry not in self.expanded and tree.num_filhos(entry):
+            badge = QGraphicsSimpleTextItem(f"+{self.subtree_sizes[entry] - 1}")
+            badge.setFont(QFont("Arial", 8))
+            badge.setBrush(QBrush(QColor(90, 90, 90)))
+            badge_rect = badge.boundingRect()
+            badge.setPos(x - badge_rect.width() / 2, y + NODE_RADIUS + 2)
+            badge.setData(0, key)
+            self.scene.addItem(badge)
+            items.append(badge)
+
+        return items
+
+    def toggle_entry(self, key):
+        """Expande/recolhe um nó ou exibe a próxima página de filhos"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return
+        if isinstance(entry, _MoreChildren):
+            anchor_key = entry.parent
+            self.pages[anchor_key] = self.pages.get(anchor_key, CHILDREN_PER_PAGE) + CHILDREN_PER_PAGE
+        elif key in self.expanded:
+            anchor_key = key
+            self.expanded.discard(key)
+        elif self.tree.num_filhos(entry):
+            anchor_key = key
+            self.expanded.add(key)
+        else:
+            return
+
+        # Mantém o nó clicado no mesmo ponto da tela
+        old_position = self.positions.get(anchor_key)
+        anchor = self.view.mapFromScene(QPointF(*old_position)) if old_position else None
+        self.draw_tree()
+        new_position = self.positions.get(anchor_key)
+        if anchor is not None and new_position is not None:
+            delta = self.view.mapToScene(anchor) - QPointF(*new_position)
+            center = self.view.mapToScene(self.view.viewport().rect().center())
+            self.view.centerOn(center - delta)
+
+    def view_mouse_press(self, event):
+        """Clique em um nó ou marcador alterna sua expansão"""
+        if event.button() == Qt.LeftButton:
+            item = self.view.itemAt(event.pos())
+            if item is not None and item.data(0) is not None:
+                self.toggle_entry(item.data(0))
+                event.accept()
                 return
-                
-            x1, y1 = positions[id(node)]
-            
-            if hasattr(node, 'filhos'):
-                for child in node.filhos:
-                    if id(child) in positions:
-                        x2, y2 = positions[id(child)]
-                        
-                        # Linha de conexão
-                        line = QGraphicsLineItem(x1, y1, x2, y2)
-                        line.setPen(QPen(QColor(100, 100, 100), 2))
-                        self.scene.addItem(line)
-                        
-                        # Continuar recursivamente
-                        draw_connections_recursive(child)
-                        
-        draw_connections_recursive(root)
-        
+        QGraphicsView.mousePressEvent(self.view, event)
+
     def wheelEvent(self, event):
         """Implementa a funcionalidade de zoom com a roda do mouse"""
         zoom_factor = 1.15 # Fator de zoom
-        
+
         if event.angleDelta().y() > 0:
             # Zoom in
             self.view.scale(zoom_factor, zoom_factor)
         else:
             # Zoom out
             self.view.scale(1.0 / zoom_factor, 1.0 / zoom_factor)
-            
+
+        self.schedule_items_update()
         event.accept()
-        
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_items_update()
+
     def clear_tree(self):
         """Limpa a árvore"""
+        self.progress_timer.stop()
+        self.progress_branch = None
+        self.progress_root = None
+        self.progress_pending = False
         self.scene.clear()
-        self.tree_data = None
-        
+        self.tree = None
+        self.expanded = set()
+        self.pages = {}
+        self.spine = set()
+        self.subtree_sizes = None
+        self.entries = {}
+        self.positions = {}
+        self.node_grid = None
+        self.node_items = {}
+
     def set_search_info(self, info_text):
         """Adiciona informações sobre a busca"""
         # Adicionar texto informativo na parte superior
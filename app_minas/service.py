@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Serviço local de rotas (HTTP/JSON sobre asyncio) com os grafos residentes em memória
+
+Exemplo:
+    python service.py --grafo mina=data/exemplo_grafo.txt --porta 8765
+
+Rotas:
+    GET  /grafos     Grafos carregados
+    GET  /metricas   Histogramas de latência por rota (caminhos desconhecidos
+                     somam em "outros")
+    POST /rota       {"grafo": "mina", "origem": 1, "destino": 10,
+                      "algoritmo": "a-estrela", "limite": null}
+    POST /lote       {"grafo": "mina", "algoritmo": "ucs",
+                      "consultas": [[1, 10], [3, 9, 4]]}
+
+O serviço escuta apenas em 127.0.0.1. As buscas rodam num pool de
+threads (ou de processos, com --processos) e no máximo
+--max-concorrentes buscas ficam em execução ao mesmo tempo.
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.graph_model import Graph
+from core.grid_graph import GridGraph
+from core.runner import resolver_algoritmo, executar_consulta
+from core.shared_graph import SharedGraph, SharedGraphView
+
+HOST = '127.0.0.1'
+TAMANHO_MAXIMO_CORPO = 10 * 1024 * 1024
+
+MENSAGENS_HTTP = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error'
+}
+
+ROTAS = ('/grafos', '/metricas', '/rota', '/lote')
+ROTA_OUTROS = 'outros'  # Métricas de caminhos desconhecidos ficam numa única chave
+
+# Grafos de cada processo de trabalho (modo --processos)
+_grafos_worker = {}
+
+
+def carregar_grafos(arquivos):
+    """Carrega {nome: caminho_arquivo} e retorna {nome: (grafo, conjunto_de_nos)}"""
+    grafos = {}
+    for nome, caminho_arquivo in arquivos.items():
+        grafo = GridGraph() if GridGraph.e_arquivo_grade(caminho_arquivo) else Graph()
+        if not grafo.carregar_de_arquivo(caminho_arquivo):
+            raise ValueError(f"Erro ao carregar o grafo '{nome}': {caminho_arquivo}")
+        # A grade já testa pertinência em O(1) sem materializar os nós
+        grafos[nome] = (grafo, grafo.nos if isinstance(grafo, GridGraph) else set(grafo.nos))
+    return grafos
+
+
+def _inicializar_worker(nomes_memoria, grades=None):
+    """
+    Anexa os grafos exportados pelo processo principal ({nome: bloco}); as
+    grades de ocupação ({nome: GridGraph}) chegam inteiras
+    """
+    for nome, grade in (grades or {}).items():
+        _grafos_worker[nome] = (grade, grade.nos)
+    for nome, nome_memoria in nomes_memoria.items():
+        visao = SharedGraphView.anexar(nome_memoria)
+        _grafos_worker[nome] = (visao, visao.nos)
+
+
+def _executar_no_worker(nome, algoritmo, consulta, limite_padrao):
+    grafo, nos = _grafos_worker[nome]
+    return executar_consulta(grafo, nos, algoritmo, consulta, limite_padrao)
+
+
+class HistogramaLatencia:
+    """Histograma de latências com faixas fixas em milissegundos"""
+
+    FAIXAS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+    def __init__(self):
+        self.contagens = [0] * (len(self.FAIXAS_MS) + 1)
+        self.total = 0
+        self.soma_ms = 0.0
+        self.maximo_ms = 0.0
+
+    def registrar(self, latencia_ms):
+        self.contagens[bisect.bisect_left(self.FAIXAS_MS, latencia_ms)] += 1
+        self.total += 1
+        self.soma_ms += latencia_ms
+        self.maximo_ms = max(self.maximo_ms, latencia_ms)
+
+    def percentil(self, p):
+        """Limite superior da faixa que contém o percentil p (0-100)"""
+        if self.total == 0:
+            return 0.0
+        alvo = self.total * p / 100.0
+        acumulado = 0
+        for i, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if acumulado >= alvo:
+                return float(self.FAIXAS_MS[i]) if i < len(self.FAIXAS_MS) else self.maximo_ms
+        return self.maximo_ms
+
+    def como_dict(self):
+        faixas = [f"<={limite}ms" for limite in self.FAIXAS_MS] + [f">{self.FAIXAS_MS[-1]}ms"]
+        return {
+            'total': self.total,
+            'media_ms': round(self.soma_ms / self.total, 3) if self.total else 0.0,
+            'maximo_ms': round(self.maximo_ms, 3),
+            'p50_ms': self.percentil(50),
+            'p90_ms': self.percentil(90),
+            'p99_ms': self.percentil(99),
+            'faixas': dict(zip(faixas, self.contagens))
+        }
+
+
+class ErroRequisicao(Exception):
+    """Erro que deve ser devolvido ao cliente com o status indicado"""
+
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+        self.mensagem = mensagem
+
+
+class RoutingService:
+    """Serviço de rotas com grafos carregados uma única vez"""
+
+    def __init__(self, arquivos, workers=4, max_concorrentes=8, processos=False, limite_padrao=None):
+        self.arquivos = dict(arquivos)
+        self.grafos = carregar_grafos(self.arquivos)
+        self.limite_padrao = limite_padrao
+        self.processos = processos
+        self.compartilhados = {}
+        if processos:
+            # Uma única cópia de cada grafo em memória compartilhada para todos os processos
+            # (grades de ocupação são pequenas e vão inteiras para cada processo)
+            self.compartilhados = {nome: SharedGraph.exportar(grafo)
+                                   for nome, (grafo, _) in self.grafos.items()
+                                   if not isinstance(grafo, GridGraph)}
+            grades = {nome: grafo for nome, (grafo, _) in self.grafos.items()
+                      if isinstance(grafo, GridGraph)}
+            nomes_memoria = {nome: c.nome for nome, c in self.compartilhados.items()}
+            self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_worker,
+                                                initargs=(nomes_memoria, grades))
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.max_concorrentes = max_concorrentes
+        self.semaforo = None
+        self.metricas = {}
+        self.servidor = None
+
+    def _histograma(self, rota):
+        if rota not in self.metricas:
+            self.metricas[rota] = HistogramaLatencia()
+        return self.metricas[rota]
+
+    # -----------------------------------------------------------------------------
+    # EXECUÇÃO DAS BUSCAS
+    # -----------------------------------------------------------------------------
+    async def _executar(self, nome, algoritmo, consulta):
+        """Executa uma consulta no pool respeitando o limite de concorrência"""
+        loop = asyncio.get_running_loop()
+        async with self.semaforo:
+            inicio = time.perf_counter()
+            if self.processos:
+                registro = await loop.run_in_executor(
+                    self.executor, _executar_no_worker, nome, algoritmo, consulta, self.limite_padrao
+                )
+            else:
+                grafo, nos = self.grafos[nome]
+                registro = await loop.run_in_executor(
+                    self.executor, executar_consulta, grafo, nos, algoritmo, consulta, self.limite_padrao
+                )
+            self._histograma('busca').registrar((time.perf_counter() - inicio) * 1000)
+        return registro
+
+    def _validar_pedido(self, pedido):
+        if not isinstance(pedido, dict):
+            raise ErroRequisicao(400, "O corpo deve ser um objeto JSON")
+
+        nome = pedido.get('grafo')
+        if nome is None and len(self.grafos) == 1:
+            nome = next(iter(self.grafos))
+        if not isinstance(nome, str):
+            raise ErroRequisicao(400, "'grafo' deve ser o nome de um grafo carregado")
+        if nome not in self.grafos:
+            raise ErroRequisicao(404, f"Grafo desconhecido: {nome}")
+
+        try:
+            algoritmo = resolver_algoritmo(str(pedido.get('algoritmo', 'a-estrela')))
+        except ValueError as e:
+            raise ErroRequisicao(400, str(e))
+        return nome, algoritmo
+
+    async def rota(self, pedido):
+        nome, algoritmo = self._validar_pedido(pedido)
+        consulta = (1, pedido.get('origem'), pedido.get('destino'), pedido.get('limite'))
+        return await self._executar(nome, algoritmo, consulta)
+
+    async def lote(self, pedido):
+        nome, algoritmo = self._validar_pedido(pedido)
+        consultas = pedido.get('consultas')
+        if not isinstance(consultas, list):
+            raise ErroRequisicao(400, "'consultas' deve ser uma lista de [origem, destino, limite?]")
+
+        tarefas = []
+        for numero, item in enumerate(consultas, start=1):
+            if not isinstance(item, (list, tuple)) or len(item) < 2:
+                item = (item, None)
+            limite = item[2] if len(item) > 2 else None
+            tarefas.append(self._executar(nome, algoritmo, (numero, item[0], item[1], limite)))
+
+        return {'grafo': nome, 'algoritmo': algoritmo, 'resultados': await asyncio.gather(*tarefas)}
+
+    def listar_grafos(self):
+        return {
+            nome: {
+                'arquivo': self.arquivos[nome],
+                'nos': len(grafo.nos),
+                'arestas': grafo.contar_arestas() if isinstance(grafo, GridGraph)
+                           else sum(len(adj) for adj in grafo.arestas.values()) // 2
+            }
+            for nome, (grafo, _) in self.grafos.items()
+        }
+
+    def obter_metricas(self):
+        return {rota: histograma.como_dict() for rota, histograma in self.metricas.items()}
+
+    # -----------------------------------------------------------------------------
+    # HTTP
+    # -----------------------------------------------------------------------------
+    async def _despachar(self, metodo, caminho, corpo):
+        rotas_get = {'/grafos': self.listar_grafos, '/metricas': self.obter_metricas}
+        rotas_post = {'/rota': self.rota, '/lote': self.lote}
+
+        if caminho in rotas_get:
+            if metodo != 'GET':
+                raise ErroRequisicao(405, "Use GET")
+            return rotas_get[caminho]()
+
+        if caminho in rotas_post:
+            if metodo != 'POST':
+                raise ErroRequisicao(405, "Use POST")
+            try:
+                pedido = json.loads(corpo.decode('utf-8') or '{}')
+            except (UnicodeDecodeError, ValueError):
+                raise ErroRequisicao(400, "JSON inválido")
+            return await rotas_post[caminho](pedido)
+
+        raise ErroRequisicao(404, f"Rota desconhecida: {caminho}")
+
+    async def _ler_requisicao(self, reader):
+        """Lê uma requisição HTTP/1.1; retorna None se a conexão foi encerrada"""
+        linha = await reader.readline()
+        if not linha:
+            return None
+        partes = linha.decode('latin-1').split()
+        if len(partes) < 2:
+            raise ErroRequisicao(400, "Linha de requisição inválida")
+        metodo, alvo = partes[0].upper(), partes[1]
+        versao = partes[2] if len(partes) > 2 else 'HTTP/1.0'
+
+        cabecalhos = {}
+        while True:
+            linha = await reader.readline()
+            if linha in (b'\r\n', b'\n', b''):
+                break
+            chave, _, valor = linha.decode('latin-1').partition(':')
+            cabecalhos[chave.strip().lower()] = valor.strip()
+
+        try:
+            tamanho = int(cabecalhos.get('content-length', 0))
+        except ValueError:
+            raise ErroRequisicao(400, "Content-Length inválido")
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            raise ErroRequisicao(413, "Corpo da requisição muito grande")
+        corpo = await reader.readexactly(tamanho) if tamanho else b''
+
+        conexao = cabecalhos.get('connection', '').lower()
+        manter = conexao == 'keep-alive' if versao == 'HTTP/1.0' else conexao != 'close'
+        return metodo, alvo.split('?', 1)[0], corpo, manter
+
+    async def _tratar_conexao(self, reader, writer):
+        try:
+            while True:
+                manter = False
+                inicio = time.perf_counter()
+                caminho = None
+                try:
+                    requisicao = await self._ler_requisicao(reader)
+                    if requisicao is None:
+                        break
+                    metodo, caminho, corpo, manter = requisicao
+                    status, resposta = 200, await self._despachar(metodo, caminho, corpo)
+                except ErroRequisicao as e:
+                    status, resposta = e.status, {'erro': e.mensagem}
+                except asyncio.IncompleteReadError:
+                    break
+                except Exception as e:
+                    status, resposta = 500, {'erro': f"Erro interno: {e}"}
+
+                dados = json.dumps(resposta, ensure_ascii=False).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status} {MENSAGENS_HTTP.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(dados)}\r\n"
+                    f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n".encode('latin-1') + dados
+                )
+                await writer.drain()
+
+                if caminho is not None:
+                    # Só as rotas conhecidas têm histograma próprio; o cliente não cria chaves
+                    rota = caminho if caminho in ROTAS else ROTA_OUTROS
+                    self._histograma(rota).registrar((time.perf_counter() - inicio) * 1000)
+                if not manter:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def iniciar(self, porta=8765):
+        """Inicia o servidor HTTP em 127.0.0.1"""
+        self.semaforo = asyncio.Semaphore(self.max_concorrentes)
+        self.servidor = await asyncio.start_server(self._tratar_conexao, HOST, porta)
+        return self.servidor
+
+    async def servir(self, porta=8765):
+        servidor = await self.iniciar(porta)
+        endereco = servidor.sockets[0].getsockname()
+        print(f"Serviço de rotas em http://{endereco[0]}:{endereco[1]} "
+              f"(grafos: {', '.join(self.grafos)})", flush=True)
+        async with servidor:
+            await servidor.serve_forever()
+
+    def encerrar(self):
+        if self.servidor is not None:
+            self.servidor.close()
+        self.executor.shutdown(wait=False)
+        for compartilhado in self.compartilhados.values():
+            compartilhado.fechar()
+        self.compartilhados = {}
+
+
+def _parse_grafo(valor):
+    nome, separador, caminho_arquivo = valor.partition('=')
+    if not separador:
+        nome, caminho_arquivo = os.path.splitext(os.path.basename(valor))[0], valor
+    return nome, caminho_arquivo
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Serviço local de rotas para grafos de túneis de mineração")
+    parser.add_argument('-g', '--grafo', action='append', type=_parse_grafo, required=True,
+                        help="Grafo a carregar, como nome=arquivo (pode ser repetido)")
+    parser.add_argument('-p', '--porta', type=int, default=8765, help="Porta em 127.0.0.1 (padrão: 8765)")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 2,
+                        help="Tamanho do pool de execução (padrão: número de CPUs)")
+    parser.add_argument('-m', '--max-concorrentes', type=int, default=None,
+                        help="Máximo de buscas simultâneas (padrão: 2 x workers)")
+    parser.add_argument('--processos', action='store_true',
+                        help="Usa um pool de processos em vez de threads")
+    parser.add_argument('-l', '--limite', type=int, default=None,
+                        help="Limite de profundidade padrão para DLS/IDDFS")
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    try:
+        servico = RoutingService(
+            dict(args.grafo),
+            workers=args.workers,
+            max_concorrentes=args.max_concorrentes or 2 * args.workers,
+            processos=args.processos,
+            limite_padrao=args.limite
+        )
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    try:
+        asyncio.run(servico.servir(args.porta))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servico.encerrar()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Verificações automáticas dos algoritmos de busca (asserts)
+
+Podem ser executadas com pytest ou diretamente: python test_buscas.py
+"""
+
+import sys
+import io
+import os
+import pickle
+import random
+import struct
+import tempfile
+from collections import deque
+
+try:
+    import numpy
+except ImportError:  # NumPy é opcional; as verificações vetorizadas são puladas
+    numpy = None
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.compact_tree import CompactTree
+from core.constrained_path import MAXIMO, SOMA, caminho_restrito
+from core.exit_partition import ExitPartition
+from core.graph_model import Graph
+from core.grid_graph import GridGraph
+from core.hierarchical import HierarchicalRouter, agrupar_por_grade
+from core.k_shortest import KShortestPaths, k_menores_caminhos
+from core.multi_source_bfs import (INALCANCAVEL, MatrizDistancias, bfs_multiplas_origens,
+                                   escrever_matriz_distancias)
+from core.search_algorithms import SearchAlgorithms
+from core.search_algorithms_p import SearchAlgorithmsP
+from core.utils import escrever_resultado, formatar_resultado, formatar_resumo, paginar_visitacao
+from gui.tree_layout import tidy_tree_layout
+
+DIRETORIO_DADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def grafo_aleatorio(num_nos, semente, arestas_por_no=2, vizinhanca=20):
+    """Grafo conexo ponderado com arestas entre nós de ids próximos"""
+    gerador = random.Random(semente)
+    grafo = Graph()
+    for no in range(1, num_nos + 1):
+        grafo.adicionar_no(no)
+    for no in range(2, num_nos + 1):
+        for _ in range(arestas_por_no):
+            grafo.adicionar_aresta(no, gerador.randint(max(1, no - vizinhanca), no - 1),
+                                   gerador.randint(1, 9))
+    return grafo
+
+
+def grade_aleatoria(lado, semente, densidade=0.25, diagonais=True):
+    """Grade lado x lado com obstáculos aleatórios (cantos sempre livres)"""
+    gerador = random.Random(semente)
+    cantos = ((0, 0), (lado - 1, lado - 1))
+    linhas = [''.join('#' if gerador.random() < densidade and (x, y) not in cantos else '.'
+                      for x in range(lado))
+              for y in range(lado)]
+    return GridGraph.de_linhas(linhas, diagonais)
+
+
+def grafo_exemplo_ponderado():
+    grafo = Graph()
+    grafo.carregar_de_arquivo(os.path.join(DIRETORIO_DADOS, 'exemplo_ponderado.txt'))
+    return grafo
+
+
+def distancias_em_saltos(grafo, origem):
+    """Distâncias em saltos por uma BFS simples (referência)"""
+    distancias = {origem: 0}
+    fila = deque([origem])
+    while fila:
+        atual = fila.popleft()
+        for vizinho, _ in grafo.obter_vizinhos(atual):
+            if vizinho not in distancias:
+                distancias[vizinho] = distancias[atual] + 1
+                fila.append(vizinho)
+    return distancias
+
+
+def custo_do_caminho(grafo, caminho):
+    """Soma dos custos das arestas do caminho (falha se alguma não existir)"""
+    custo = 0
+    for origem, destino in zip(caminho, caminho[1:]):
+        custos = [c for vizinho, c in grafo.obter_vizinhos(origem) if vizinho == destino]
+        assert custos, (origem, destino)
+        custo += min(custos)
+    return custo
+
+
+def caminhos_simples(grafo, inicio, fim):
+    """Todos os caminhos sem ciclos de inicio a fim com seus custos (força bruta)"""
+    resultado = {}
+
+    def visitar(caminho):
+        if caminho[-1] == fim:
+            resultado[tuple(caminho)] = custo_do_caminho(grafo, caminho)
+            return
+        for vizinho, _ in grafo.obter_vizinhos(caminho[-1]):
+            if vizinho not in caminho:
+                caminho.append(vizinho)
+                visitar(caminho)
+                caminho.pop()
+
+    visitar([inicio])
+    return resultado
+
+
+def testar_amplitude_vetorizada_igual_a_amplitude():
+    if numpy is None:
+        return
+    casos = [(grafo_exemplo_ponderado(), 1, 10)]
+    for semente in range(4):
+        casos.append((grafo_aleatorio(150, semente), 1, 147))
+    for semente in (0, 2):
+        casos.append((grade_aleatoria(30, semente), 1, 900))
+    # Objetivo inalcançável: nó isolado
+    isolado = grafo_aleatorio(50, 0)
+    isolado.adicionar_no(51)
+    casos.append((isolado, 1, 51))
+
+    for grafo, origem, destino in casos:
+        esperado = SearchAlgorithms()
+        caminho_esperado, _ = esperado.busca_amplitude(grafo, origem, destino)
+        for csr in (None, grafo.para_csr()):
+            busca = SearchAlgorithms()
+            caminho, _ = busca.busca_amplitude_vetorizada(grafo, origem, destino, csr=csr)
+            assert caminho == caminho_esperado
+            assert busca.nos_visitados == esperado.nos_visitados
+
+
+def testar_jump_point_search_igual_a_estrela():
+    gerador = random.Random(3)
+    for semente, densidade in ((0, 0.0), (1, 0.15), (2, 0.3), (3, 0.35)):
+        grade = grade_aleatoria(40, semente, densidade=densidade)
+        livres = sorted(distancias_em_saltos(grade, 1))
+        pares = [(1, 1600)] + [tuple(gerador.sample(livres, 2)) for _ in range(20)]
+        for origem, destino in pares:
+            caminho_esperado, _, custo_esperado = SearchAlgorithmsP().a_estrela(grade, origem, destino)
+            caminho, _, custo = SearchAlgorithmsP().jump_point_search(grade, origem, destino)
+            assert (caminho is None) == (caminho_esperado is None)
+            if caminho is None:
+                continue
+            assert caminho[0] == origem and caminho[-1] == destino
+            assert abs(custo - custo_esperado) < 1e-9
+            assert abs(custo_do_caminho(grade, caminho) - custo) < 1e-9
+
+    # Objetivo cercado por obstáculos
+    grade = grade_aleatoria(20, 0, densidade=0.1)
+    for x, y in ((18, 19), (19, 18), (18, 18)):
+        grade.definir_livre(x, y, False)
+    assert SearchAlgorithmsP().jump_point_search(grade, 1, 400)[0] is None
+
+    # Sem diagonais cai no A* comum; fora de uma grade é erro
+    grade = grade_aleatoria(20, 0, diagonais=False)
+    assert SearchAlgorithmsP().jump_point_search(grade, 1, 400)[2] == \
+        SearchAlgorithmsP().a_estrela(grade, 1, 400)[2]
+    try:
+        SearchAlgorithmsP().jump_point_search(grafo_exemplo_ponderado(), 1, 10)
+    except ValueError:
+        pass
+    else:
+        assert False, "Jump Point Search aceitou um grafo que não é grade"
+
+
+def testar_k_menores_caminhos_contra_forca_bruta():
+    for semente in range(4):
+        grafo = grafo_aleatorio(12, semente, vizinhanca=5)
+        todos = caminhos_simples(grafo, 1, 12)
+        custos = sorted(todos.values())
+
+        obtidos = k_menores_caminhos(grafo, 1, 12, 10)
+        assert len(obtidos) == min(10, len(todos))
+        for (caminho, custo), esperado in zip(obtidos, custos):
+            assert abs(custo - esperado) < 1e-9
+            assert abs(todos[tuple(caminho)] - custo) < 1e-9
+        assert len({tuple(caminho) for caminho, _ in obtidos}) == len(obtidos)
+
+        # Gerador completo: todos os caminhos simples, em ordem crescente de custo
+        completos = list(KShortestPaths(grafo).caminhos(1, 12))
+        assert {tuple(caminho) for caminho, _ in completos} == set(todos)
+        assert all(a[1] <= b[1] + 1e-9 for a, b in zip(completos, completos[1:]))
+
+    grafo = grafo_aleatorio(10, 0)
+    grafo.adicionar_no(11)
+    assert k_menores_caminhos(grafo, 1, 11, 3) == []
+    assert k_menores_caminhos(grafo, 4, 4, 3) == [([4], 0)]
+
+
+def testar_layout_de_arvore_sem_sobreposicao():
+    def conferir(raiz, filhos, distancia=1.0):
+        posicoes = tidy_tree_layout(raiz, filhos, distancia, key=lambda no: no)
+        # Ordem por níveis: vizinhos no mesmo nível mantêm a ordem e a distância
+        nivel, ordem = [raiz], 0
+        while nivel:
+            ordem += len(nivel)
+            xs = [posicoes[no][0] for no in nivel]
+            assert all(b - a >= distancia - 1e-9 for a, b in zip(xs, xs[1:]))
+            for no in nivel:
+                if filhos(no):
+                    primeiro, ultimo = filhos(no)[0], filhos(no)[-1]
+                    meio = (posicoes[primeiro][0] + posicoes[ultimo][0]) / 2
+                    assert abs(posicoes[no][0] - meio) < 1e-6
+                    assert all(posicoes[filho][1] == posicoes[no][1] + 1 for filho in filhos(no))
+            nivel = [filho for no in nivel for filho in filhos(no)]
+        assert ordem == len(posicoes)
+
+    # Árvores aleatórias (nós numerados, filhos em dicionário)
+    for semente in range(5):
+        gerador = random.Random(semente)
+        arvore = {0: []}
+        for no in range(1, 400):
+            pai = gerador.choice(list(arvore)[-40:]) if semente % 2 else gerador.randrange(no)
+            arvore[pai].append(no)
+            arvore[no] = []
+        conferir(0, arvore.__getitem__, distancia=1.0 + semente)
+
+    # Árvores de busca reais: larga (amplitude) e profunda (profundidade)
+    grade = grade_aleatoria(40, 0)
+    for metodo in ('busca_amplitude', 'busca_profundidade'):
+        _, raiz = getattr(SearchAlgorithms(), metodo)(grade, 1, 1600)
+        conferir(raiz, lambda no: no.filhos)
+
+    # Caminho muito profundo: sem recursão
+    arvore = {no: [no + 1] for no in range(20000)}
+    arvore[20000] = []
+    conferir(0, arvore.__getitem__)
+
+
+def testar_matriz_distancias_multiplas_origens():
+    grafo = grafo_aleatorio(120, 5)
+    grafo.adicionar_no(121)  # Inalcançável a partir das demais
+    origens = [1, 7, 30, 64, 99, 120, 121]
+
+    for tipo in ('H', 'I'):
+        esperado = {}
+        for origem, linha in bfs_multiplas_origens(grafo, origens, largura_lote=3, tipo=tipo):
+            referencia = distancias_em_saltos(grafo, origem)
+            esperado[origem] = linha
+            assert len(linha) == len(grafo.nos)
+            for no, distancia in zip(grafo.nos, linha):
+                assert distancia == referencia.get(no, INALCANCAVEL[tipo])
+
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'matriz.bin')
+            escrever_matriz_distancias(caminho, grafo, origens, largura_lote=4, tipo=tipo)
+            with MatrizDistancias(caminho) as matriz:
+                assert matriz.tipo == tipo
+                assert list(matriz.nos) == grafo.nos and matriz.origens == origens
+                for origem in reversed(origens):
+                    assert matriz.linha(origem) == esperado[origem]
+                assert matriz.distancia(1, 121) is None
+                assert matriz.distancia(121, 121) == 0
+                assert matriz.distancia(7, 30) == distancias_em_saltos(grafo, 7)[30]
+
+
+def testar_arvore_compacta_ida_e_volta():
+    grade = grade_aleatoria(30, 0)
+    caminho_grade, arvore_grade, _ = SearchAlgorithmsP().a_estrela(grade, 1, 900)
+    # Estados em texto (gravados como UTF-8)
+    galerias = Graph()
+    for origem, destino in zip('ABCDEFGHI', 'BCDEFGHIJ'):
+        galerias.adicionar_aresta(origem, destino, 1)
+    galerias.adicionar_aresta('A', 'Poço ç', 2)
+    galerias.adicionar_aresta('Poço ç', 'J', 2)
+    caminho_texto, arvore_texto = SearchAlgorithms().busca_amplitude(galerias, 'A', 'J')
+
+    for raiz, caminho in ((arvore_grade, caminho_grade), (arvore_texto, caminho_texto)):
+        arvore = CompactTree.de_arvore(raiz)
+        assert isinstance(arvore.estados, list) == isinstance(caminho[0], str)
+        # Contagem dos nós da árvore original
+        total, pilha = 0, [raiz]
+        while pilha:
+            no = pilha.pop()
+            total += 1
+            pilha.extend(no.filhos)
+        assert len(arvore) == total
+
+        dados = arvore.para_bytes()
+        # O primeiro array (pais) começa após o cabeçalho, em little-endian
+        inicio = struct.calcsize('<4sIqI4x')
+        assert dados[inicio:inicio + 8] == struct.pack('<q', -1)
+
+        with tempfile.TemporaryDirectory() as diretorio:
+            carregada = CompactTree.carregar(arvore.salvar(os.path.join(diretorio, 'arvore.bin')))
+        for copia in (CompactTree.de_bytes(dados), pickle.loads(pickle.dumps(arvore)), carregada):
+            assert list(copia.pais) == list(arvore.pais)
+            assert list(copia.estados) == list(arvore.estados)
+            assert list(copia.custos) == list(arvore.custos)
+            assert list(copia.profundidades) == list(arvore.profundidades)
+            assert list(copia.flags) == list(arvore.flags)
+            assert all(list(copia.filhos(i)) == list(arvore.filhos(i)) for i in range(len(arvore)))
+            assert copia.caminho(copia.encontrar_objetivo(caminho)) == list(caminho)
+            assert list(copia.tamanhos_subarvores())[0] == total
+
+
+def testar_busca_multiobjetivo():
+    gerador = random.Random(7)
+    casos = [(grafo_aleatorio(150, semente), 1) for semente in range(3)]
+    casos.append((grade_aleatoria(30, 1), 1))
+    for grafo, origem in casos:
+        saltos = distancias_em_saltos(grafo, origem)
+        alcancaveis = sorted(saltos)
+        for _ in range(3):
+            fins = gerador.sample(alcancaveis[len(alcancaveis) // 2:], 4)
+            custos = [SearchAlgorithmsP().a_estrela(grafo, origem, fim)[2] for fim in fins]
+
+            for metodo in ('custo_uniforme_multiobjetivo', 'a_estrela_multiobjetivo'):
+                caminho, _, custo, objetivo = getattr(SearchAlgorithmsP(), metodo)(grafo, origem, fins)
+                assert objetivo in fins and caminho[0] == origem and caminho[-1] == objetivo
+                assert abs(custo - min(custos)) < 1e-9
+                assert abs(custo_do_caminho(grafo, caminho) - custo) < 1e-9
+
+            caminho, _, objetivo = SearchAlgorithms().busca_amplitude_multiobjetivo(grafo, origem, fins)
+            assert objetivo in fins and caminho[0] == origem and caminho[-1] == objetivo
+            assert len(caminho) - 1 == min(saltos[fim] for fim in fins)
+
+    # Origem entre os objetivos, nenhum objetivo e objetivos inalcançáveis
+    grafo = grafo_aleatorio(30, 0)
+    grafo.adicionar_no(31)
+    assert SearchAlgorithmsP().a_estrela_multiobjetivo(grafo, 1, [5, 1])[2:] == (0, 1)
+    assert SearchAlgorithms().busca_amplitude_multiobjetivo(grafo, 1, [5, 1])[2] == 1
+    for fins in ([], [31]):
+        assert SearchAlgorithmsP().custo_uniforme_multiobjetivo(grafo, 1, fins)[0] is None
+        assert SearchAlgorithmsP().a_estrela_multiobjetivo(grafo, 1, fins)[0] is None
+        assert SearchAlgorithms().busca_amplitude_multiobjetivo(grafo, 1, fins)[0] is None
+
+
+def testar_particao_por_saidas_igual_a_dijkstra():
+    grafo = grafo_aleatorio(80, 2)
+    grafo.adicionar_no(81)  # Sem saída alcançável
+    saidas = [3, 40, 77]
+    particao = ExitPartition.calcular(grafo, saidas)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        carregada = ExitPartition.carregar(particao.salvar(os.path.join(diretorio, 'saidas.bin')))
+
+    for atual in (particao, carregada):
+        assert atual.consultar(81) == (None, float('inf')) and atual.rota(81) is None
+        for no in grafo.nos[:-1]:
+            custo_esperado = min(SearchAlgorithmsP().custo_uniforme(grafo, no, saida)[2]
+                                 if no != saida else 0 for saida in saidas)
+            saida, custo = atual.consultar(no)
+            assert saida in saidas and abs(custo - custo_esperado) < 1e-9
+            rota = atual.rota(no)
+            assert rota[0] == no and rota[-1] == saida
+            assert abs(custo_do_caminho(grafo, rota) - custo) < 1e-9
+            assert no in atual.nos_da_saida(saida)
+
+
+def testar_roteamento_hierarquico_igual_a_busca_plana():
+    gerador = random.Random(11)
+    grade = grade_aleatoria(30, 1)
+    grafo = grafo_aleatorio(150, 4)
+    grafo.adicionar_no(151)  # Inalcançável
+    roteadores = [
+        (grade, HierarchicalRouter(grade, agrupar_por_grade(grade, 6))),
+        (grafo, HierarchicalRouter(grafo, lambda no: no // 25)),
+    ]
+
+    for grafo, roteador in roteadores:
+        alcancaveis = sorted(distancias_em_saltos(grafo, 1))
+        pares = [tuple(gerador.sample(alcancaveis, 2)) for _ in range(15)]
+        pares += [(alcancaveis[0], alcancaveis[1]), (alcancaveis[0], alcancaveis[-1])]
+        for origem, destino in pares:
+            _, _, custo_esperado = SearchAlgorithmsP().a_estrela(grafo, origem, destino)
+            caminho, custo = roteador.buscar(origem, destino)
+            assert caminho[0] == origem and caminho[-1] == destino
+            assert abs(custo - custo_esperado) < 1e-9
+            assert abs(custo_do_caminho(grafo, caminho) - custo) < 1e-9
+        assert roteador.buscar(alcancaveis[3], alcancaveis[3]) == ([alcancaveis[3]], 0)
+
+    assert roteadores[1][1].buscar(1, 151) == (None, float('inf'))
+
+
+def testar_sma_estrela_otimo_e_dentro_do_limite():
+    casos = [(grafo_exemplo_ponderado(), 1, 10, 20)]
+    for semente in range(4):
+        casos.append((grafo_aleatorio(150, semente), 1, 147, 120))
+    for semente in (0, 1, 3):
+        for diagonais in (True, False):
+            grade = grade_aleatoria(30, semente, diagonais=diagonais)
+            casos.append((grade, 1, 900, 400))
+
+    for grafo, origem, destino, limite in casos:
+        _, _, custo_a_estrela = SearchAlgorithmsP().a_estrela(grafo, origem, destino)
+        busca = SearchAlgorithmsP()
+        caminho, _, custo = busca.sma_estrela(grafo, origem, destino, limite)
+        assert caminho is not None and caminho[0] == origem and caminho[-1] == destino
+        assert abs(custo - custo_a_estrela) < 1e-9, (custo, custo_a_estrela)
+        assert busca.pico_memoria <= limite
+        assert len(busca.nos_visitados) <= limite
+
+
+def testar_sma_estrela_objetivo_inalcancavel():
+    # Clique de 9 nós e o nó 10 isolado
+    grafo = Graph()
+    for no in range(1, 11):
+        grafo.adicionar_no(no)
+    for origem in range(1, 10):
+        for destino in range(origem + 1, 10):
+            grafo.adicionar_aresta(origem, destino, 1 + (origem * destino) % 5)
+    busca = SearchAlgorithmsP()
+    caminho, _, _ = busca.sma_estrela(grafo, 1, 10, 50)
+    assert caminho is None
+    assert busca.pico_memoria <= 50
+
+    # Canto de uma grade cercado por obstáculos, com a componente maior que o limite
+    grade = grade_aleatoria(40, 3)
+    for x, y in ((38, 39), (39, 38), (38, 38)):
+        grade.definir_livre(x, y, False)
+    busca = SearchAlgorithmsP()
+    caminho, _, _ = busca.sma_estrela(grade, 1, 1600, 500)
+    assert caminho is None
+    assert busca.pico_memoria <= 500
+
+
+def testar_sma_estrela_caminho_maior_que_o_limite():
+    # O único caminho tem 10 nós: não cabe em 5
+    grafo = Graph()
+    for no in range(1, 11):
+        grafo.adicionar_no(no)
+    for no in range(1, 10):
+        grafo.adicionar_aresta(no, no + 1, 1)
+    busca = SearchAlgorithmsP()
+    caminho, _, _ = busca.sma_estrela(grafo, 1, 10, 5)
+    assert caminho is None
+    assert busca.pico_memoria <= 5
+
+
+def testar_caminho_restrito_contra_forca_bruta():
+    tipos = [SOMA, MAXIMO]
+    for semente in range(4):
+        gerador = random.Random(semente)
+        grafo = grafo_aleatorio(12, semente, vizinhanca=5)
+        for origem in grafo.nos:
+            for destino, _ in grafo.obter_vizinhos(origem):
+                if origem < destino:
+                    grafo.definir_recursos_aresta(origem, destino,
+                                                  (gerador.randint(0, 5), gerador.randint(0, 9)))
+
+        # Recursos de cada caminho simples: exposição somada e maior inclinação
+        todos = {}
+        for caminho, custo in caminhos_simples(grafo, 1, 12).items():
+            arestas = [grafo.obter_recursos_aresta(a, b) for a, b in zip(caminho, caminho[1:])]
+            todos[caminho] = (custo, sum(r[0] for r in arestas), max(r[1] for r in arestas))
+
+        for limites in ([None, None], [8, None], [None, 6], [10, 7], [4, 4], [0, 0]):
+            viaveis = [custo for custo, soma, maximo in todos.values()
+                       if (limites[0] is None or soma <= limites[0])
+                       and (limites[1] is None or maximo <= limites[1])]
+            caminho, custo, recursos = caminho_restrito(grafo, 1, 12, limites, tipos)
+            if not viaveis:
+                assert caminho is None
+                continue
+            assert abs(custo - min(viaveis)) < 1e-9
+            esperado = todos[tuple(caminho)]
+            assert abs(esperado[0] - custo) < 1e-9 and tuple(recursos) == esperado[1:]
+
+
+def testar_escrever_resultado_igual_a_formatar_resultado():
+    grade = grade_aleatoria(30, 1)
+    busca = SearchAlgorithmsP()
+    caminho, _, custo = busca.custo_uniforme(grade, 1, 900)
+    casos = [(caminho, custo, busca.nos_visitados), (None, 0, busca.nos_visitados),
+             (['A'], 0, ['A']), (['A', 'B'], 1.5, [])]
+
+    for caminho, custo, visitados in casos:
+        esperado = formatar_resultado(caminho, custo, "Custo Uniforme", visitados)
+        for tamanho_pagina in (1, 7, 1000, len(visitados) + 1):
+            arquivo = io.StringIO()
+            escrever_resultado(arquivo, caminho, custo, "Custo Uniforme", visitados, tamanho_pagina)
+            assert arquivo.getvalue() == esperado
+            assert ' → '.join(paginar_visitacao(visitados, tamanho_pagina)) == \
+                ' → '.join(map(str, visitados))
+
+        # Estatísticas vêm no resumo, antes da ordem de visitação
+        estatisticas = {'pico_memoria': 10, 'ampliacoes': 2}
+        arquivo = io.StringIO()
+        escrever_resultado(arquivo, caminho, custo, "SMA*", visitados, estatisticas=estatisticas)
+        sem_estatisticas = formatar_resultado(caminho, custo, "SMA*", visitados)
+        ordem = sem_estatisticas[len(formatar_resumo(caminho, custo, "SMA*", visitados)):]
+        assert arquivo.getvalue() == formatar_resumo(caminho, custo, "SMA*", visitados,
+                                                     estatisticas) + ordem
+
+
+def testar_feixe_largo_igual_a_busca_completa():
+    casos = [(grafo_exemplo_ponderado(), 1, 10)]
+    for semente in range(4):
+        casos.append((grafo_aleatorio(150, semente), 1, 147))
+    for semente in (0, 1, 3):
+        casos.append((grade_aleatoria(30, semente), 1, 900))
+
+    for grafo, origem, destino in casos:
+        largura = len(grafo.nos)
+        esperado = SearchAlgorithmsP().greedy(grafo, origem, destino)
+        obtido = SearchAlgorithmsP().greedy_feixe(grafo, origem, destino, largura)
+        assert obtido[0] == esperado[0] and obtido[2] == esperado[2]
+        esperado = SearchAlgorithmsP().a_estrela(grafo, origem, destino)
+        obtido = SearchAlgorithmsP().busca_feixe(grafo, origem, destino, largura, peso=1)
+        assert obtido[0] == esperado[0] and obtido[2] == esperado[2]
+
+
+def testar_feixe_estreito_amplia_e_termina():
+    # Anel de 200 nós e um nó isolado: com largura 1 os expandidos antigos
+    # saem da tabela e o ciclo só é evitado pela verificação do caminho
+    grafo = Graph()
+    for no in range(1, 202):
+        grafo.adicionar_no(no)
+    for no in range(1, 201):
+        grafo.adicionar_aresta(no, no % 200 + 1, 1)
+    busca = SearchAlgorithmsP()
+    caminho, _, _ = busca.greedy_feixe(grafo, 1, 201, 1)
+    assert caminho is None
+    assert busca.ampliacoes == 1 and busca.largura_final == 2
+
+    grade = grade_aleatoria(30, 0)
+    _, _, custo_a_estrela = SearchAlgorithmsP().a_estrela(grade, 1, 900)
+    for largura in (1, 4, 16):
+        busca = SearchAlgorithmsP()
+        caminho, _, custo = busca.a_estrela_ponderada_feixe(grade, 1, 900, largura,
+                                                             tamanho_zona=5, max_por_zona=2)
+        assert caminho is not None and caminho[0] == 1 and caminho[-1] == 900
+        assert custo >= custo_a_estrela - 1e-9
+
+
+def main():
+    """Executa as verificações sem pytest"""
+    testes = [(nome, funcao) for nome, funcao in sorted(globals().items())
+              if nome.startswith('testar_') and callable(funcao)]
+    for nome, funcao in testes:
+        funcao()
+        print(f"OK: {nome}")
+    print(f"\n{len(testes)} verificações concluídas!")
+
+if __name__ == "__main__":
+    main()